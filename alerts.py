@@ -0,0 +1,210 @@
+"""
+alerts.py — 선언형 알림 규칙 엔진
+config.ALERT_RULES 의 규칙을 시작 시 한 번 컴파일하고, 매 틱 모든 규칙을 한 번에 평가합니다.
+
+규칙 종류 (kind):
+- "value": 현재 값
+- "avg":   이동 통계 구간 평균 (RollingWindows.snapshot() 의 구간 이름, 예: "10m")
+- "rate":  변화율 — window 초 동안의 변화량을 분당 값으로 환산
+
+공통 옵션:
+- above / below: 발생 임계값 (둘 중 하나)
+- clear: 해제 임계값 (히스테리시스, 생략 시 발생 임계값과 같음)
+- n, m: 최근 m 번 평가 중 n 번 이상 조건을 만족해야 발생 / 해제 (N-of-M 디바운스)
+
+같은 틱에 발생한 규칙들은 Firing 목록 하나로 반환되어 메시지 한 개로 묶어 보냅니다.
+headroom() 은 임계값까지 남은 비율을 계산해 적응형 수집 주기(scheduler.AdaptiveCadence)에 넘깁니다.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+# 규칙에서 쓸 수 있는 지표 → SystemStats 필드
+METRICS = {
+    "cpu":      "cpu_percent",
+    "mem":      "mem_percent",
+    "swap":     "swap_percent",
+    "disk":     "disk_percent",
+    "net_recv": "net_recv_kb",
+    "net_sent": "net_sent_kb",
+    # 장치별 최댓값 (가장 바쁜 블록 장치 I/O 사용률, 가장 많이 찬 마운트)
+    "disk_busy": "disk_busy_percent",
+    "mount":     "mount_max_percent",
+    # 경합 (CPU I/O 대기 / 스틸, 코어당 1분 부하 평균, PSI — 커널 미지원 시 값이 없어 평가 생략)
+    "cpu_iowait":      "cpu_iowait",
+    "cpu_steal":       "cpu_steal",
+    "load":            "load_per_core",
+    "psi_cpu":         "psi_cpu",
+    "psi_memory":      "psi_memory",
+    "psi_memory_full": "psi_memory_full",
+    "psi_io":          "psi_io",
+    "psi_io_full":     "psi_io_full",
+    # 보고 틱 사이 고빈도 샘플 (burst.py)
+    "cpu_peak":      "cpu_peak",
+    "cpu_p95":       "cpu_p95",
+    "net_recv_peak": "net_recv_peak_kb",
+    "net_recv_p95":  "net_recv_p95_kb",
+    "net_sent_peak": "net_sent_peak_kb",
+    "net_sent_p95":  "net_sent_p95_kb",
+}
+KINDS = ("value", "avg", "rate")
+
+
+@dataclass
+class Rule:
+    name: str
+    label: str                 # 메시지 표시 이름
+    metric: str
+    kind: str = "value"
+    threshold: float = 0.0     # 발생 임계값
+    clear: float = 0.0         # 해제 임계값
+    sign: int = 1              # 1 = 이상이면 발생 (above), -1 = 이하이면 발생 (below)
+    n: int = 1
+    m: int = 1
+    window: str | float = ""   # avg: 구간 이름, rate: 초
+    unit: str = "%"
+    scale: float = 1.0         # 표시용 배율 (KB/s → MB/s 등)
+    # 평가 상태
+    active: bool = False
+    _hot: deque = field(default_factory=deque, repr=False)
+    _cool: deque = field(default_factory=deque, repr=False)
+    _history: deque = field(default_factory=deque, repr=False)   # rate: (시각, 값)
+
+    def format(self, value: float) -> str:
+        sep = "" if self.unit.startswith("%") else " "
+        return f"{value * self.scale:.1f}{sep}{self.unit}"
+
+    def describe(self, value: float) -> str:
+        op = "≥" if self.sign > 0 else "≤"
+        return f"{self.label} **{self.format(value)}** (임계값: {op} {self.format(self.threshold)})"
+
+    def describe_clear(self, value: float) -> str:
+        return f"{self.label} **{self.format(value)}**"
+
+
+@dataclass
+class Firing:
+    rule: Rule
+    value: float
+
+
+def compile_rules(specs: list[dict], windows: dict | None = None) -> list[Rule]:
+    """설정 딕셔너리 목록 → Rule 목록 (잘못된 설정은 시작 시 ValueError)"""
+    rules = []
+    for spec in specs:
+        name = spec["name"]
+        metric = spec.get("metric", name)
+        kind = spec.get("kind", "value")
+        if metric not in METRICS:
+            raise ValueError(f"알림 규칙 {name}: 알 수 없는 지표 {metric}")
+        if kind not in KINDS:
+            raise ValueError(f"알림 규칙 {name}: 알 수 없는 종류 {kind}")
+        if ("above" in spec) == ("below" in spec):
+            raise ValueError(f"알림 규칙 {name}: above / below 중 하나만 지정해야 합니다")
+        sign = 1 if "above" in spec else -1
+        threshold = float(spec["above"] if sign > 0 else spec["below"])
+        window = spec.get("window", "")
+        if kind == "avg" and windows is not None and window not in windows:
+            raise ValueError(f"알림 규칙 {name}: 알 수 없는 이동 통계 구간 {window}")
+        if kind == "rate" and not (isinstance(window, (int, float)) and window > 0):
+            raise ValueError(f"알림 규칙 {name}: rate 규칙은 window(초)가 필요합니다")
+        n, m = int(spec.get("n", 1)), int(spec.get("m", spec.get("n", 1)))
+        if not 1 <= n <= m:
+            raise ValueError(f"알림 규칙 {name}: 1 <= n <= m 이어야 합니다")
+        rule = Rule(
+            name=name, label=spec.get("label", name), metric=metric, kind=kind,
+            threshold=threshold, clear=float(spec.get("clear", threshold)), sign=sign,
+            n=n, m=m, window=window, unit=spec.get("unit", "%"), scale=float(spec.get("scale", 1.0)),
+        )
+        rule._hot = deque(maxlen=m)
+        rule._cool = deque(maxlen=m)
+        rules.append(rule)
+    return rules
+
+
+class AlertEngine:
+    """규칙 목록을 매 틱 평가하여 새로 발생 / 해제된 규칙을 반환"""
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        # headroom 변화 속도 계산용 직전 값 (시각, {비교 키: 값})
+        self._prev: tuple[float, dict] | None = None
+
+    def restore(self, active: dict):
+        """재시작 전 발생 상태 복원 ({규칙 이름: bool})"""
+        for rule in self.rules:
+            rule.active = bool(active.get(rule.name, False))
+
+    def active(self) -> dict:
+        return {rule.name: rule.active for rule in self.rules}
+
+    def _value(self, rule: Rule, stats, windows: dict, now: float) -> float | None:
+        value = getattr(stats, METRICS[rule.metric])
+        if rule.kind == "value":
+            return value
+        if rule.kind == "avg":
+            summary = windows.get(rule.metric, {}).get(rule.window)
+            return summary.mean if summary is not None and summary.count else None
+        # rate: window 초 이상 쌓인 뒤부터 분당 변화량
+        hist = rule._history
+        hist.append((now, value))
+        while len(hist) > 2 and now - hist[1][0] >= rule.window:
+            hist.popleft()
+        t0, v0 = hist[0]
+        if now - t0 < rule.window:
+            return None
+        return (value - v0) / (now - t0) * 60
+
+    def evaluate(self, stats, windows: dict, now: float | None = None) -> tuple[list[Firing], list[Firing]]:
+        """(새로 발생한 규칙, 새로 해제된 규칙)"""
+        now = time.monotonic() if now is None else now
+        fired, cleared = [], []
+        for rule in self.rules:
+            x = self._value(rule, stats, windows, now)
+            if x is None:
+                continue
+            rule._hot.append(rule.sign * x >= rule.sign * rule.threshold)
+            rule._cool.append(rule.sign * x < rule.sign * rule.clear)
+            if not rule.active and sum(rule._hot) >= rule.n:
+                rule.active = True
+                rule._cool.clear()
+                fired.append(Firing(rule, x))
+            elif rule.active and sum(rule._cool) >= rule.n:
+                rule.active = False
+                rule._hot.clear()
+                cleared.append(Firing(rule, x))
+        return fired, cleared
+
+    def headroom(self, stats, windows: dict, horizon: float, extra: tuple = (),
+                 now: float | None = None) -> float:
+        """가장 가까운 임계값까지 남은 비율 (0 이하 = 이미 넘음)
+
+        value / avg 규칙의 발생 임계값과 extra 의 (SystemStats 필드, 임계값, 방향) 을 대상으로,
+        현재 값과 직전 호출 이후 변화 속도로 horizon 초 뒤를 예측한 값 중 나쁜 쪽을 씀
+        → 빠르게 오르는 지표는 임계값에서 멀어도 여유가 작게 나옴
+        avg 규칙은 evaluate 와 같은 구간 평균으로 비교 (순간 값이 튀어도 평균이 멀면 여유 유지)
+        """
+        now = time.monotonic() if now is None else now
+        # (비교 키, 현재 값, 임계값, 방향) — avg 규칙은 키에 구간 이름을 붙여 순간 값과 따로 추세 계산
+        targets = []
+        for r in self.rules:
+            if r.kind == "value":
+                targets.append((r.metric, getattr(stats, METRICS[r.metric]), r.threshold, r.sign))
+            elif r.kind == "avg":
+                targets.append((f"{r.metric}@{r.window}", self._value(r, stats, windows, now),
+                                r.threshold, r.sign))
+        targets.extend((attr, getattr(stats, attr), threshold, sign) for attr, threshold, sign in extra)
+        values = {key: x for key, x, _, _ in targets}
+        prev, self._prev = self._prev, (now, values)
+        dt = now - prev[0] if prev is not None else 0.0
+        result = float("inf")
+        for key, x, threshold, sign in targets:
+            if x is None:
+                continue
+            if dt > 0 and prev[1].get(key) is not None:
+                projected = x + (x - prev[1][key]) / dt * horizon
+                x = max(x, projected) if sign > 0 else min(x, projected)
+            scale = abs(threshold) or 1.0
+            result = min(result, sign * (threshold - x) / scale)
+        return result
@@ -0,0 +1,50 @@
+"""
+bench_collect.py — get_system_stats 수집 경로 마이크로벤치마크
+/proc 직접 수집 엔진과 psutil 경로의 틱당 소요 시간을 비교합니다.
+
+실행: python bench/bench_collect.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import system_info  # noqa: E402
+
+
+def _measure(fn, iterations: int) -> tuple[float, float]:
+    """(평균 µs, 최소 µs)"""
+    fn()  # 워밍업
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return sum(samples) / len(samples) * 1e6, min(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    if system_info._collector is None:
+        print("/proc 수집기를 사용할 수 없는 환경입니다 (psutil 경로만 존재)")
+        return
+
+    results = [
+        ("procfs (get_system_stats)", _measure(system_info.get_system_stats, args.iterations)),
+        ("psutil (_get_system_stats_psutil)", _measure(system_info._get_system_stats_psutil, args.iterations)),
+    ]
+    width = max(len(name) for name, _ in results)
+    for name, (mean, best) in results:
+        print(f"{name:<{width}}  평균 {mean:8.1f} µs  최소 {best:8.1f} µs")
+    speedup = results[1][1][0] / results[0][1][0]
+    print(f"속도 향상: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+bench_fleet.py — 통합 모니터링(fleet.py) 로컬 다중 에이전트 측정
+수집 서버 하나와 에이전트 N 개를 같은 이벤트 루프의 localhost TCP 로 연결하고 합성 샘플을 보냅니다.
+
+0) 동작 확인: 에이전트 시계가 뒤로 가면 서버별 이동 통계를 새로 시작하는지
+1) 정상 구간: 샘플당 전송 바이트 (JSON 대비), 수신 / 전송 샘플 수, 샘플당 반영 시간, embed 렌더 시간
+2) 중단 구간: 수집 서버를 내렸다 다시 올렸을 때 큐에 쌓인 샘플 / 버린 샘플 / 모두 따라잡는 데 걸린 시간
+
+실행: python bench/bench_fleet.py [--agents N] [--interval 초] [--seconds N] [--outage 초] [--batch 초]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import config  # noqa: E402
+
+config.STATE_DIR = tempfile.mkdtemp(prefix="bench-state-")
+logging.disable(logging.WARNING)
+
+import fleet  # noqa: E402
+
+TOKEN = "bench-token"
+
+
+def synthetic_stats(seed: int):
+    """서버마다 다른 위상의 합성 부하 (SystemStats 와 같은 속성)"""
+    rng = random.Random(seed)
+    phase = rng.random() * math.tau
+
+    def sample():
+        t = time.monotonic() / 30 + phase
+        cpu = max(0.0, min(100.0, 30 + 25 * math.sin(t) + rng.gauss(0, 3)))
+        return SimpleNamespace(
+            cpu_percent=cpu, cpu_per_core=[cpu] * 4, mem_total_gb=8.0, disk_total_gb=100.0,
+            mem_percent=55 + 5 * math.sin(t / 7), swap_percent=1.0, disk_percent=62.5,
+            mount_max_percent=62.5, disk_busy_percent=rng.random() * 10,
+            net_recv_kb=abs(rng.gauss(300, 100)), net_sent_kb=abs(rng.gauss(40, 10)),
+            cpu_iowait=rng.random(), cpu_steal=0.0, load_1=cpu / 25,
+            psi_memory_full=0.0, psi_io_full=None, cpu_peak=min(100.0, cpu * 1.2),
+            net_recv_peak_kb=400.0, net_sent_peak_kb=60.0,
+        )
+    return sample
+
+
+def json_size(stats) -> int:
+    return len(json.dumps({attr: getattr(stats, attr) for attr, _, _ in fleet.WIRE_FIELDS}).encode())
+
+
+def check_clock_rewind() -> bool:
+    """에이전트 시계가 1시간 뒤로 간 뒤의 샘플이 버려지지 않고 새 이동 통계로 들어가는지"""
+    host = fleet.FleetHost("rewind", [], config.FLEET_WINDOWS, config.FLEET_MIN_PUSH_SECONDS)
+    values = {attr: 10.0 for attr, _, _ in fleet.WIRE_FIELDS}
+    for ts in range(1000, 1100, 5):
+        host.observe(ts, values)
+    before = host.windows
+    values = {attr: 90.0 for attr, _, _ in fleet.WIRE_FIELDS}
+    for ts in range(1095 - 3600, 1095 - 3600 + 30, 5):
+        host.observe(ts, values)
+    cpu = host.windows.summary("cpu", "10m")
+    ok = host.windows is not before and cpu.count == 6 and cpu.min == 90.0
+    print(f"[확인] 시계 되감김 → 이동 통계 재시작: {'통과' if ok else '실패'} "
+          f"(샘플 {cpu.count}개, 최솟값 {cpu.min:.0f})")
+    return ok
+
+
+async def run(args):
+    agg = fleet.FleetAggregator(TOKEN, stale=args.outage * 4 + 10)
+    ingest = []
+    orig_ingest = agg._ingest
+
+    def timed_ingest(host, decoder, body):
+        t = time.perf_counter()
+        orig_ingest(host, decoder, body)
+        ingest.append(time.perf_counter() - t)
+    agg._ingest = timed_ingest
+
+    await agg.start("127.0.0.1", 0)
+    port = agg.port
+    agents = [
+        fleet.FleetAgent(f"127.0.0.1:{port}", TOKEN, f"host-{i:02d}", args.interval,
+                         stats_fn=synthetic_stats(i), queue_size=args.queue, batch_seconds=args.batch)
+        for i in range(args.agents)
+    ]
+    # 에이전트 수집은 executor 대신 루프에서 바로 (합성 샘플은 블로킹이 아님)
+    for a in agents:
+        async def collect(tick=0, a=a):
+            a.push(a._stats_fn())
+        a._collect = collect
+    tasks = [asyncio.ensure_future(a.run()) for a in agents]
+
+    # ── 1) 정상 구간 ──
+    await asyncio.sleep(args.seconds)
+    sent = sum(a.sent for a in agents)
+    wire = sum(a.bytes_sent for a in agents)
+    sample = agents[0]._stats_fn()
+    t = time.perf_counter()
+    embed = fleet.build_fleet_embed(list(agg.hosts.values()))
+    render_ms = (time.perf_counter() - t) * 1000
+    ingest_us = sorted(x * 1e6 for x in ingest)
+    per_sample = sum(ingest) / max(1, agg.samples) * 1e6
+    print(f"[정상] 에이전트 {args.agents}개 · 주기 {args.interval}초 · 묶음 대기 {args.batch}초 · {args.seconds}초")
+    print(f"  전송 샘플 {sent} · 수신 샘플 {agg.samples} · 프레임 {agg.frames} · 접속 서버 {len(agg.hosts)}")
+    print(f"  샘플당 전송 {wire / max(1, sent):.1f} 바이트 (프레임 헤더 포함, JSON {json_size(sample)} 바이트)")
+    print(f"  프레임 반영 p50 {ingest_us[len(ingest_us) // 2]:.1f} µs · p95 "
+          f"{ingest_us[int(len(ingest_us) * 0.95)]:.1f} µs · 샘플당 {per_sample:.1f} µs")
+    print(f"  서버 현황 embed 렌더 {render_ms:.2f} ms (설명 {len(embed.description)}자)")
+
+    # ── 2) 중단 구간 ──
+    if args.outage > 0:
+        await agg.close()
+        before = agg.samples
+        await asyncio.sleep(args.outage)
+        queued = sum(a.queue_depth for a in agents)
+        dropped = sum(a.dropped for a in agents)
+        await agg.start("127.0.0.1", port)
+        t0 = time.monotonic()
+        # 재접속 백오프(최대 수 초) 이후 큐가 모두 비워질 때까지
+        while any(a.queue_depth > 1 for a in agents) and time.monotonic() - t0 < 60:
+            await asyncio.sleep(0.05)
+        caught = time.monotonic() - t0
+        await asyncio.sleep(args.interval * 2)
+        print(f"[중단] 수집 서버 {args.outage}초 중단 (에이전트 큐 {args.queue}개)")
+        print(f"  중단 중 쌓인 샘플 {queued} · 버린 샘플 {dropped} · 재개 후 수신 {agg.samples - before}")
+        print(f"  재시작 → 모든 큐 비움 {caught:.2f}초 · 에이전트 재접속 {sum(a.reconnects for a in agents)}회")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await agg.close()
+    sent = sum(a.sent for a in agents)
+    lost = sent - agg.samples
+    print(f"[합계] 전송 {sent} · 수신 {agg.samples} · 전송 후 유실 {lost} (연결 종료 시 쓰기 버퍼에 남은 샘플)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--outage", type=float, default=3.0)
+    parser.add_argument("--queue", type=int, default=20)
+    parser.add_argument("--batch", type=float, default=0.0, help="에이전트 묶음 대기 (초)")
+    args = parser.parse_args()
+    if not check_clock_rewind():
+        sys.exit(1)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+bench_proctable.py — 상위 프로세스 수집 벤치마크
+프로세스 수를 늘려 가며 증분 프로세스 테이블(ProcessTable)과 psutil.process_iter
+경로의 스캔 시간을 가짜 /proc 트리에서 비교합니다.
+
+실행: python bench/bench_proctable.py [--procs 100,1000,5000] [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import psutil  # noqa: E402
+
+from fakeproc import FakeProc  # noqa: E402
+from proctable import ProcessTable  # noqa: E402
+
+TOP_N = 5
+
+
+def _psutil_top(root: str):
+    """기존 cpu_bot 구현 (process_iter + 정렬 2회)"""
+    psutil.PROCFS_PATH = root
+    procs = []
+    for p in psutil.process_iter(["pid", "name", "cpu_percent", "memory_percent", "username"]):
+        try:
+            procs.append(p.info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    sorted(procs, key=lambda x: x["cpu_percent"] or 0.0, reverse=True)[:TOP_N]
+    sorted(procs, key=lambda x: x["memory_percent"] or 0.0, reverse=True)[:TOP_N]
+
+
+def _time(fn, iterations: int) -> float:
+    """평균 ms"""
+    fn()  # 워밍업 (캐시 / 기준 스냅샷)
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--procs", default="100,1000,5000")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'프로세스':>8}  {'ProcessTable':>14}  {'psutil':>10}  {'프로세스당':>10}  {'속도 향상':>8}")
+    for n in (int(x) for x in args.procs.split(",")):
+        with tempfile.TemporaryDirectory() as root:
+            FakeProc(root, cores=4, procs=n).build()
+            table = ProcessTable(root)
+            t_table = _time(lambda: table.top(TOP_N), args.iterations)
+            if hasattr(psutil.process_iter, "cache_clear"):
+                psutil.process_iter.cache_clear()
+            t_psutil = _time(lambda: _psutil_top(root), args.iterations)
+            print(f"{n:>8}  {t_table:>11.2f} ms  {t_psutil:>7.2f} ms  "
+                  f"{t_table / n * 1000:>7.1f} µs  {t_psutil / t_table:>7.1f}x")
+    psutil.PROCFS_PATH = "/proc"
+
+
+if __name__ == "__main__":
+    main()
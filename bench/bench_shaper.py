@@ -0,0 +1,69 @@
+"""
+bench_shaper.py — 부하 유지(shaper.py) duty cycle 정밀도 / 제어 수렴 측정
+1) 고정 duty 마다 워커가 실제로 쓴 CPU 와 요청값의 차이
+2) 제어기가 전체 CPU 를 유지선에 맞추는 정도 (회복 모드, 1초 간격 관측)
+
+실행: python bench/bench_shaper.py [--seconds N] [--floor %]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import system_info  # noqa: E402
+from shaper import LoadShaper  # noqa: E402
+
+
+def fixed_duty(seconds: float):
+    shaper = LoadShaper(floor=0)
+    shaper.start()
+    print(f"[고정 duty] 워커 {shaper.workers}개 · 코어 {shaper.cores}개")
+    try:
+        for duty in (0.05, 0.1, 0.2, 0.5):
+            shaper._duty.value = duty
+            time.sleep(shaper.period * 2)
+            shaper._measure(time.monotonic())
+            time.sleep(seconds)
+            got = shaper._measure(time.monotonic())
+            want = duty * shaper.workers / shaper.cores * 100
+            print(f"  duty {duty:4.2f} → 요청 {want:5.1f}%  측정 {got:5.1f}%  오차 {got - want:+5.2f}%p")
+    finally:
+        shaper.stop()
+
+
+def control(seconds: float, floor: float):
+    shaper = LoadShaper(floor=floor)
+    shaper.start()
+    system_info.get_system_stats()
+    print(f"[제어] 유지선 {floor:g}% (7일 p95 = 0 → 회복 모드)")
+    totals = []
+    try:
+        for i in range(int(seconds)):
+            time.sleep(1)
+            cpu = system_info.get_system_stats().cpu_percent
+            shaper.observe(cpu, p95=0.0)
+            if i >= 2:   # 첫 두 구간은 수렴 전
+                totals.append(cpu)
+            st = shaper.status()
+            print(f"  전체 {cpu:5.1f}%  주입 {st['injected']:5.1f}%  실제 {st['real']:5.1f}%  duty {st['duty']:.3f}")
+    finally:
+        shaper.stop()
+    if totals:
+        mean = sum(totals) / len(totals)
+        print(f"  평균 전체 CPU {mean:.1f}% (유지선 대비 {mean - floor:+.1f}%p)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--floor", type=float, default=22.0)
+    args = parser.parse_args()
+    fixed_duty(args.seconds)
+    control(args.seconds * 4, args.floor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+e2e.py — 로컬 Discord 대역(fake_discord.py)을 상대로 한 종단 간 틱 측정
+두 봇(HomeServerMonitorBot, ProcMonitorBot)을 가짜 서버에 실제로 접속시킨 뒤
+
+1. 틱 지연: 수집 → 렌더 → edit 요청이 서버에 도착하기까지 단계별 시간
+2. 메시지 삭제 복구: 상태 메시지를 지운 뒤 새 메시지가 생성되기까지 시간
+3. 최대 지속 갱신률: 요청 속도를 올려 가며 실제 반영된 edit 비율 측정
+
+봇은 게이트웨이 접속(기본) 또는 웹훅 전용(--webhook, webhook.py 와 같은 경로)으로 실행합니다.
+
+실행:
+    python bench/e2e.py
+    python bench/e2e.py --webhook
+    python bench/e2e.py --latency 0.2 --jitter 0.1 --bucket-limit 5 --bucket-window 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from fake_discord import FakeDiscord  # noqa: E402
+
+SYSTEM_CHANNEL = 300000000000000001
+PROC_CHANNEL = 300000000000000002
+
+# 봇 모듈이 import 시점에 읽는 환경변수
+os.environ["MONITOR_CHANNEL_ID"] = str(SYSTEM_CHANNEL)
+os.environ["CPU_CHANNEL_ID"] = str(PROC_CHANNEL)
+os.environ["STATE_DIR"] = tempfile.mkdtemp(prefix="e2e-state-")
+
+import bot  # noqa: E402
+import cpu_bot  # noqa: E402
+from outbound import RateLimitTracker, WebhookTransport  # noqa: E402
+from system_info import get_system_stats  # noqa: E402
+
+logging.disable(logging.WARNING)
+
+
+async def _next_ok_write(server: FakeDiscord, channel: int, timeout: float = 30.0):
+    """channel 에 대한 다음 성공(200) 쓰기 요청"""
+    deadline = time.monotonic() + timeout
+    while True:
+        w = await asyncio.wait_for(server.next_write(), max(0.01, deadline - time.monotonic()))
+        if w.channel_id == channel and w.status == 200:
+            return w
+
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def tick_latency(server, name, channel, collect, publish, ticks: int, gap: float):
+    collect_ms, render_ms, total_ms = [], [], []
+    loop = asyncio.get_event_loop()
+    for _ in range(ticks):
+        waiter = asyncio.ensure_future(_next_ok_write(server, channel))
+        t0 = time.monotonic()
+        data = await loop.run_in_executor(None, collect)
+        t1 = time.monotonic()
+        await publish(data)
+        t2 = time.monotonic()
+        w = await waiter
+        collect_ms.append((t1 - t0) * 1000)
+        render_ms.append((t2 - t1) * 1000)
+        total_ms.append((w.at - t0) * 1000)
+        await asyncio.sleep(gap)
+    print(f"[{name}] 틱 지연 ({ticks}회)")
+    print(f"  수집       평균 {statistics.fmean(collect_ms):7.2f} ms")
+    print(f"  렌더+큐잉  평균 {statistics.fmean(render_ms):7.2f} ms")
+    print(f"  전체       평균 {statistics.fmean(total_ms):7.2f} ms  "
+          f"p50 {_pct(total_ms, 0.5):7.2f}  p95 {_pct(total_ms, 0.95):7.2f}  최대 {max(total_ms):7.2f}")
+
+
+async def deletion_recovery(server, name, channel, outbox, collect, publish):
+    loop = asyncio.get_event_loop()
+    old_id = outbox.message.id
+    server.delete_message(old_id)
+    t0 = time.monotonic()
+    await publish(await loop.run_in_executor(None, collect))
+    while True:
+        w = await _next_ok_write(server, channel)
+        if w.method == "POST":
+            break
+    print(f"[{name}] 메시지 삭제 → 새 메시지 생성: {(w.at - t0) * 1000:.1f} ms "
+          f"(이전 {old_id} → 새 {w.message_id})")
+
+
+async def max_rate(server, name, channel, outbox, data, publish, rates, duration: float):
+    print(f"[{name}] 갱신률 (요청 → 서버 반영, 구간 {duration:.0f}초)")
+    best = 0.0
+    for rate in rates:
+        start_writes = sum(1 for w in server.writes if w.channel_id == channel and w.status == 200)
+        superseded = outbox.superseded
+        n = int(rate * duration)
+        t0 = time.monotonic()
+        for i in range(n):
+            await publish(data)
+            await asyncio.sleep(max(0.0, t0 + (i + 1) / rate - time.monotonic()))
+        await asyncio.sleep(1.0)   # 대기 중인 edit 이 빠질 시간
+        done = sum(1 for w in server.writes if w.channel_id == channel and w.status == 200) - start_writes
+        ratio = done / n if n else 0.0
+        if ratio >= 0.95:
+            best = rate
+        print(f"  {rate:6.1f}/s 요청 {n:4d} → 반영 {done:4d} ({ratio * 100:5.1f}%)  "
+              f"교체 {outbox.superseded - superseded:4d}")
+    print(f"  최대 지속 갱신률 ≈ {best:.1f}/s  | 서버 429 누적 {server.count_429}")
+
+
+async def main_async(args):
+    server = FakeDiscord(latency=args.latency, jitter=args.jitter, bucket_limit=args.bucket_limit,
+                         bucket_window=args.bucket_window, random_429=args.random_429,
+                         channels=(SYSTEM_CHANNEL, PROC_CHANNEL))
+    await server.start()
+    server.patch_discord()
+    print(f"가짜 Discord 서버: {server.base_url} | 지연 {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms "
+          f"| 버킷 {args.bucket_limit or '∞'}/{args.bucket_window}s | 무작위 429 {args.random_429:.0%}")
+
+    tasks = []
+    session = None
+    t0 = time.monotonic()
+    if args.webhook:
+        limiter = RateLimitTracker()
+        session = aiohttp.ClientSession(trace_configs=[limiter.trace_config()])
+        monitor = bot.HomeServerMonitorBot(standalone=False, transport=WebhookTransport(
+            session, server.create_webhook(SYSTEM_CHANNEL), limiter))
+        procs = cpu_bot.ProcMonitorBot(standalone=False, transport=WebhookTransport(
+            session, server.create_webhook(PROC_CHANNEL), limiter))
+        for b in (monitor, procs):
+            b.start_detached()
+    else:
+        monitor = bot.HomeServerMonitorBot(standalone=False)
+        procs = cpu_bot.ProcMonitorBot(standalone=False)
+        tasks = [asyncio.ensure_future(monitor.start("token-system")),
+                 asyncio.ensure_future(procs.start("token-proc"))]
+        await asyncio.sleep(0)
+        await asyncio.wait_for(asyncio.gather(monitor.wait_until_ready(), procs.wait_until_ready()), 15)
+    for b in (monitor, procs):
+        b._outbox._heartbeat = 0    # 내용이 같아도 매번 edit (측정용)
+    print(f"시작 → 전송 가능: {(time.monotonic() - t0) * 1000:.1f} ms "
+          f"({'웹훅' if args.webhook else '게이트웨이'})\n")
+
+    targets = (
+        ("시스템", SYSTEM_CHANNEL, monitor, get_system_stats, monitor.publish),
+        ("프로세스", PROC_CHANNEL, procs, cpu_bot.collect_top_processes, procs.publish),
+    )
+    try:
+        for name, channel, b, collect, publish in targets:
+            await tick_latency(server, name, channel, collect, publish, args.ticks, args.gap)
+            await deletion_recovery(server, name, channel, b._outbox, collect, publish)
+            data = collect()
+            rates = [float(r) for r in args.rates.split(",")]
+            await max_rate(server, name, channel, b._outbox, data, publish, rates, args.duration)
+            print()
+    finally:
+        for b in (monitor, procs):
+            await b.close()
+        for t in tasks:
+            t.cancel()
+        if session is not None:
+            await session.close()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="REST 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 무작위 추가분 (초)")
+    parser.add_argument("--bucket-limit", type=int, default=5, help="라우트당 창 내 요청 수 (0 = 무제한)")
+    parser.add_argument("--bucket-window", type=float, default=5.0, help="레이트 리밋 창 (초)")
+    parser.add_argument("--random-429", type=float, default=0.0, help="무작위 429 확률")
+    parser.add_argument("--webhook", action="store_true", help="게이트웨이 대신 웹훅 전용 경로로 전송")
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--gap", type=float, default=1.1, help="틱 지연 측정 간격 (초)")
+    parser.add_argument("--rates", default="0.5,1,2,5,10")
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
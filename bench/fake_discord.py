@@ -0,0 +1,347 @@
+"""
+fake_discord.py — 로컬 Discord API 대역 (REST + 게이트웨이)
+봇이 실제 길드 없이 접속해 메시지를 보내고 수정할 수 있도록 필요한 최소한의
+엔드포인트만 흉내 냅니다. 지연, 레이트 리밋(429), 메시지 삭제를 주입할 수 있습니다.
+
+사용:
+    server = FakeDiscord(latency=0.05, bucket_limit=5, bucket_window=5.0)
+    await server.start()
+    server.patch_discord()      # discord.py 가 이 서버를 보도록 URL 교체
+    url = server.create_webhook(channel_id)   # 웹훅 전용 모드(webhook.py)용 URL
+    ...
+    server.delete_message(message_id)   # 다음 edit 은 404 (Unknown Message)
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import yarl
+from aiohttp import WSMsgType, web
+
+GUILD_ID = 100000000000000001
+_ids = itertools.count(200000000000000000)
+
+
+def _snowflake() -> str:
+    return str(next(_ids))
+
+
+def _json(data, status: int = 200, headers: dict | None = None) -> web.Response:
+    """discord.py 는 Content-Type 이 정확히 application/json 일 때만 JSON 으로 파싱함"""
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={"Content-Type": "application/json", **(headers or {})})
+
+
+@dataclass
+class Write:
+    """서버가 받은 메시지 생성/수정 요청 기록"""
+    at: float               # 수신 시각 (time.monotonic)
+    method: str
+    channel_id: int
+    message_id: str
+    status: int
+    payload: dict = field(repr=False, default_factory=dict)
+
+
+class _Bucket:
+    """라우트별 고정 창 레이트 리밋 (Discord 와 같은 헤더를 돌려줌)"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.reset_at = 0.0
+        self.remaining = limit
+
+    def take(self) -> tuple[bool, dict]:
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.reset_at = now + self.window
+            self.remaining = self.limit
+        reset_after = max(0.0, self.reset_at - now)
+        if self.remaining <= 0:
+            return False, {"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Remaining": "0",
+                           "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+        self.remaining -= 1
+        return True, {"X-RateLimit-Limit": str(self.limit),
+                      "X-RateLimit-Remaining": str(self.remaining),
+                      "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+                      "X-RateLimit-Bucket": "fake"}
+
+
+class FakeDiscord:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, bucket_limit: int = 0, bucket_window: float = 5.0,
+                 random_429: float = 0.0, channels: tuple[int, ...] = (300000000000000001,)):
+        self.host = host
+        self.port = port
+        self.latency = latency            # REST 응답 지연 (초)
+        self.jitter = jitter              # 지연 무작위 추가분 (초, 0~jitter)
+        self.bucket_limit = bucket_limit  # 라우트당 창 내 허용 요청 수 (0 = 무제한)
+        self.bucket_window = bucket_window
+        self.random_429 = random_429      # 이 확률로 버킷과 무관하게 429 응답
+        self.channels = channels
+        self.writes: deque[Write] = deque(maxlen=100_000)
+        self.messages: dict[str, dict] = {}
+        self.count_429 = 0
+        self._buckets: dict[str, _Bucket] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._runner: web.AppRunner | None = None
+        self._bots: dict[str, dict] = {}  # 토큰 → 봇 사용자
+        self._webhooks: dict[str, int] = {}   # 웹훅 ID → 채널 ID
+
+    # ── 서버 수명 ────────────────────────────────────────
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/gateway", self._ws)
+        app.router.add_get("/api/v10/gateway", self._gateway_url)
+        app.router.add_get("/api/v10/gateway/bot", self._gateway_url)
+        app.router.add_get("/api/v10/users/@me", self._me)
+        app.router.add_get("/api/v10/oauth2/applications/@me", self._application)
+        app.router.add_get("/api/v10/channels/{cid}/messages", self._history)
+        app.router.add_post("/api/v10/channels/{cid}/messages", self._create)
+        app.router.add_patch("/api/v10/channels/{cid}/messages/{mid}", self._edit)
+        app.router.add_delete("/api/v10/channels/{cid}/messages/{mid}", self._delete)
+        app.router.add_post("/api/v10/webhooks/{wid}/{token}", self._webhook_create)
+        app.router.add_patch("/api/v10/webhooks/{wid}/{token}/messages/{mid}", self._webhook_edit)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def patch_discord(self):
+        """discord.py 의 REST / 게이트웨이 주소를 이 서버로 교체"""
+        import discord.gateway
+        import discord.http
+        discord.http.Route.BASE = f"{self.base_url}/api/v10"
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(f"ws://{self.host}:{self.port}/gateway")
+
+    def create_webhook(self, channel_id: int) -> str:
+        """channel_id 에 글을 쓰는 웹훅 URL 생성"""
+        wid = _snowflake()
+        self._webhooks[wid] = channel_id
+        return f"{self.base_url}/api/v10/webhooks/{wid}/fake-token-{wid}"
+
+    # ── 장애 주입 / 관찰 ─────────────────────────────────
+
+    def delete_message(self, message_id) -> bool:
+        return self.messages.pop(str(message_id), None) is not None
+
+    def next_write(self) -> asyncio.Future:
+        """다음 메시지 생성/수정 요청이 도착하면 완료되는 Future"""
+        fut = asyncio.get_event_loop().create_future()
+        self._waiters.append(fut)
+        return fut
+
+    def _record(self, w: Write):
+        self.writes.append(w)
+        waiters, self._waiters = self._waiters, []
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(w)
+
+    # ── 공통 ─────────────────────────────────────────────
+
+    def _user_for(self, request: web.Request) -> dict:
+        return self._user_by_token(request.headers.get("Authorization", "Bot ?").split(" ", 1)[-1])
+
+    def _user_by_token(self, token: str) -> dict:
+        user = self._bots.get(token)
+        if user is None:
+            user = self._bots[token] = {
+                "id": _snowflake(), "username": f"bot{len(self._bots) + 1}",
+                "discriminator": "0000", "global_name": None, "avatar": None, "bot": True,
+            }
+        return user
+
+    async def _delay(self):
+        d = self.latency + (random.random() * self.jitter if self.jitter else 0.0)
+        if d > 0:
+            await asyncio.sleep(d)
+
+    def _limit(self, route: str) -> web.Response | dict:
+        """레이트 리밋 검사 — 제한이면 429 응답, 아니면 붙일 헤더"""
+        if self.random_429 and random.random() < self.random_429:
+            self.count_429 += 1
+            return _json({"message": "You are being rate limited.", "retry_after": 0.5,
+                                      "global": False}, status=429,
+                                     headers={"Retry-After": "0.5", "X-RateLimit-Remaining": "0",
+                                              "X-RateLimit-Reset-After": "0.5"})
+        if not self.bucket_limit:
+            return {}
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = _Bucket(self.bucket_limit, self.bucket_window)
+        ok, headers = bucket.take()
+        if not ok:
+            self.count_429 += 1
+            retry = float(headers["Retry-After"])
+            return _json({"message": "You are being rate limited.", "retry_after": retry,
+                                      "global": False}, status=429, headers=headers)
+        return headers
+
+    def _message(self, channel_id: int, author: dict, payload: dict, mid: str | None = None) -> dict:
+        now = datetime.now(timezone.utc).isoformat()
+        return {
+            "id": mid or _snowflake(), "channel_id": str(channel_id), "guild_id": str(GUILD_ID),
+            "author": author, "content": payload.get("content") or "",
+            "embeds": payload.get("embeds") or [], "timestamp": now,
+            "edited_timestamp": now if mid else None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "components": [], "pinned": False, "type": 0, "flags": 0,
+        }
+
+    # ── REST ─────────────────────────────────────────────
+
+    async def _gateway_url(self, request: web.Request):
+        return _json({
+            "url": f"ws://{self.host}:{self.port}/gateway", "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000,
+                                    "reset_after": 0, "max_concurrency": 1},
+        })
+
+    async def _me(self, request: web.Request):
+        return _json(self._user_for(request))
+
+    async def _application(self, request: web.Request):
+        user = self._user_for(request)
+        return _json({
+            "id": user["id"], "name": user["username"], "icon": None, "description": "",
+            "bot_public": False, "bot_require_code_grant": False, "verify_key": "0" * 64,
+            "flags": 0, "owner": user, "team": None,
+        })
+
+    async def _history(self, request: web.Request):
+        cid = request.match_info["cid"]
+        limit = int(request.query.get("limit", 50))
+        msgs = [m for m in self.messages.values() if m["channel_id"] == cid]
+        return _json(list(reversed(msgs))[:limit])
+
+    async def _payload(self, request: web.Request) -> dict:
+        if request.content_type.startswith("multipart"):
+            form = await request.post()
+            return json.loads(form.get("payload_json", "{}"))
+        return await request.json()
+
+    async def _create(self, request: web.Request):
+        return await self._create_in(int(request.match_info["cid"]), self._user_for(request), request)
+
+    async def _edit(self, request: web.Request):
+        return await self._edit_in(int(request.match_info["cid"]), request.match_info["mid"], request)
+
+    def _webhook_user(self, wid: str) -> dict:
+        return {"id": wid, "username": "webhook", "discriminator": "0000",
+                "global_name": None, "avatar": None, "bot": True}
+
+    async def _webhook_create(self, request: web.Request):
+        wid = request.match_info["wid"]
+        if wid not in self._webhooks:
+            return _json({"message": "Unknown Webhook", "code": 10015}, status=404)
+        resp = await self._create_in(self._webhooks[wid], self._webhook_user(wid), request)
+        if resp.status == 200 and request.query.get("wait") != "true":
+            return web.Response(status=204)
+        return resp
+
+    async def _webhook_edit(self, request: web.Request):
+        wid = request.match_info["wid"]
+        if wid not in self._webhooks:
+            return _json({"message": "Unknown Webhook", "code": 10015}, status=404)
+        return await self._edit_in(self._webhooks[wid], request.match_info["mid"], request)
+
+    async def _create_in(self, cid: int, author: dict, request: web.Request):
+        await self._delay()
+        limited = self._limit(f"POST {cid}")
+        payload = await self._payload(request)
+        if isinstance(limited, web.Response):
+            self._record(Write(time.monotonic(), "POST", cid, "", 429, payload))
+            return limited
+        msg = self._message(cid, author, payload)
+        self.messages[msg["id"]] = msg
+        self._record(Write(time.monotonic(), "POST", cid, msg["id"], 200, payload))
+        return _json(msg, headers=limited)
+
+    async def _edit_in(self, cid: int, mid: str, request: web.Request):
+        await self._delay()
+        limited = self._limit(f"PATCH {cid}")
+        payload = await self._payload(request)
+        if isinstance(limited, web.Response):
+            self._record(Write(time.monotonic(), "PATCH", cid, mid, 429, payload))
+            return limited
+        if mid not in self.messages:
+            self._record(Write(time.monotonic(), "PATCH", cid, mid, 404, payload))
+            return _json({"message": "Unknown Message", "code": 10008}, status=404)
+        msg = self._message(cid, self.messages[mid]["author"], payload, mid)
+        self.messages[mid] = msg
+        self._record(Write(time.monotonic(), "PATCH", cid, mid, 200, payload))
+        return _json(msg, headers=limited)
+
+    async def _delete(self, request: web.Request):
+        self.delete_message(request.match_info["mid"])
+        return web.Response(status=204)
+
+    # ── 게이트웨이 ───────────────────────────────────────
+
+    def _guild(self) -> dict:
+        return {
+            "id": str(GUILD_ID), "name": "fake-guild", "icon": None, "owner_id": "1",
+            "afk_timeout": 300, "verification_level": 0, "default_message_notifications": 0,
+            "explicit_content_filter": 0, "features": [], "mfa_level": 0, "system_channel_flags": 0,
+            "premium_tier": 0, "preferred_locale": "ko", "nsfw_level": 0, "large": False,
+            "member_count": 1, "unavailable": False, "joined_at": datetime.now(timezone.utc).isoformat(),
+            "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": str((1 << 41) - 1),
+                       "position": 0, "color": 0, "hoist": False, "managed": False,
+                       "mentionable": False, "flags": 0}],
+            "emojis": [], "stickers": [], "members": [], "voice_states": [], "presences": [],
+            "threads": [], "stage_instances": [], "guild_scheduled_events": [],
+            "channels": [
+                {"id": str(cid), "type": 0, "name": f"monitor-{i}", "position": i,
+                 "permission_overwrites": [], "nsfw": False, "parent_id": None,
+                 "rate_limit_per_user": 0, "topic": None, "last_message_id": None}
+                for i, cid in enumerate(self.channels)
+            ],
+        }
+
+    async def _ws(self, request: web.Request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        seq = 0
+
+        async def send(payload: dict):
+            await ws.send_str(json.dumps(payload))
+
+        await send({"op": 10, "d": {"heartbeat_interval": 41250}, "s": None, "t": None})
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            data = json.loads(msg.data)
+            op = data.get("op")
+            if op == 1:       # HEARTBEAT
+                await send({"op": 11, "d": None, "s": None, "t": None})
+            elif op == 2:     # IDENTIFY
+                token = data["d"]["token"].split(" ", 1)[-1]
+                user = self._user_by_token(token)
+                seq += 1
+                await send({"op": 0, "s": seq, "t": "READY", "d": {
+                    "v": 10, "user": user, "guilds": [{"id": str(GUILD_ID), "unavailable": True}],
+                    "session_id": _snowflake(), "resume_gateway_url": f"ws://{self.host}:{self.port}/gateway",
+                    "application": {"id": user["id"], "flags": 0}, "private_channels": [],
+                }})
+                seq += 1
+                await send({"op": 0, "s": seq, "t": "GUILD_CREATE", "d": self._guild()})
+            # op 3 (presence) 등은 무시
+        return ws
@@ -0,0 +1,121 @@
+"""
+fakeproc.py — 벤치마크용 가짜 /proc 트리 생성기
+코어 수와 프로세스 수를 지정해 /proc/stat, meminfo, net/dev, diskstats, self/mounts, uptime,
+loadavg, pressure/* 와
+프로세스별 stat / statm / status / cmdline 을 만듭니다.
+psutil 도 psutil.PROCFS_PATH 로 같은 트리를 읽을 수 있습니다.
+"""
+
+import os
+import random
+import time
+
+_NAMES = ("python3", "gunicorn", "java", "nginx", "postgres", "dockerd", "containerd-shim",
+          "node", "redis-server", "sshd", "systemd-journald", "kworker/0:1")
+
+
+def _write(path: str, data: str):
+    with open(path, "w") as f:
+        f.write(data)
+
+
+class FakeProc:
+    """가짜 /proc 트리 (root 디렉터리 아래에 생성)"""
+
+    def __init__(self, root: str, cores: int = 4, procs: int = 100, ifaces: int = 2, disks: int = 2,
+                 seed: int = 0):
+        self.root = root
+        self.cores = cores
+        self.procs = procs
+        self.ifaces = ifaces
+        self.disks = disks
+        self._rng = random.Random(seed)
+        self._tick = 0
+        self._pids = list(range(1, procs + 1))
+        self.boot_time = int(time.time()) - 86400
+
+    def build(self) -> "FakeProc":
+        os.makedirs(os.path.join(self.root, "net"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "self"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "pressure"), exist_ok=True)
+        # 디스크마다 파티션 2개, 첫 파티션은 실제로 statvfs 가능한 경로에 마운트된 것으로
+        mounts = ["proc /proc proc rw 0 0", "tmpfs /run tmpfs rw 0 0", "/dev/loop0 /snap/core squashfs ro 0 0"]
+        for d in range(self.disks):
+            mountpoint = "/" if d == 0 else self.root
+            mounts.append(f"/dev/sd{chr(97 + d)}1 {mountpoint} ext4 rw,relatime 0 0")
+        _write(os.path.join(self.root, "self", "mounts"), "\n".join(mounts) + "\n")
+        self._write_system()
+        uid = os.getuid()
+        for pid in self._pids:
+            d = os.path.join(self.root, str(pid))
+            os.makedirs(d, exist_ok=True)
+            name = _NAMES[pid % len(_NAMES)]
+            _write(os.path.join(d, "status"),
+                   f"Name:\t{name}\nState:\tS (sleeping)\nPid:\t{pid}\n"
+                   f"Uid:\t{uid}\t{uid}\t{uid}\t{uid}\nGid:\t0\t0\t0\t0\n")
+            _write(os.path.join(d, "cmdline"), f"{name}\0--worker\0")
+            self._write_pid(pid, name)
+        return self
+
+    def _write_pid(self, pid: int, name: str):
+        d = os.path.join(self.root, str(pid))
+        utime = pid * 7 + self._tick * (pid % 5)
+        stime = pid * 3 + self._tick
+        start = 1000 + pid
+        rss = 200 + (pid * 37) % 50000
+        _write(os.path.join(d, "stat"),
+               f"{pid} ({name}) S 1 {pid} {pid} 0 -1 4194560 1000 0 0 0 "
+               f"{utime} {stime} 0 0 20 0 1 0 {start} {rss * 4096 * 2} {rss} "
+               "18446744073709551615 1 1 0 0 0 0 0 4096 0 0 0 0 17 0 0 0 0 0 0\n")
+        _write(os.path.join(d, "statm"), f"{rss * 2} {rss} 100 10 0 {rss} 0\n")
+
+    def _write_system(self):
+        t = self._tick
+        lines = []
+        total = [0] * 10
+        for c in range(self.cores):
+            row = [1000 + t * 30 + c, 0, 500 + t * 10, 90000 + t * 60, 100 + t, 0, 10, 5 + t, 0, 0]
+            total = [a + b for a, b in zip(total, row)]
+            lines.append(f"cpu{c} " + " ".join(map(str, row)))
+        stat = "cpu  " + " ".join(map(str, total)) + "\n" + "\n".join(lines) + "\n"
+        stat += (f"intr 0\nctxt {t * 1000}\nbtime {self.boot_time}\n"
+                 f"processes {self.procs}\nprocs_running 1\nprocs_blocked 0\n")
+        _write(os.path.join(self.root, "stat"), stat)
+        _write(os.path.join(self.root, "meminfo"),
+               "MemTotal:        8000000 kB\nMemFree:         2000000 kB\n"
+               "MemAvailable:    5000000 kB\nBuffers:          100000 kB\n"
+               "Cached:          2000000 kB\nSwapCached:            0 kB\n"
+               "Active:          3000000 kB\nInactive:        1000000 kB\n"
+               "Shmem:             50000 kB\nSlab:             150000 kB\n"
+               "SReclaimable:     100000 kB\nSwapTotal:       2000000 kB\n"
+               "SwapFree:        1900000 kB\n")
+        net = ("Inter-|   Receive                                                |  Transmit\n"
+               " face |bytes    packets errs drop fifo frame compressed multicast|"
+               "bytes    packets errs drop fifo colls carrier compressed\n")
+        for i in range(self.ifaces):
+            rx, tx = 10_000_000 + t * 123_456 * (i + 1), 5_000_000 + t * 65_432 * (i + 1)
+            net += f"  eth{i}: {rx} 1000 0 0 0 0 0 0 {tx} 900 0 0 0 0 0 0\n"
+        _write(os.path.join(self.root, "net", "dev"), net)
+        disk = "   7       0 loop0 10 0 80 1 0 0 0 0 0 1 1 0 0 0 0\n"
+        for d in range(self.disks):
+            name = f"sd{chr(97 + d)}"
+            for part in ("", "1", "2"):
+                r, w = 1000 + t * 40 * (d + 1), 2000 + t * 25 * (d + 1)
+                disk += (f"   8      {d * 16 + len(part)} {name}{part} {r} 10 {r * 8} 500 "
+                         f"{w} 20 {w * 8} 900 0 {600 + t * 300} 1400 0 0 0 0\n")
+        _write(os.path.join(self.root, "diskstats"), disk)
+        _write(os.path.join(self.root, "loadavg"),
+               f"{0.5 + t % 7 * 0.1:.2f} 0.40 0.30 2/{self.procs} {self.procs + 1000}\n")
+        for resource, stall in (("cpu", 12_000), ("memory", 800), ("io", 5_000)):
+            some, full = t * stall, t * stall // 2
+            psi = f"some avg10=1.00 avg60=0.50 avg300=0.20 total={some}\n"
+            psi += f"full avg10=0.50 avg60=0.20 avg300=0.10 total={full}\n"
+            _write(os.path.join(self.root, "pressure", resource), psi)
+        _write(os.path.join(self.root, "uptime"), f"{time.time() - self.boot_time:.2f} 0.00\n")
+
+    def advance(self, pid_fraction: float = 0.1):
+        """시스템 카운터와 일부 프로세스의 CPU 틱을 진행 (다음 스캔에 차분이 생기도록)"""
+        self._tick += 1
+        self._write_system()
+        for pid in self._rng.sample(self._pids, max(1, int(len(self._pids) * pid_fraction))):
+            self._write_pid(pid, _NAMES[pid % len(_NAMES)])
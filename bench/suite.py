@@ -0,0 +1,259 @@
+"""
+suite.py — 수집 / 렌더 핫패스 벤치마크 모음
+가짜 /proc 트리(코어 4~256, 프로세스 100~20k)에서 틱마다 호출되는 함수들의
+호출당 지연과 메모리 할당량을 측정하고, 저장된 기준값과 비교해 회귀를 표시합니다.
+
+대상: get_system_stats, collect_top_processes, HomeServerMonitorBot._push,
+      build_embed (두 봇), 알림 규칙 평가, build_alert_embed,
+      슬래시 명령 응답 (/history, /peak — 30일치 롤업이 쌓인 저장소)
+
+실행:
+    python bench/suite.py                  # 전체 측정 + 기준값 비교
+    python bench/suite.py --quick          # 작은 매트릭스만
+    python bench/suite.py --save-baseline  # 현재 결과를 기준값으로 저장
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import config  # noqa: E402
+
+# 봇 상태 파일이 실제 data/ 디렉터리를 건드리지 않도록
+config.STATE_DIR = tempfile.mkdtemp(prefix="bench-state-")
+logging.disable(logging.WARNING)
+
+import bot  # noqa: E402
+import commands  # noqa: E402
+import cpu_bot  # noqa: E402
+import system_info  # noqa: E402
+from burst import BurstSampler  # noqa: E402
+from fakeproc import FakeProc  # noqa: E402
+
+# 저장소에 커밋된 기준값 (측정한 장비는 "_machine" 항목 — 다른 장비에서는 --baseline 으로 자체 기준값 사용)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+FULL_CORES = (4, 16, 64, 256)
+FULL_PROCS = (100, 1000, 5000, 20000)
+QUICK_CORES = (4, 64)
+QUICK_PROCS = (100, 1000)
+# _push 비교용 채워 둘 구간 길이 (초)
+WINDOW_FILLS = (("10m", 600), ("1h", 3600), ("24h", 86400))
+
+# 슬래시 명령 조회 구간
+QUERY_RANGES = ("1h", "24h", "7d", "30d")
+
+# 회귀 판정: 기준값 대비 이 비율 이상 느려지고, 절대 차이도 floor 이상일 때
+REGRESSION_RATIO = 1.25
+REGRESSION_FLOOR_US = 5.0
+
+
+def measure(fn, iterations: int, setup=None) -> dict:
+    """호출당 지연 (평균 / p50 / p95, µs) 과 호출 1회 최대 할당량 (KB)"""
+    fn()  # 워밍업
+    samples = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mean_us": statistics.fmean(samples),
+        "p50_us":  samples[len(samples) // 2],
+        "p95_us":  samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "alloc_kb": peak / 1024,
+    }
+
+
+def bench_collect(cores_list, procs_list, iterations: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="fakeproc-") as tmp:
+        for cores in cores_list:
+            root = os.path.join(tmp, f"c{cores}")
+            fake = FakeProc(root, cores=cores, procs=10).build()
+            system_info.use_proc_root(root)
+            results[f"get_system_stats[cores={cores}]"] = measure(
+                system_info.get_system_stats, iterations, setup=fake.advance
+            )
+            # 5 Hz 상시 실행되는 버스트 샘플 1회 비용
+            sampler = BurstSampler(root)
+            results[f"burst.sample_once[cores={cores}]"] = measure(
+                sampler.sample_once, iterations, setup=fake.advance
+            )
+            sampler.stop()
+        for procs in procs_list:
+            root = os.path.join(tmp, f"p{procs}")
+            fake = FakeProc(root, cores=4, procs=procs).build()
+            cpu_bot.use_proc_root(root)
+            n = max(3, iterations // max(1, procs // 100))
+            results[f"collect_top_processes[procs={procs}]"] = measure(
+                cpu_bot.collect_top_processes, n, setup=lambda: fake.advance(0.01)
+            )
+    system_info.use_proc_root("/proc")
+    cpu_bot.use_proc_root("/proc")
+    return results
+
+
+def _sample_stats(cores: int = 4) -> system_info.SystemStats:
+    return system_info.SystemStats(
+        cpu_percent=91.3, cpu_per_core=[float(i % 100) for i in range(cores)],
+        mem_used_gb=3.1, mem_total_gb=3.8, mem_percent=81.2,
+        swap_used_gb=0.2, swap_total_gb=2.0, swap_percent=10.0,
+        disk_used_gb=40.0, disk_total_gb=64.0, disk_percent=62.5,
+        net_recv_kb=12000.0, net_sent_kb=800.0, uptime_seconds=123456,
+        disks=[system_info.DiskIO("sda", 5120.0, 830.0, 210.0, 64.0),
+               system_info.DiskIO("nvme0n1", 120.0, 40000.0, 3100.0, 92.0)],
+        mounts=[system_info.MountUsage("/", "/dev/nvme0n1p2", 40.0, 64.0, 62.5),
+                system_info.MountUsage("/srv/media", "/dev/sda1", 1700.0, 1800.0, 94.4)],
+        nics=[system_info.NicIO("enp1s0", 11900.0, 780.0), system_info.NicIO("wlo1", 100.0, 20.0)],
+    )
+
+
+def bench_render(cores_list, iterations: int) -> dict:
+    results = {}
+    monitor = bot.HomeServerMonitorBot()
+    stats = _sample_stats()
+
+    # _push: 구간 길이별로 링 버퍼를 채운 뒤 측정
+    # mixed: 적응형 주기처럼 가중치가 섞인 경우 (히스토그램에 샘플 간격을 가중치로 누적)
+    step = config.MONITOR_INTERVAL_SECONDS
+    for label, seconds in WINDOW_FILLS + (("24h,mixed", 24 * 3600),):
+        monitor._windows = bot.RollingWindows(
+            monitor._METRICS, config.ROLLING_WINDOWS, monitor._windows.capacity
+        )
+        now = time.monotonic()
+        n = seconds // step
+        mixed = label.endswith("mixed")
+        for i in range(n):
+            monitor._windows.push({m: (i * 7) % 100 for m in monitor._METRICS},
+                                  now - (n - i) * step, step * (1 + i % 2) if mixed else step)
+        results[f"_push[filled={label}]"] = measure(lambda: monitor._push(stats), iterations)
+
+    windows = monitor._windows.snapshot()
+    reclaim = monitor._reclaim.status()
+    for cores in cores_list:
+        s = _sample_stats(cores)
+        results[f"build_embed[cores={cores}]"] = measure(
+            lambda: bot.build_embed(s, windows, reclaim), iterations
+        )
+    engine = bot.AlertEngine(bot.compile_rules(config.ALERT_RULES, config.ROLLING_WINDOWS))
+    results["alerts.evaluate"] = measure(lambda: engine.evaluate(stats, windows), iterations)
+    fired = [bot.Firing(rule, 95.0) for rule in engine.rules]
+    results["build_alert_embed"] = measure(lambda: bot.build_alert_embed(fired), iterations)
+
+    procs = [{"pid": i, "name": f"worker-{i}", "username": "www-data",
+              "cpu_percent": 50.0 - i, "memory_percent": 10.0 - i} for i in range(cpu_bot.TOP_N)]
+    data = {"top_cpu": procs, "top_mem": procs, "total_mem_gb": 4.0}
+    results["cpu_bot.build_embed"] = measure(lambda: cpu_bot.build_embed(data), iterations)
+    return results
+
+
+def bench_query(iterations: int) -> dict:
+    """/history, /peak 응답 embed — 30일치 샘플(60초 간격)을 롤업해 둔 저장소에서"""
+    results = {}
+    store = bot.TimeSeriesStore(tempfile.mkdtemp(prefix="bench-tsdb-"), config.TSDB_RETENTION)
+    stats = _sample_stats()
+    now = time.time()
+    for i in range(30 * 1440):
+        stats.cpu_percent = 20 + (i * 7) % 60
+        store.append(stats, ts=now - 30 * 86400 + i * 60, weight=60)
+    store.rollup(now)
+    for r in QUERY_RANGES:
+        results[f"/history[{r}]"] = measure(lambda: commands.history_embed(store, "cpu", r, now), iterations)
+        results[f"/peak[{r}]"] = measure(lambda: commands.peak_embed(store, "cpu", r, now), iterations)
+    store.close()
+    return results
+
+
+def machine_info() -> dict:
+    """기준값을 측정한 장비 (CPU 모델, 코어 수, 파이썬 버전, 날짜)"""
+    model = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo") as f:
+            model = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), model)
+    except OSError:
+        pass
+    return {"cpu": model, "cores": os.cpu_count(), "python": platform.python_version(),
+            "saved": time.strftime("%Y-%m-%d")}
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if (cur["mean_us"] > base["mean_us"] * REGRESSION_RATIO
+                and cur["mean_us"] - base["mean_us"] > REGRESSION_FLOOR_US):
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="작은 매트릭스만 측정")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    cores = QUICK_CORES if args.quick else FULL_CORES
+    procs = QUICK_PROCS if args.quick else FULL_PROCS
+
+    results = {}
+    results.update(bench_collect(cores, procs, args.iterations))
+    results.update(bench_render(cores, args.iterations))
+    results.update(bench_query(args.iterations))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = set(compare(results, baseline))
+    machine = baseline.get("_machine")
+    if machine:
+        print(f"기준값 장비: {machine['cpu']} · {machine['cores']}코어 · Python {machine['python']} ({machine['saved']})")
+
+    width = max(len(n) for n in results)
+    print(f"{'항목':<{width}}  {'평균 µs':>10}  {'p95 µs':>10}  {'할당 KB':>8}  {'기준 대비':>9}")
+    for name, r in results.items():
+        base = baseline.get(name)
+        delta = f"{r['mean_us'] / base['mean_us']:.2f}x" if base else "-"
+        mark = "  ← 회귀" if name in regressions else ""
+        print(f"{name:<{width}}  {r['mean_us']:>10.1f}  {r['p95_us']:>10.1f}  "
+              f"{r['alloc_kb']:>8.1f}  {delta:>9}{mark}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline["_machine"] = machine_info()
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"기준값 저장: {args.baseline}")
+    elif regressions:
+        print(f"회귀 {len(regressions)}건")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 import asyncio
 import logging
-from collections import deque
+import os
+import time
 from datetime import datetime, timezone, timedelta
 
 import discord
-from discord.ext import tasks
 
 import config
-from system_info import get_system_stats, format_uptime, make_bar
+import metrics
+from alerts import AlertEngine, Firing, compile_rules
+from commands import register_monitor_commands, sync_commands
+from outbound import ChannelTransport, Outbox, RateLimitTracker
+from reclaim import ReclaimTracker
+from render import make_bar
+from rolling import RollingWindows
+from scheduler import AdaptiveCadence, Ticker
+from shaper import LoadShaper
+from state import StateFile, state_path
+from system_info import (
+    get_system_stats, format_uptime, net_counters, restore_net_counters,
+    start_burst_sampler, stop_burst_sampler,
+)
+from tsdb import FIELDS, TimeSeriesStore
 
 # 로깅 설정
 logging.basicConfig(
@@ -20,9 +34,20 @@ log = logging.getLogger("homeserver-monitor")
 # 한국 시간대 (UTC+9)
 KST = timezone(timedelta(hours=9))
 
+# 장치별 목록 (마운트 / 디스크 I/O / 인터페이스) 최대 표시 줄 수 (embed 필드 1024자 제한)
+DEVICE_LINES = 6
+
 
-def build_embed(stats, avg: dict) -> discord.Embed:
-    """시스템 통계를 Discord Embed로 변환 (현재값 + 10분 이동평균)"""
+def build_embed(stats, windows: dict, reclaim: dict | None = None,
+                shaper: dict | None = None) -> discord.Embed:
+    """시스템 통계를 Discord Embed로 변환 (현재값 + 10분 이동평균 / 1시간 p95)
+
+    windows: RollingWindows.snapshot() 결과 ({지표: {구간: WindowSummary}})
+    reclaim: ReclaimTracker.status() 결과 (Oracle 회수 위험, 생략 가능)
+    shaper : LoadShaper.status() 결과 (회수 방지 합성 부하, 비활성화 시 생략)
+    """
+    cpu, mem, disk = windows["cpu"], windows["mem"], windows["disk"]
+    net_recv, net_sent = windows["net_recv"], windows["net_sent"]
 
     # 임계값 초과 여부에 따라 색상 결정
     if stats.cpu_percent >= config.CPU_WARN_THRESHOLD or \
@@ -51,11 +76,32 @@ def build_embed(stats, avg: dict) -> discord.Embed:
         value=(
             f"`{cpu_bar}` **{stats.cpu_percent:.1f}%**{cpu_warn}\n"
             f"코어별: {' / '.join(f'{c:.0f}%' for c in stats.cpu_per_core)}\n"
-            f"10분 평균: **{avg['cpu']:.1f}%**"
+            f"구간 최대: **{stats.cpu_peak:.0f}%** · p95: **{stats.cpu_p95:.0f}%**\n"
+            f"10분 평균: **{cpu['10m'].mean:.1f}%** · 1시간 p95: **{cpu['1h'].p95:.1f}%**"
         ),
         inline=False,
     )
 
+    # 경합 (사용률에 드러나지 않는 대기 — 부하 평균, I/O 대기 / 스틸, PSI)
+    def warn(value, threshold) -> str:
+        return " ⚠️" if value is not None and value >= threshold else ""
+
+    contention = (
+        f"부하 평균: **{stats.load_1:.2f}** / {stats.load_5:.2f} / {stats.load_15:.2f} "
+        f"(코어당 {stats.load_per_core:.2f}){warn(stats.load_per_core, config.LOAD_WARN_PER_CORE)}\n"
+        f"I/O 대기: **{stats.cpu_iowait:.1f}%** · 스틸: **{stats.cpu_steal:.1f}%**"
+        f"{warn(stats.cpu_steal, config.STEAL_WARN_THRESHOLD)}"
+    )
+    if stats.psi_cpu is not None:
+        psi = [("CPU", stats.psi_cpu, None), ("메모리", stats.psi_memory, stats.psi_memory_full),
+               ("I/O", stats.psi_io, stats.psi_io_full)]
+        contention += "\nPSI (some / full): " + " · ".join(
+            f"{name} **{some:.1f}%**" + (f" / {full:.1f}%" if full is not None else "")
+            + warn(some, config.PSI_WARN_THRESHOLD)
+            for name, some, full in psi if some is not None
+        )
+    embed.add_field(name="경합", value=contention, inline=False)
+
     # 메모리
     mem_bar = make_bar(stats.mem_percent)
     mem_warn = " ⚠️" if stats.mem_percent >= config.MEM_WARN_THRESHOLD else ""
@@ -64,7 +110,7 @@ def build_embed(stats, avg: dict) -> discord.Embed:
         value=(
             f"`{mem_bar}` **{stats.mem_percent:.1f}%**{mem_warn}\n"
             f"{stats.mem_used_gb:.1f} GB / {stats.mem_total_gb:.1f} GB\n"
-            f"10분 평균: **{avg['mem']:.1f}%**"
+            f"10분 평균: **{mem['10m'].mean:.1f}%** · 1시간 p95: **{mem['1h'].p95:.1f}%**"
         ),
         inline=True,
     )
@@ -89,41 +135,97 @@ def build_embed(stats, avg: dict) -> discord.Embed:
         value=(
             f"`{disk_bar}` **{stats.disk_percent:.1f}%**{disk_warn}\n"
             f"{stats.disk_used_gb:.1f} GB / {stats.disk_total_gb:.1f} GB\n"
-            f"10분 평균: **{avg['disk']:.1f}%**"
+            f"10분 평균: **{disk['10m'].mean:.1f}%**"
         ),
         inline=True,
     )
 
-    # 네트워크
+    # 그 밖의 마운트 (루트 제외)
+    mounts = [m for m in stats.mounts if m.mountpoint != "/"][:DEVICE_LINES]
+    if mounts:
+        embed.add_field(
+            name="마운트",
+            value="\n".join(
+                f"`{m.mountpoint}` **{m.percent:.1f}%** ({m.used_gb:.1f} / {m.total_gb:.1f} GB)"
+                + (" ⚠️" if m.percent >= config.DISK_WARN_THRESHOLD else "")
+                for m in mounts
+            ),
+            inline=True,
+        )
+
+    # 블록 장치별 I/O
+    if stats.disks:
+        embed.add_field(
+            name="디스크 I/O",
+            value="\n".join(
+                f"`{d.name}` 읽기 **{d.read_kb:.0f}** · 쓰기 **{d.write_kb:.0f}** KB/s · "
+                f"**{d.iops:.0f}** IOPS · 사용률 **{d.busy_percent:.0f}%**"
+                + (" ⚠️" if d.busy_percent >= config.DISK_BUSY_WARN_THRESHOLD else "")
+                for d in stats.disks[:DEVICE_LINES]
+            ),
+            inline=False,
+        )
+
+    # 네트워크 (인터페이스별은 전송량 많은 순)
+    nics = sorted(stats.nics, key=lambda n: n.recv_kb + n.sent_kb, reverse=True)[:DEVICE_LINES]
+    nic_lines = "".join(
+        f"\n`{n.name}` ↓ **{n.recv_kb:.1f}** / ↑ **{n.sent_kb:.1f}** KB/s" for n in nics
+    )
     embed.add_field(
         name="네트워크",
         value=(
             f"수신 ↓ **{stats.net_recv_kb:.1f} KB/s**\n"
             f"송신 ↑ **{stats.net_sent_kb:.1f} KB/s**\n"
-            f"10분 평균: ↓ **{avg['net_recv']:.1f}** / ↑ **{avg['net_sent']:.1f}** KB/s"
+            f"구간 최대: ↓ **{stats.net_recv_peak_kb:.1f}** / ↑ **{stats.net_sent_peak_kb:.1f}** KB/s\n"
+            f"10분 평균: ↓ **{net_recv['10m'].mean:.1f}** / ↑ **{net_sent['10m'].mean:.1f}** KB/s\n"
+            f"1시간 p95: ↓ **{net_recv['1h'].p95:.1f}** / ↑ **{net_sent['1h'].p95:.1f}** KB/s"
+            f"{nic_lines}"
         ),
         inline=True,
     )
 
+    # Oracle 회수 위험 (7일 p95)
+    if reclaim is not None:
+        line = config.RECLAIM_THRESHOLD_PERCENT
+        if reclaim["at_risk"]:
+            verdict = f"⚠️ **회수 대상** — 세 항목 모두 {line}% 미만"
+        else:
+            verdict = "✅ 안전"
+        embed.add_field(
+            name="회수 위험 (7일 p95)",
+            value=(
+                f"CPU **{reclaim['cpu']:.1f}%** · 메모리 **{reclaim['mem']:.1f}%** · "
+                f"네트워크 **{reclaim['net']:.2f}%**\n"
+                f"{verdict} (수집 {reclaim['days']:.1f}일)"
+            ),
+            inline=False,
+        )
+
+    # 회수 방지 합성 부하 (위 CPU 사용률에 포함된 주입분을 따로 표시)
+    if shaper is not None:
+        mode = {
+            "recover":  "회복 중 — 7일 p95 가 유지선 미만, 매 틱 부족분 보충",
+            "maintain": f"유지 — 시간당 {shaper['active'] * 100:.0f}% 구간만 가동",
+            "idle":     "대기 — 실제 부하만으로 충분",
+        }.get(shaper["mode"], shaper["mode"])
+        embed.add_field(
+            name="부하 유지 (회수 방지)",
+            value=(
+                f"주입 CPU **{shaper['injected']:.1f}%** · 실제 부하 **{shaper['real']:.1f}%** · "
+                f"유지선 {shaper['floor']:g}%\n{mode}"
+            ),
+            inline=False,
+        )
+
     embed.set_footer(text=now_kst)
     return embed
 
 
-def build_alert_embed(stats) -> discord.Embed:
-    """임계값 초과 시 전송할 알림 Embed"""
-    alerts = []
-    if stats.cpu_percent >= config.CPU_ALERT_THRESHOLD:
-        alerts.append(f"CPU **{stats.cpu_percent:.1f}%** (임계값: {config.CPU_ALERT_THRESHOLD}%)")
-    if stats.disk_percent >= config.DISK_ALERT_THRESHOLD:
-        alerts.append(f"디스크 **{stats.disk_percent:.1f}%** (임계값: {config.DISK_ALERT_THRESHOLD}%)")
-    if stats.net_recv_kb >= config.NET_ALERT_THRESHOLD_KB:
-        alerts.append(f"네트워크 수신 ↓ **{stats.net_recv_kb / 1024:.1f} MB/s** (임계값: {config.NET_ALERT_THRESHOLD_KB // 1024} MB/s)")
-    if stats.net_sent_kb >= config.NET_ALERT_THRESHOLD_KB:
-        alerts.append(f"네트워크 송신 ↑ **{stats.net_sent_kb / 1024:.1f} MB/s** (임계값: {config.NET_ALERT_THRESHOLD_KB // 1024} MB/s)")
-
+def build_alert_embed(fired: list[Firing]) -> discord.Embed:
+    """같은 틱에 발생한 알림 규칙들을 묶은 Embed"""
     embed = discord.Embed(
         title="🚨 리소스 경고",
-        description="\n".join(f"• {a}" for a in alerts),
+        description="\n".join(f"• {f.rule.describe(f.value)}" for f in fired),
         color=config.COLOR_CRIT,
         timestamp=datetime.now(timezone.utc),
     )
@@ -131,42 +233,167 @@ def build_alert_embed(stats) -> discord.Embed:
     return embed
 
 
+def build_recover_embed(cleared: list[Firing]) -> discord.Embed:
+    """같은 틱에 해제된 알림 규칙들을 묶은 Embed"""
+    embed = discord.Embed(
+        title="✅ 리소스 정상화",
+        description="\n".join(f"• {f.rule.describe_clear(f.value)}" for f in cleared),
+        color=config.COLOR_NORMAL,
+        timestamp=datetime.now(timezone.utc),
+    )
+    embed.set_footer(text=datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S KST"))
+    return embed
+
+
+# 적응형 수집 주기에서 알림 규칙 외에 함께 보는 경고 색상 임계값 (SystemStats 필드, 임계값, 방향)
+WARN_TARGETS = (
+    ("cpu_percent", config.CPU_WARN_THRESHOLD, 1),
+    ("mem_percent", config.MEM_WARN_THRESHOLD, 1),
+    ("disk_percent", config.DISK_WARN_THRESHOLD, 1),
+    ("load_per_core", config.LOAD_WARN_PER_CORE, 1),
+)
+
+
 class HomeServerMonitorBot(discord.Client):
-    # 10초 주기 × 60 = 10분치 샘플
-    _WINDOW = 60
+    # 이동 통계 지표 (SystemStats 필드 → 지표 이름)
+    _METRICS = ("cpu", "mem", "disk", "net_recv", "net_sent")
 
-    def __init__(self):
+    def __init__(self, standalone: bool = True, transport=None):
         intents = discord.Intents.default()
-        super().__init__(intents=intents)
-        # 이전 알림 상태 추적 (연속 알림 방지)
-        self._alert_state = {"cpu": False, "disk": False, "net_recv": False, "net_sent": False}
-        # 고정 상태 메시지 (edit용)
-        self._status_message: discord.Message | None = None
-        # 이동평균 버퍼
-        self._buf_cpu      = deque(maxlen=self._WINDOW)
-        self._buf_mem      = deque(maxlen=self._WINDOW)
-        self._buf_disk     = deque(maxlen=self._WINDOW)
-        self._buf_net_recv = deque(maxlen=self._WINDOW)
-        self._buf_net_sent = deque(maxlen=self._WINDOW)
-
-    def _push(self, stats) -> dict:
-        """샘플을 버퍼에 추가하고 현재 이동평균 반환"""
-        self._buf_cpu.append(stats.cpu_percent)
-        self._buf_mem.append(stats.mem_percent)
-        self._buf_disk.append(stats.disk_percent)
-        self._buf_net_recv.append(stats.net_recv_kb)
-        self._buf_net_sent.append(stats.net_sent_kb)
-        return {
-            "cpu":      sum(self._buf_cpu)      / len(self._buf_cpu),
-            "mem":      sum(self._buf_mem)      / len(self._buf_mem),
-            "disk":     sum(self._buf_disk)     / len(self._buf_disk),
-            "net_recv": sum(self._buf_net_recv) / len(self._buf_net_recv),
-            "net_sent": sum(self._buf_net_sent) / len(self._buf_net_sent),
-        }
+        # standalone=False 이면 자체 수집 루프 없이 공유 수집기(host.py)가 publish 를 호출
+        self._standalone = standalone
+        # 응답 헤더로 레이트 리밋 버킷 추적 (웹훅 전송이면 웹훅 세션의 추적기 사용)
+        limiter = getattr(transport, "limiter", None) or RateLimitTracker()
+        super().__init__(intents=intents, http_trace=limiter.trace_config())
+        # 재시작 상태 (상태 메시지 ID, 알림 상태, 네트워크 카운터)
+        self._state = StateFile(state_path("monitor"))
+        # 알림 규칙 엔진 (발생 상태는 재시작해도 이어받음 → 조건이 계속되면 다시 알리지 않음)
+        self._alerts = AlertEngine(compile_rules(config.ALERT_RULES, config.ROLLING_WINDOWS))
+        self._alerts.restore(self._state.get("alerts", {}))
+        # 직전 실행의 네트워크 카운터를 기준점으로 (첫 샘플부터 전송량 계산)
+        if restore_net_counters(self._state.get("net")):
+            log.info("네트워크 카운터 복원")
+        # 발신 스케줄러 (고정 상태 메시지 edit + 알림, 수집 루프는 HTTP 를 기다리지 않음)
+        # transport 를 넘기면 (webhook.py) 게이트웨이 접속 없이 그 경로로만 전송
+        self._outbox = Outbox(
+            transport or ChannelTransport(self, config.MONITOR_CHANNEL_ID), limiter, "monitor",
+            heartbeat=config.STATUS_HEARTBEAT_SECONDS, state=self._state,
+        )
+        # 저장된 상태 메시지 ID 가 있으면 채널 히스토리 조회 없이 바로 edit
+        self._outbox.restore_message()
+        # 수집 주기 (ADAPTIVE_INTERVAL 이면 임계값과의 거리에 따라 격자 배수로 조정)
+        self.cadence = AdaptiveCadence(
+            config.COLLECT_GRID_SECONDS, config.MONITOR_INTERVALS, config.ADAPTIVE_HEADROOM, name="monitor",
+        )
+        self._last_sample: float | None = None
+        # 이동 통계 링 버퍼 (가장 긴 구간 ÷ 가장 짧은 수집 주기 + 여유분)
+        capacity = int(max(config.ROLLING_WINDOWS.values()) // config.COLLECT_GRID_SECONDS) + 2
+        self._windows = RollingWindows(self._METRICS, config.ROLLING_WINDOWS, capacity)
+        # Oracle 회수 판정용 7일 p95 (재시작해도 유지되도록 체크포인트)
+        self._reclaim = ReclaimTracker(os.path.join(config.STATE_DIR, "reclaim.json"))
+        # 샘플 영구 저장 (재시작 시 이동 통계 복원 + 롤업)
+        self._store = TimeSeriesStore(os.path.join(config.STATE_DIR, "tsdb"), config.TSDB_RETENTION)
+        self._last_maintain = 0.0
+        # 슬래시 명령 (/history, /peak) — 게이트웨이 접속 시에만, 웹훅 전용 실행에서는 사용 불가
+        self.tree = discord.app_commands.CommandTree(self)
+        register_monitor_commands(self.tree, self._store)
+        # 회수 방지 합성 부하 (LOAD_SHAPER=1 일 때만, 워커는 발신 작업자와 함께 시작)
+        self._shaper = LoadShaper(
+            config.LOAD_SHAPER_FLOOR, config.LOAD_SHAPER_SHARE, config.LOAD_SHAPER_CYCLE,
+            config.LOAD_SHAPER_PERIOD_MS / 1000,
+        ) if config.LOAD_SHAPER else None
+        # 절대 마감 시각 기반 수집 주기 (standalone 일 때만 사용)
+        self._ticker = Ticker(config.COLLECT_GRID_SECONDS, "monitor")
+        self._monitor_task: asyncio.Task | None = None
+        self._warm_windows()
+
+    def _warm_windows(self):
+        """저장소의 최근 raw 샘플을 한 번의 순차 읽기로 이동 통계에 채워 넣음"""
+        now_wall, now_mono = time.time(), time.monotonic()
+        try:
+            rows = self._store.read("raw", now_wall - max(config.ROLLING_WINDOWS.values()))
+        except OSError as e:
+            log.warning(f"시계열 저장소 읽기 실패: {e}")
+            return
+        idx = {m: 1 + FIELDS.index(m) for m in self._METRICS}
+        for row in rows:
+            # 벽시계 시각 → 단조 시각으로 변환, 저장된 수집 간격(레코드 마지막 필드)을 가중치로
+            self._windows.push({m: row[i] for m, i in idx.items()}, now_mono - (now_wall - row[0]), row[-1])
+        if rows:
+            log.info(f"이동 통계 복원: 샘플 {len(rows)}개")
+
+    @staticmethod
+    def _weight(dt: float) -> float:
+        """샘플 간격 → 이동 통계 가중치 (초)
+
+        격자 배수로 맞춰 지터에 흔들리지 않게 하고 (같은 주기면 같은 가중치),
+        재시작 공백처럼 긴 간격은 가장 긴 수집 주기로 제한한다.
+        """
+        grid = config.COLLECT_GRID_SECONDS
+        steps = min(max(1, round(dt / grid)), round(max(config.MONITOR_INTERVALS) / grid))
+        return steps * grid
+
+    def _push(self, stats) -> tuple[float, dict]:
+        """샘플을 링 버퍼에 추가하고 (가중치, 구간별 통계) 반환 (직전 샘플 이후 간격으로 시간 가중)"""
+        now = time.monotonic()
+        dt = now - self._last_sample if self._last_sample is not None else self.cadence.interval
+        self._last_sample = now
+        weight = self._weight(dt)
+        self._windows.push({
+            "cpu":      stats.cpu_percent,
+            "mem":      stats.mem_percent,
+            "disk":     stats.disk_percent,
+            "net_recv": stats.net_recv_kb,
+            "net_sent": stats.net_sent_kb,
+        }, now, weight)
+        # 7일 스케치는 기본 주기 샘플 1개 = 가중치 1 (이전 체크포인트와 단위 유지)
+        self._reclaim.add(stats, weight=weight / config.MONITOR_INTERVAL_SECONDS)
+        return weight, self._windows.snapshot()
+
+    async def close(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+        # 종료 직전 스케치 / 상태 저장 (다음 실행에서 7일 p95 와 전송량 계산을 이어서)
+        try:
+            self._reclaim.save()
+        except OSError as e:
+            log.warning(f"회수 판정 스케치 저장 실패: {e}")
+        self._save_state(with_net=True)
+        self._store.close()
+        if self._shaper is not None:
+            self._shaper.stop()
+        await self._outbox.close()
+        if self._standalone:
+            stop_burst_sampler()
+            await metrics.stop()
+        await super().close()
+
+    def _save_state(self, with_net: bool = False):
+        """알림 상태 (+ 네트워크 카운터) 저장 — 바뀐 내용이 없으면 쓰지 않음"""
+        self._state.update(alerts=self._alerts.active())
+        if with_net:
+            self._state.update(net=net_counters())
+        try:
+            self._state.save()
+        except OSError as e:
+            log.warning(f"상태 파일 저장 실패: {e}")
+
+    def start_detached(self):
+        """게이트웨이 접속 없이 발신 작업자만 시작 (webhook.py 가 publish 를 호출)"""
+        self._outbox.start()
+        if self._shaper is not None:
+            self._shaper.start()
 
     async def setup_hook(self):
         # 봇 준비 후 태스크 시작
-        self.monitor_task.start()
+        self._outbox.start()
+        if self._shaper is not None:
+            self._shaper.start()
+        if self._standalone and config.METRICS_PORT:
+            await metrics.start(config.METRICS_PORT, config.METRICS_HOST)
+        if self._standalone:
+            start_burst_sampler(config.BURST_SAMPLE_MS / 1000)
+            self._monitor_task = self.loop.create_task(self._monitor_loop())
 
     async def on_ready(self):
         log.info(f"봇 로그인 완료: {self.user} (ID: {self.user.id})")
@@ -177,108 +404,104 @@ class HomeServerMonitorBot(discord.Client):
                 name="홈서버 모니터링"
             )
         )
-        # 재시작 후 이전 상태 메시지를 찾아 재사용 (메시지 누적 방지)
-        await self._recover_status_message()
+        # 상태 파일에 메시지 ID 가 없을 때만 채널 히스토리에서 이전 메시지를 찾음 (메시지 누적 방지)
+        if self._outbox.message is None:
+            await self._recover_status_message()
+        await sync_commands(self.tree, self.get_channel(config.MONITOR_CHANNEL_ID))
 
     async def _recover_status_message(self):
-        """채널 최근 메시지에서 봇이 보낸 embed 메시지를 찾아 _status_message로 복구"""
+        """채널 최근 메시지에서 봇이 보낸 embed 메시지를 찾아 상태 메시지로 복구"""
         channel = self.get_channel(config.MONITOR_CHANNEL_ID)
         if channel is None:
             return
         try:
             async for msg in channel.history(limit=20):
                 if msg.author.id == self.user.id and msg.embeds:
-                    self._status_message = msg
+                    self._outbox.adopt(msg)
                     log.info(f"이전 상태 메시지 복구: {msg.id}")
                     return
         except Exception as e:
             log.warning(f"메시지 복구 실패: {e}")
 
-    @tasks.loop(seconds=config.MONITOR_INTERVAL_SECONDS)
-    async def monitor_task(self):
-        """1분마다 시스템 정보를 디스코드 채널에 전송"""
-        channel = self.get_channel(config.MONITOR_CHANNEL_ID)
-        if channel is None:
-            log.warning(f"채널을 찾을 수 없습니다: {config.MONITOR_CHANNEL_ID}")
-            return
+    async def _monitor_loop(self):
+        """봇이 완전히 준비된 뒤 monotonic 격자에 맞춰 수집 시작"""
+        await self.wait_until_ready()
+        await self._ticker.run(self._monitor_tick)
 
+    async def _monitor_tick(self, tick: int):
+        """주기적으로 시스템 정보를 수집해 디스코드 채널에 전송"""
+        if not self.cadence.due(tick):
+            return
         try:
             # 별도 스레드에서 blocking I/O 실행 (이벤트 루프 블로킹 방지)
-            stats = await asyncio.get_event_loop().run_in_executor(
-                None, get_system_stats
-            )
-            avg = self._push(stats)
-            embed = build_embed(stats, avg)
-
-            # 고정 메시지가 있으면 edit, 없으면 새로 전송
-            if self._status_message is None:
-                self._status_message = await channel.send(embed=embed)
-            else:
-                try:
-                    await self._status_message.edit(embed=embed)
-                except discord.NotFound:
-                    # 메시지가 삭제된 경우 새로 전송
-                    self._status_message = await channel.send(embed=embed)
-
-            # 알림 상태 확인 및 전송 (상태가 바뀔 때만)
-            cpu_alert       = stats.cpu_percent  >= config.CPU_ALERT_THRESHOLD
-            disk_alert      = stats.disk_percent >= config.DISK_ALERT_THRESHOLD
-            net_recv_alert  = stats.net_recv_kb  >= config.NET_ALERT_THRESHOLD_KB
-            net_sent_alert  = stats.net_sent_kb  >= config.NET_ALERT_THRESHOLD_KB
-            newly_alert = (
-                (cpu_alert      and not self._alert_state["cpu"])      or
-                (disk_alert     and not self._alert_state["disk"])     or
-                (net_recv_alert and not self._alert_state["net_recv"]) or
-                (net_sent_alert and not self._alert_state["net_sent"])
-            )
-            newly_recover = (
-                (not cpu_alert      and self._alert_state["cpu"])      or
-                (not disk_alert     and self._alert_state["disk"])     or
-                (not net_recv_alert and self._alert_state["net_recv"]) or
-                (not net_sent_alert and self._alert_state["net_sent"])
-            )
-
-            if newly_alert:
-                alert_embed = build_alert_embed(stats)
-                await channel.send(content="@here", embed=alert_embed)
-                log.warning(
-                    f"알림 전송 | CPU: {stats.cpu_percent:.1f}% DISK: {stats.disk_percent:.1f}% "
-                    f"NET_RECV: {stats.net_recv_kb:.0f} KB/s NET_SENT: {stats.net_sent_kb:.0f} KB/s"
-                )
-            elif newly_recover:
-                recover_embed = discord.Embed(
-                    title="✅ 리소스 정상화",
-                    description=(
-                        f"• CPU **{stats.cpu_percent:.1f}%**\n"
-                        f"• 디스크 **{stats.disk_percent:.1f}%**\n"
-                        f"• 네트워크 수신 ↓ **{stats.net_recv_kb / 1024:.1f} MB/s**\n"
-                        f"• 네트워크 송신 ↑ **{stats.net_sent_kb / 1024:.1f} MB/s**"
-                    ),
-                    color=config.COLOR_NORMAL,
-                    timestamp=datetime.now(timezone.utc),
+            with metrics.timed("monitor", "collect"):
+                stats = await asyncio.get_event_loop().run_in_executor(
+                    None, get_system_stats
                 )
-                recover_embed.set_footer(text=datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S KST"))
-                await channel.send(embed=recover_embed)
-                log.info("리소스 정상화 알림 전송")
+        except Exception as e:
+            log.error(f"수집 오류: {e}", exc_info=True)
+            return
+        await self.publish(stats)
 
-            self._alert_state["cpu"]       = cpu_alert
-            self._alert_state["disk"]      = disk_alert
-            self._alert_state["net_recv"]  = net_recv_alert
-            self._alert_state["net_sent"]  = net_sent_alert
+    async def on_sample(self, sample):
+        """공유 수집기(collector.Collector) 구독 콜백"""
+        await self.publish(sample.stats)
+
+    async def publish(self, stats):
+        """수집된 통계를 이동 통계/저장소에 반영하고 상태 메시지·알림을 전송"""
+        if not self._outbox.ready:
+            log.warning(f"채널을 찾을 수 없습니다: {config.MONITOR_CHANNEL_ID}")
+            return
 
+        try:
+            with metrics.timed("monitor", "render"):
+                weight, windows = self._push(stats)
+                self._store.append(stats, weight=weight)
+                reclaim = self._reclaim.status()
+                shaper = None
+                if self._shaper is not None:
+                    # 방금 샘플과 7일 p95 로 다음 구간 duty 결정
+                    self._shaper.observe(stats.cpu_percent, reclaim["cpu"])
+                    shaper = self._shaper.status()
+                embed = build_embed(stats, windows, reclaim, shaper)
+                # 고정 메시지 edit 요청 (실제 전송은 Outbox 가 최신 embed 만 골라서)
+                self._outbox.set_status(embed)
+
+            if self._reclaim.save_due():
+                await asyncio.get_event_loop().run_in_executor(None, self._reclaim.save)
+                self._save_state(with_net=True)
+            if time.monotonic() - self._last_maintain >= config.TSDB_MAINTAIN_SECONDS:
+                # 롤업 / 보존 정리는 별도 스레드에서
+                self._last_maintain = time.monotonic()
+                await asyncio.get_event_loop().run_in_executor(None, self._store.maintain)
+
+            # 알림 규칙 평가 (발생 / 해제된 규칙은 각각 메시지 하나로 묶어서)
+            fired, cleared = self._alerts.evaluate(stats, windows)
+            if fired:
+                self._outbox.post(build_alert_embed(fired), content="@here")
+                log.warning("알림 전송 | " + ", ".join(
+                    f"{f.rule.name}={f.rule.format(f.value)}" for f in fired
+                ))
+            if cleared:
+                self._outbox.post(build_recover_embed(cleared))
+                log.info("리소스 정상화 알림 전송 | " + ", ".join(f.rule.name for f in cleared))
+            if fired or cleared:
+                self._save_state()
+
+            # 임계값까지 남은 여유로 다음 수집 주기 결정 (다음 주기 동안의 추세까지 반영)
+            self.cadence.observe(self._alerts.headroom(stats, windows, self.cadence.interval, WARN_TARGETS))
+
+            out = self._outbox.stats()
             log.info(
                 f"리포트 전송 | CPU: {stats.cpu_percent:.1f}% "
                 f"MEM: {stats.mem_percent:.1f}% "
-                f"DISK: {stats.disk_percent:.1f}%"
+                f"DISK: {stats.disk_percent:.1f}% "
+                f"| 주기: {self.cadence.interval:g}초 "
+                f"| 발신 대기: {out['queue_depth']} 교체: {out['superseded']} 생략: {out['unchanged']}"
             )
         except Exception as e:
             log.error(f"모니터링 오류: {e}", exc_info=True)
 
-    @monitor_task.before_loop
-    async def before_monitor(self):
-        """봇이 완전히 준비될 때까지 대기"""
-        await self.wait_until_ready()
-
 
 def main():
     if not config.DISCORD_BOT_TOKEN:
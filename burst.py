@@ -0,0 +1,124 @@
+"""
+burst.py — 고빈도 버스트 샘플러 (CPU / 네트워크)
+보고 주기(10초) 평균으로는 2초짜리 50 MB/s 버스트가 희석되어 보이지 않으므로,
+별도 스레드가 200 ms 마다 /proc/stat 첫 줄과 /proc/net/dev 를 직접 읽어
+보고 틱 사이의 최댓값(peak hold)과 p95 를 유지합니다.
+
+- 파일은 열어 둔 채 pread 로 재사용 버퍼에 읽음 (procfs.ProcFile)
+- /proc/stat 은 전체 CPU 한 줄만 필요하므로 작은 버퍼로 앞부분만 읽음
+- 샘플당 비용은 수십 µs 수준 → 5 Hz 상시 실행해도 코어 하나의 0.1% 미만
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from procfs import ProcFile, parse_net_dev
+
+log = logging.getLogger("burst")
+
+
+@dataclass
+class BurstSummary:
+    """직전 drain 이후 구간의 고빈도 샘플 요약"""
+    cpu_peak: float
+    cpu_p95: float
+    net_recv_peak_kb: float
+    net_recv_p95_kb: float
+    net_sent_peak_kb: float
+    net_sent_p95_kb: float
+    samples: int
+
+
+def _p95(values: list[float]) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * 0.95))]
+
+
+def _cpu_total(head: bytes) -> tuple[int, int]:
+    """/proc/stat 첫 줄 ("cpu  user nice system idle iowait irq softirq steal ...") → (busy, total)"""
+    fields = [int(x) for x in head[:head.index(b"\n")].split()[1:9]]
+    total = sum(fields)
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return total - idle, total
+
+
+class BurstSampler:
+    """interval 초마다 CPU / 네트워크 카운터를 읽는 데몬 스레드"""
+
+    def __init__(self, root: str = "/proc", interval: float = 0.2):
+        self.interval = interval
+        # 첫 줄만 필요 — 코어 수와 무관하게 작은 버퍼 하나로 충분
+        self._stat = ProcFile(os.path.join(root, "stat"), 256)
+        self._net = ProcFile(os.path.join(root, "net", "dev"))
+        self._lock = threading.Lock()
+        self._cpu: list[float] = []
+        self._rx: list[float] = []
+        self._tx: list[float] = []
+        self._prev: tuple[float, tuple[int, int], tuple[int, int]] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="burst-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self._stat.close()
+        self._net.close()
+
+    def _run(self):
+        # 절대 마감 시각 기준 (샘플 시간만큼 주기가 밀리지 않도록)
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except (OSError, ValueError) as e:
+                log.warning(f"버스트 샘플 실패: {e}")
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                deadline = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def sample_once(self):
+        now = time.monotonic()
+        cpu = _cpu_total(self._stat.head())
+        net = parse_net_dev(self._net.read())
+        prev, self._prev = self._prev, (now, cpu, net)
+        if prev is None:
+            return
+        t0, cpu0, net0 = prev
+        dt = now - t0
+        if dt <= 0:
+            return
+        total = cpu[1] - cpu0[1]
+        cpu_pct = max(0.0, min(100.0, (cpu[0] - cpu0[0]) / total * 100)) if total > 0 else 0.0
+        rx = max(0, net[0] - net0[0]) / dt / 1024
+        tx = max(0, net[1] - net0[1]) / dt / 1024
+        with self._lock:
+            self._cpu.append(cpu_pct)
+            self._rx.append(rx)
+            self._tx.append(tx)
+
+    def drain(self) -> BurstSummary | None:
+        """직전 drain 이후 샘플 요약을 반환하고 구간을 비움 (샘플이 없으면 None)"""
+        with self._lock:
+            cpu, rx, tx = self._cpu, self._rx, self._tx
+            self._cpu, self._rx, self._tx = [], [], []
+        if not cpu:
+            return None
+        return BurstSummary(
+            cpu_peak=max(cpu), cpu_p95=_p95(cpu),
+            net_recv_peak_kb=max(rx), net_recv_p95_kb=_p95(rx),
+            net_sent_peak_kb=max(tx), net_sent_p95_kb=_p95(tx),
+            samples=len(cpu),
+        )
@@ -0,0 +1,122 @@
+"""
+cgroups.py — cgroup v2 / systemd 유닛 단위 사용량 집계
+유닛 cgroup 디렉터리(*.service, *.scope)의 cpu.stat 과 memory.current 를 직접 읽어
+프로세스 수와 무관하게 O(유닛 수) 로 CPU / 메모리를 집계합니다.
+
+cgroup v2 가 없으면 프로세스 테이블의 /proc/[pid]/cgroup 경로로 프로세스별 값을 합산합니다.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+# 서비스 하나로 취급할 cgroup 디렉터리 접미사 (이 아래는 더 내려가지 않음)
+UNIT_SUFFIXES = (".service", ".scope")
+
+
+@dataclass
+class UnitUsage:
+    name: str             # 유닛 이름 (예: nginx.service, docker-<id>.scope)
+    path: str             # cgroup 경로 (/system.slice/nginx.service)
+    cpu_percent: float    # 직전 스캔 이후 사용률 (코어 1개 = 100%)
+    mem_bytes: int
+    procs: int = 0        # 프로세스 수 (합산 방식일 때만)
+
+
+def unit_name(path: str) -> str:
+    """cgroup 경로 → 유닛 이름 (경로에서 가장 안쪽 유닛 디렉터리, 없으면 경로 그대로)"""
+    for part in reversed(path.strip("/").split("/")):
+        if part.endswith(UNIT_SUFFIXES):
+            return part
+    return path or "/"
+
+
+def read_proc_cgroup(proc_dir: str) -> str:
+    """/proc/[pid]/cgroup 의 cgroup v2 경로 ("0::" 줄)"""
+    try:
+        with open(f"{proc_dir}/cgroup", "rb") as f:
+            for line in f.read().split(b"\n"):
+                if line.startswith(b"0::"):
+                    return line[3:].decode(errors="replace")
+    except OSError:
+        pass
+    return ""
+
+
+class CgroupTable:
+    """유닛 cgroup 의 cpu.stat / memory.current 를 주기적으로 읽는 테이블"""
+
+    def __init__(self, root: str = "/sys/fs/cgroup", rescan_every: int = 6):
+        self.root = root
+        self._rescan_every = rescan_every
+        self._units: list[str] = []               # 유닛 cgroup 경로 (root 기준 상대)
+        self._usage: dict[str, int] = {}          # 경로 → 직전 usage_usec
+        self._scans = 0
+        self._last_scan = 0.0
+
+    @staticmethod
+    def available(root: str = "/sys/fs/cgroup") -> bool:
+        return os.path.exists(os.path.join(root, "cgroup.controllers"))
+
+    def _discover(self):
+        """유닛 디렉터리 목록 갱신 (유닛 디렉터리 안으로는 내려가지 않음)"""
+        units = []
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                it = os.scandir(os.path.join(self.root, rel.lstrip("/")) if rel else self.root)
+            except OSError:
+                continue
+            with it:
+                for d in it:
+                    if not d.is_dir(follow_symlinks=False):
+                        continue
+                    child = f"{rel}/{d.name}"
+                    if d.name.endswith(UNIT_SUFFIXES):
+                        units.append(child)
+                    else:
+                        stack.append(child)
+        self._units = units
+
+    def scan(self) -> list[UnitUsage]:
+        now = time.monotonic()
+        elapsed = now - self._last_scan if self._last_scan else 0.0
+        self._last_scan = now
+        if self._scans % self._rescan_every == 0:
+            self._discover()
+        self._scans += 1
+
+        result = []
+        usage = {}
+        for rel in self._units:
+            base = os.path.join(self.root, rel.lstrip("/"))
+            try:
+                with open(f"{base}/cpu.stat", "rb") as f:
+                    usec = int(f.readline().split()[1])   # 첫 줄: usage_usec
+                with open(f"{base}/memory.current", "rb") as f:
+                    mem = int(f.read())
+            except (OSError, ValueError, IndexError):
+                continue
+            prev = self._usage.get(rel)
+            usage[rel] = usec
+            cpu = (usec - prev) / (elapsed * 1e6) * 100 if prev is not None and elapsed > 0 else 0.0
+            result.append(UnitUsage(unit_name(rel), rel, max(0.0, cpu), mem))
+        # 사라진 유닛 정리
+        self._usage = usage
+        return result
+
+
+def rollup_processes(entries) -> list[UnitUsage]:
+    """프로세스 항목(ProcEntry)들을 cgroup 유닛별로 합산 (cgroup v2 직접 읽기 불가 시)"""
+    units: dict[str, UnitUsage] = {}
+    for e in entries:
+        path = e.cgroup or "/"
+        name = unit_name(path)
+        u = units.get(name)
+        if u is None:
+            u = units[name] = UnitUsage(name, path, 0.0, 0)
+        u.cpu_percent += e.cpu_percent
+        u.mem_bytes += e.rss
+        u.procs += 1
+    return list(units.values())
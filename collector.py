@@ -0,0 +1,90 @@
+"""
+collector.py — 공유 수집 파이프라인
+한 틱에 /proc 을 한 번만 읽고 그 결과를 여러 봇(렌더러)에 나눠 줍니다.
+host.py 에서 시스템 모니터 봇과 프로세스 모니터 봇이 함께 사용합니다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import metrics
+from scheduler import AdaptiveCadence, Ticker
+from system_info import SystemStats, get_system_stats
+
+log = logging.getLogger("collector")
+
+
+@dataclass
+class Sample:
+    ts: float                      # 수집 시각 (time.time())
+    stats: Optional[SystemStats]   # get_system_stats 결과 (needs_stats 구독자가 있는 틱에만)
+    procs: Optional[dict] = None   # collect_top_processes 결과 (구독자가 필요로 할 때만)
+
+
+@dataclass
+class _Subscriber:
+    callback: Callable[[Sample], Awaitable[None]]
+    needs_procs: bool
+    every: int                     # 몇 틱마다 호출할지
+    cadence: Optional[AdaptiveCadence] = None   # 있으면 every 대신 적응형 주기로 판정
+    needs_stats: bool = True
+
+    def due(self, tick: int) -> bool:
+        if self.cadence is not None:
+            return self.cadence.due(tick)
+        return tick % self.every == 0
+
+
+class Collector:
+    """주기적으로 시스템/프로세스 정보를 수집해 구독자에게 전달
+
+    get_system_stats 는 호출할 때마다 CPU / 네트워크 차분 기준과 버스트 구간을 새로 시작하므로
+    needs_stats 구독자가 호출되는 틱에만 부른다. (프로세스 구독자만 호출되는 틱에 읽으면
+    시스템 구독자의 샘플이 마지막 틱 이후 구간만 반영하고 버스트 최댓값도 사라짐)
+    """
+
+    def __init__(self, interval: float, collect_procs: Optional[Callable[..., dict]] = None):
+        self.interval = interval
+        self._collect_procs = collect_procs
+        self._subscribers: list[_Subscriber] = []
+        self._tick = 0
+        self.ticker = Ticker(interval, "collector")
+
+    def subscribe(self, callback: Callable[[Sample], Awaitable[None]],
+                  needs_procs: bool = False, every: int = 1,
+                  cadence: Optional[AdaptiveCadence] = None, needs_stats: bool = True):
+        self._subscribers.append(_Subscriber(callback, needs_procs, max(1, every), cadence, needs_stats))
+
+    def _collect(self, with_stats: bool, with_procs: bool) -> Sample:
+        """블로킹 수집 (executor 스레드에서 실행)"""
+        with metrics.timed("collector", "collect"):
+            stats = get_system_stats() if with_stats else None
+            procs = None
+            if with_procs and self._collect_procs is not None:
+                # 시스템 통계를 읽지 않은 틱은 프로세스 수집기가 메모리 총량을 직접 읽음
+                procs = self._collect_procs(total_mem_gb=stats.mem_total_gb if stats else None)
+        return Sample(ts=time.time(), stats=stats, procs=procs)
+
+    async def run_once(self, tick: Optional[int] = None):
+        """tick: 스케줄러 격자 번호 (every 판정 기준, 생략 시 내부 카운터)"""
+        if tick is None:
+            tick = self._tick
+        self._tick = tick + 1
+        due = [s for s in self._subscribers if s.due(tick)]
+        if not due:
+            return
+        with_stats = any(s.needs_stats for s in due)
+        with_procs = any(s.needs_procs for s in due)
+        sample = await asyncio.get_event_loop().run_in_executor(None, self._collect, with_stats, with_procs)
+        for sub in due:
+            try:
+                await sub.callback(sample)
+            except Exception as e:
+                log.error(f"구독자 처리 오류: {e}", exc_info=True)
+
+    async def run(self):
+        # 절대 마감 시각 기준 실행 (수집 시간만큼 주기가 밀리지 않음, 초과 시 틱 건너뜀)
+        await self.ticker.run(self.run_once)
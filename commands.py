@@ -0,0 +1,224 @@
+"""
+commands.py — 기록 조회 슬래시 명령
+/history <지표> <구간>, /peak <지표> <구간> 은 시스템 모니터 봇이 로컬 시계열 저장소(tsdb)의
+1분 / 1시간 / 1일 롤업으로, /top-procs <구간> 은 프로세스 모니터 봇이 CPU 누적 상위 시간 슬롯
+(hitters.py)으로 응답합니다.
+
+- 구간 길이와 무관하게 읽는 레코드 수가 제한되므로 (TimeSeriesStore.series) 응답은 수 ms
+- 응답은 명령한 사람에게만 보이게 (상태 메시지 채널이 조회 결과로 밀리지 않도록)
+- 명령은 상태 메시지 채널의 서버(길드)에만 동기화 → 전역 동기화 지연 없이 바로 사용 가능
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import discord
+from discord import app_commands
+
+import config
+from render import make_bar, make_sparkline
+from tsdb import FIELDS, TimeSeriesStore
+
+log = logging.getLogger("commands")
+
+KST = timezone(timedelta(hours=9))
+
+SPARK_WIDTH = 48   # 스파크라인 칸 수 (구간을 같은 시간 폭으로 나눔)
+
+# 선택지 → (tsdb 필드 목록, 표시 이름, 단위)
+METRICS = {
+    "cpu":  (("cpu",), "CPU", "%"),
+    "mem":  (("mem",), "메모리", "%"),
+    "swap": (("swap",), "스왑", "%"),
+    "disk": (("disk",), "디스크 (/)", "%"),
+    "net":  (("net_recv", "net_sent"), "네트워크", "KB/s"),
+}
+FIELD_LABELS = {"net_recv": "수신 ↓", "net_sent": "송신 ↑"}
+RANGES = {
+    "1h":   3600,
+    "6h":   6 * 3600,
+    "24h":  24 * 3600,
+    "7d":   7 * 86400,
+    "30d":  30 * 86400,
+    "180d": 180 * 86400,
+}
+RESOLUTION_NAMES = {60: "1분", 3600: "1시간", 86400: "1일"}
+
+
+def _fmt_time(ts: float, resolution: int = 60) -> str:
+    fmt = "%m-%d" if resolution >= 86400 else "%m-%d %H:%M"
+    return datetime.fromtimestamp(ts, KST).strftime(fmt)
+
+
+def _fmt_value(value: float, unit: str) -> str:
+    return f"{value:.1f}%" if unit == "%" else f"{value:.1f} {unit}"
+
+
+def _columns(rows: list[tuple], field: str, start: float, end: float,
+             width: int = SPARK_WIDTH) -> tuple[list[float | None], list[float | None]]:
+    """롤업 레코드 → 칸별 (시간 가중 평균, 최댓값), 레코드가 없는 칸은 None"""
+    i = FIELDS.index(field)
+    sums, weights = [0.0] * width, [0.0] * width
+    peaks: list[float | None] = [None] * width
+    step = (end - start) / width
+    for row in rows:
+        col = min(width - 1, max(0, int((row[0] - start) / step)))
+        weight, mean, hi = row[1], row[2 + 3 * i], row[4 + 3 * i]
+        sums[col] += mean * weight
+        weights[col] += weight
+        if peaks[col] is None or hi > peaks[col]:
+            peaks[col] = hi
+    means = [s / w if w else None for s, w in zip(sums, weights)]
+    return means, peaks
+
+
+def _empty_embed(title: str) -> discord.Embed:
+    return discord.Embed(title=title, description="해당 구간의 기록이 없습니다.", color=config.COLOR_INFO)
+
+
+def history_embed(store: TimeSeriesStore, metric: str, range_name: str, now: float | None = None) -> discord.Embed:
+    """/history — 구간 평균 스파크라인 + 평균 / 최소 / 최대"""
+    now = time.time() if now is None else now
+    fields, label, unit = METRICS[metric]
+    start = now - RANGES[range_name]
+    title = f"📈 {label} — 최근 {range_name}"
+    resolution, rows = store.series(start, now)
+    if not rows:
+        return _empty_embed(title)
+
+    embed = discord.Embed(
+        title=title,
+        description=(
+            f"{_fmt_time(start)} ~ {_fmt_time(now)} KST · "
+            f"{RESOLUTION_NAMES.get(resolution, f'{resolution}초')} 롤업 {len(rows)}개"
+        ),
+        color=config.COLOR_INFO,
+        timestamp=datetime.now(timezone.utc),
+    )
+    for field in fields:
+        i = FIELDS.index(field)
+        means, _ = _columns(rows, field, start, now)
+        total = sum(r[1] for r in rows)
+        mean = sum(r[2 + 3 * i] * r[1] for r in rows) / total if total else 0.0
+        low = min(r[3 + 3 * i] for r in rows)
+        peak_row = max(rows, key=lambda r: r[4 + 3 * i])
+        spark = make_sparkline(means, 0, 100) if unit == "%" else make_sparkline(means, 0)
+        embed.add_field(
+            name=FIELD_LABELS.get(field, label),
+            value=(
+                f"`{spark}`\n"
+                f"평균 **{_fmt_value(mean, unit)}** · 최소 **{_fmt_value(low, unit)}** · "
+                f"최대 **{_fmt_value(peak_row[4 + 3 * i], unit)}** ({_fmt_time(peak_row[0], resolution)} 경)"
+            ),
+            inline=False,
+        )
+    return embed
+
+
+def peak_embed(store: TimeSeriesStore, metric: str, range_name: str, now: float | None = None) -> discord.Embed:
+    """/peak — 구간 최댓값과 발생 시각 (롤업에서 찾은 버킷을 raw 까지 좁혀 정확한 시각)"""
+    now = time.time() if now is None else now
+    fields, label, unit = METRICS[metric]
+    start = now - RANGES[range_name]
+    title = f"⛰️ {label} 최댓값 — 최근 {range_name}"
+    _, rows = store.series(start, now)
+    if not rows:
+        return _empty_embed(title)
+
+    embed = discord.Embed(title=title, color=config.COLOR_INFO, timestamp=datetime.now(timezone.utc))
+    for field in fields:
+        found = store.locate_peak(field, start, now)
+        if found is None:
+            continue
+        value, ts = found
+        _, peaks = _columns(rows, field, start, now)
+        spark = make_sparkline(peaks, 0, 100) if unit == "%" else make_sparkline(peaks, 0)
+        embed.add_field(
+            name=FIELD_LABELS.get(field, label),
+            value=(
+                f"최대 **{_fmt_value(value, unit)}** — "
+                f"{datetime.fromtimestamp(ts, KST).strftime('%Y-%m-%d %H:%M:%S')} KST\n"
+                f"`{spark}` (칸별 최댓값)"
+            ),
+            inline=False,
+        )
+    return embed
+
+
+def top_procs_embed(top: list[tuple[str, float]], covered: float, range_name: str) -> discord.Embed:
+    """/top-procs — 구간 CPU 누적 상위 (top: [(이름, CPU-초)], covered: 실제 포함 구간 초)"""
+    title = f"🔥 CPU 누적 상위 — 최근 {range_name}"
+    if not top:
+        return _empty_embed(title)
+    span = max(covered, 1.0)
+    peak = top[0][1]
+    lines = []
+    for i, (key, sec) in enumerate(top, 1):
+        bar = make_bar(sec / peak * 100 if peak > 0 else 0.0)
+        lines.append(
+            f"`{i}.` `{bar}` **{key[:32]}** — CPU {sec / 60:.1f}분 (평균 {sec / span * 100:.1f}%)"
+        )
+    return discord.Embed(
+        title=title,
+        description="\n".join(lines) + f"\n\n포함 구간: {span / 3600:.1f}시간 (1시간 단위 집계)",
+        color=config.COLOR_INFO,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+_METRIC_CHOICES = [app_commands.Choice(name=f"{label} ({name})", value=name)
+                   for name, (_, label, _) in METRICS.items()]
+_RANGE_CHOICES = [app_commands.Choice(name=name, value=name) for name in RANGES]
+
+
+def register_monitor_commands(tree: app_commands.CommandTree, store: TimeSeriesStore):
+    """/history, /peak (시스템 모니터 봇)"""
+
+    @tree.command(name="history", description="지표 기록 (평균 스파크라인, 최소 / 최대)")
+    @app_commands.describe(metric="지표", period="조회 구간")
+    @app_commands.choices(metric=_METRIC_CHOICES, period=_RANGE_CHOICES)
+    async def history(interaction: discord.Interaction, metric: str, period: str = "24h"):
+        await interaction.response.send_message(embed=history_embed(store, metric, period), ephemeral=True)
+
+    @tree.command(name="peak", description="구간 최댓값과 발생 시각")
+    @app_commands.describe(metric="지표", period="조회 구간")
+    @app_commands.choices(metric=_METRIC_CHOICES, period=_RANGE_CHOICES)
+    async def peak(interaction: discord.Interaction, metric: str, period: str = "7d"):
+        await interaction.response.send_message(embed=peak_embed(store, metric, period), ephemeral=True)
+
+
+def register_proc_commands(tree: app_commands.CommandTree,
+                           top: Callable[[float], tuple[list[tuple[str, float]], float]],
+                           ranges: dict[str, int]):
+    """/top-procs (프로세스 모니터 봇) — top(구간 초) → ([(이름, CPU-초)], 실제 포함 구간 초)"""
+    choices = [app_commands.Choice(name=name, value=name) for name in ranges]
+
+    @tree.command(name="top-procs", description="구간 CPU 누적 상위 프로세스")
+    @app_commands.describe(period="조회 구간")
+    @app_commands.choices(period=choices)
+    async def top_procs(interaction: discord.Interaction, period: str = next(iter(ranges))):
+        items, covered = top(ranges[period])
+        await interaction.response.send_message(embed=top_procs_embed(items, covered, period), ephemeral=True)
+
+
+_synced: set[tuple[int, int]] = set()   # (트리, 길드) — 재접속(on_ready 재호출) 시 다시 동기화하지 않음
+
+
+async def sync_commands(tree: app_commands.CommandTree, channel) -> bool:
+    """상태 메시지 채널의 길드에 명령 동기화 (봇 초대 시 applications.commands 권한 필요)"""
+    guild = getattr(channel, "guild", None)
+    if guild is None:
+        return False
+    if (id(tree), guild.id) in _synced:
+        return True
+    tree.copy_global_to(guild=guild)
+    try:
+        synced = await tree.sync(guild=guild)
+    except discord.HTTPException as e:
+        log.warning(f"슬래시 명령 동기화 실패 ({guild.id}): {e}")
+        return False
+    _synced.add((id(tree), guild.id))
+    log.info(f"슬래시 명령 동기화: {', '.join('/' + c.name for c in synced)} ({guild.name})")
+    return True
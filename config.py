@@ -1,4 +1,5 @@
 import os
+import socket
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,25 +7,129 @@ load_dotenv()
 # Discord 설정
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN", "")
 MONITOR_CHANNEL_ID = int(os.getenv("MONITOR_CHANNEL_ID", "0"))
+# 웹훅 전용 실행(webhook.py) 시 사용할 웹훅 URL (채널 설정 → 연동 → 웹후크)
+MONITOR_WEBHOOK_URL = os.getenv("MONITOR_WEBHOOK_URL", "")
 
 # 모니터링 설정
 MONITOR_INTERVAL_SECONDS = 10  # 10초마다 보고
+STATUS_HEARTBEAT_SECONDS = 60  # 표시 내용이 그대로여도 이 주기마다 상태 메시지 갱신
+# 적응형 수집 주기 (ADAPTIVE_INTERVAL=1 로 활성화)
+#   모든 지표가 임계값(경고 / 알림)에서 멀면 느리게, 가까워지거나 빠르게 변하면 빠르게 수집
+#   이동 통계는 샘플마다 수집 간격을 가중치로 두므로 주기가 바뀌어도 평균 / p95 가 왜곡되지 않음
+ADAPTIVE_INTERVAL = os.getenv("ADAPTIVE_INTERVAL", "0") == "1"
+ADAPTIVE_INTERVALS = (5, MONITOR_INTERVAL_SECONDS, 60)   # (임계값 근처, 보통, 여유) 초
+ADAPTIVE_HEADROOM = (0.15, 0.40)   # 임계값까지 남은 비율 — 근처 미만 / 여유 이상 경계
+# 사용할 수집 주기 목록과 격자 주기 (가장 짧은 주기, 실제 수집은 그 배수마다)
+MONITOR_INTERVALS = ADAPTIVE_INTERVALS if ADAPTIVE_INTERVAL else (MONITOR_INTERVAL_SECONDS,)
+COLLECT_GRID_SECONDS = min(MONITOR_INTERVALS)
+# 버스트 샘플 주기 (ms) — 보고 틱 사이 CPU / 네트워크 최댓값·p95 유지 (0 이면 비활성화)
+BURST_SAMPLE_MS = int(os.getenv("BURST_SAMPLE_MS", "200"))
+
+# 이동 통계 구간 (이름: 초) — 평균/최소/최대/p95 를 구간별로 동시에 유지
+ROLLING_WINDOWS = {
+    "1m":  60,
+    "10m": 10 * 60,
+    "1h":  60 * 60,
+    "24h": 24 * 60 * 60,
+}
 
 # 홈서버 정보 (표시용)
 INSTANCE_NAME = os.getenv("INSTANCE_NAME", "ASUS PN40 홈서버")
 INSTANCE_SHAPE = "Intel J4125 (4코어)"
 TOTAL_CPU = 4      # 코어
 TOTAL_RAM_GB = 4   # GB (추후 8GB 확장 예정)
+NET_LINK_MBPS = int(os.getenv("NET_LINK_MBPS", "1000"))  # 네트워크 사용률(%) 계산 기준 대역폭
+
+# 로컬 상태 저장 디렉터리 (스케치 체크포인트 등)
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# 자체 상태 지표 (Prometheus /metrics, 0 이면 비활성화)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
 
 # 임계값 (이 이상이면 경고 색상)
 CPU_WARN_THRESHOLD = 80     # %
 MEM_WARN_THRESHOLD = 80     # %
 DISK_WARN_THRESHOLD = 85    # %
+DISK_BUSY_WARN_THRESHOLD = 80   # % (블록 장치 I/O 사용률)
+STEAL_WARN_THRESHOLD = 5        # % (하이퍼바이저가 가져간 CPU 시간 — 공유 호스트 경합)
+PSI_WARN_THRESHOLD = 10         # % (자원 대기로 멈춘 시간 비율, PSI some)
+LOAD_WARN_PER_CORE = 1.0        # 1분 부하 평균 ÷ 코어 수
 
 # 알림 임계값 (이 이상이면 @here 알림 전송)
 CPU_ALERT_THRESHOLD  = 90       # %
+MEM_ALERT_THRESHOLD  = 90       # %
 DISK_ALERT_THRESHOLD = 50       # %
 NET_ALERT_THRESHOLD_KB = 10 * 1024  # KB/s (10 MB/s)
+STEAL_ALERT_THRESHOLD = 20      # % (Oracle A1 등 공유 호스트에서 CPU 를 빼앗기는 비율)
+PSI_MEMORY_ALERT_THRESHOLD = 10 # % (PSI memory full — 모든 태스크가 메모리 회수를 기다린 시간)
+PSI_IO_ALERT_THRESHOLD = 30     # % (PSI io full)
+
+# 알림 규칙 (alerts.py 에서 시작 시 컴파일, 매 틱 한 번에 평가)
+#   kind: value(현재 값) / avg(이동 통계 구간 평균, window=구간 이름) / rate(window 초 동안의 분당 변화량)
+#   above / below: 발생 임계값, clear: 해제 임계값 (히스테리시스)
+#   n, m: 최근 m 번 중 n 번 조건 충족 시 발생 / 해제 (디바운스)
+ALERT_RULES = [
+    {"name": "cpu", "label": "CPU", "above": CPU_ALERT_THRESHOLD, "clear": CPU_ALERT_THRESHOLD - 10,
+     "n": 2, "m": 3},
+    {"name": "mem", "label": "메모리", "above": MEM_ALERT_THRESHOLD, "clear": MEM_ALERT_THRESHOLD - 5,
+     "n": 2, "m": 3},
+    {"name": "disk", "label": "디스크", "above": DISK_ALERT_THRESHOLD, "clear": DISK_ALERT_THRESHOLD - 2},
+    # 네트워크는 보고 구간 평균 대신 버스트 최댓값 기준 (10초 평균에 희석되는 짧은 폭주 감지)
+    {"name": "net_recv", "label": "네트워크 수신 ↓ (최대)", "metric": "net_recv_peak", "above": NET_ALERT_THRESHOLD_KB,
+     "clear": NET_ALERT_THRESHOLD_KB * 0.8, "unit": "MB/s", "scale": 1 / 1024},
+    {"name": "net_sent", "label": "네트워크 송신 ↑ (최대)", "metric": "net_sent_peak", "above": NET_ALERT_THRESHOLD_KB,
+     "clear": NET_ALERT_THRESHOLD_KB * 0.8, "unit": "MB/s", "scale": 1 / 1024},
+    # 경합 — 사용률이 낮아도 작업이 대기 중인 상황 (PSI 미지원 커널에서는 평가 생략)
+    {"name": "steal", "label": "CPU 스틸", "metric": "cpu_steal", "above": STEAL_ALERT_THRESHOLD,
+     "clear": STEAL_ALERT_THRESHOLD / 2, "n": 3, "m": 3},
+    {"name": "psi_memory", "label": "메모리 압박 (PSI full)", "metric": "psi_memory_full",
+     "above": PSI_MEMORY_ALERT_THRESHOLD, "clear": PSI_MEMORY_ALERT_THRESHOLD / 2, "n": 2, "m": 3},
+    {"name": "psi_io", "label": "I/O 압박 (PSI full)", "metric": "psi_io_full",
+     "above": PSI_IO_ALERT_THRESHOLD, "clear": PSI_IO_ALERT_THRESHOLD / 2, "n": 2, "m": 3},
+    {"name": "cpu_10m", "label": "CPU 10분 평균", "metric": "cpu", "kind": "avg", "window": "10m",
+     "above": 75, "clear": 65},
+    {"name": "disk_growth", "label": "디스크 증가 속도", "metric": "disk", "kind": "rate", "window": 600,
+     "above": 1.0, "clear": 0.2, "unit": "%p/분"},
+]
+
+# 로컬 시계열 저장소 보존 기간 (초) — raw 는 가장 긴 이동 통계 구간(24시간) 이상이어야 함
+TSDB_RETENTION = {
+    "raw": 2 * 24 * 3600,
+    "1m":  14 * 24 * 3600,
+    "1h":  180 * 24 * 3600,
+    "1d":  3 * 365 * 24 * 3600,
+}
+TSDB_MAINTAIN_SECONDS = 60   # 롤업 생성 / 보존 정리 주기
+
+# Oracle idle 회수 판정 (7일 p95 가 모두 이 값 미만이면 회수 대상)
+RECLAIM_THRESHOLD_PERCENT = 20
+RECLAIM_CHECKPOINT_SECONDS = 5 * 60   # 7일 p95 스케치 디스크 저장 주기
+# 회수 방지 부하 유지 (LOAD_SHAPER=1 로 활성화) — 코어당 워커 하나가 duty cycle 로 최소한의 합성 부하를 더함
+#   7일 p95 가 유지선 미만이면 계속, 그 밖에는 p95 조건에 필요한 시간 비율만큼만 가동 (실제 작업이 우선)
+LOAD_SHAPER = os.getenv("LOAD_SHAPER", "0") == "1"
+LOAD_SHAPER_FLOOR = RECLAIM_THRESHOLD_PERCENT + 2   # 가동 중 유지할 전체 CPU (%)
+LOAD_SHAPER_SHARE = 0.10      # 유지선 이상이어야 할 시간 비율 (p95 조건 5% 의 2배)
+LOAD_SHAPER_CYCLE = 3600      # 가동 구간 배치 주기 (초) — 매 주기 앞부분에 몰아서 가동
+LOAD_SHAPER_PERIOD_MS = 100   # duty cycle 주기 (ms)
+
+# 여러 서버 통합 모니터링 (fleet.py) — 각 서버의 에이전트가 수집 서버 하나로 TCP 전송
+FLEET_TOKEN = os.getenv("FLEET_TOKEN", "")             # 에이전트 인증 공유 비밀 (양쪽 같은 값, 필수)
+FLEET_SERVER = os.getenv("FLEET_SERVER", "")           # 에이전트 → 수집 서버 주소 (host:port)
+FLEET_NAME = os.getenv("FLEET_NAME") or socket.gethostname()   # 에이전트 서버 표시 이름
+FLEET_BIND = os.getenv("FLEET_BIND", "0.0.0.0")        # 수집 서버 수신 주소
+FLEET_PORT = int(os.getenv("FLEET_PORT", "7390"))
+FLEET_CHANNEL_ID = int(os.getenv("FLEET_CHANNEL_ID") or MONITOR_CHANNEL_ID)
+FLEET_WEBHOOK_URL = os.getenv("FLEET_WEBHOOK_URL", "")  # 설정하면 게이트웨이 없이 웹훅으로 전송
+FLEET_AGENT_INTERVAL = MONITOR_INTERVAL_SECONDS   # 에이전트 수집 주기 (초)
+FLEET_AGENT_QUEUE = 360        # 전송 대기 샘플 최대 수 — 수집 서버가 끊기면 최근 것만 남기고 버림
+FLEET_AGENT_BATCH_SECONDS = 0  # 0 보다 크면 이만큼 모아서 한 번에 전송 (서버 수가 많을 때 패킷 수 감소)
+FLEET_AGENT_STABLE_SECONDS = 30   # 이보다 짧게 유지된 연결은 실패로 보고 재접속 간격을 계속 늘림 (인증 실패 등)
+FLEET_RENDER_SECONDS = 10      # 서버 현황 embed 갱신 주기 (샘플 수와 무관)
+FLEET_STALE_SECONDS = 60       # 이 시간 동안 샘플이 없으면 응답 없음 알림
+FLEET_MIN_PUSH_SECONDS = 5     # 서버별 이동 통계에 넣는 최소 샘플 간격 (링 버퍼 크기 상한)
+FLEET_WINDOWS = {"10m": 10 * 60, "1h": 60 * 60}   # 서버별 이동 통계 구간 (알림 규칙의 avg 구간 포함)
+FLEET_ALERT_RULES = ALERT_RULES                    # 서버별 알림 규칙 (단일 서버와 같은 규칙, 전송하지 않는 지표의 규칙은 제외)
 
 # 임베드 색상
 COLOR_NORMAL = 0x2ECC71   # 초록
@@ -6,14 +6,26 @@ CPU / 메모리 사용량 상위 프로세스를 주기적으로 Discord에 보
 """
 
 import asyncio
+import heapq
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 
 import discord
 import psutil
 from dotenv import load_dotenv
 
+import metrics
+from commands import register_proc_commands, sync_commands
+from outbound import ChannelTransport, Outbox, RateLimitTracker
+from cgroups import CgroupTable, rollup_processes
+from hitters import RollingHeavyHitters, RssSlopeTracker
+from proctable import ProcessTable
+from scheduler import Ticker
+from state import StateFile, state_path
+
 load_dotenv()
 
 logging.basicConfig(
@@ -28,10 +40,26 @@ KST = timezone(timedelta(hours=9))
 # ── 환경변수 ──────────────────────────────────────────────
 CPU_BOT_TOKEN  = os.getenv("CPU_BOT_TOKEN", "")
 CPU_CHANNEL_ID = int(os.getenv("CPU_CHANNEL_ID", "0"))
+# 웹훅 전용 실행(webhook.py) 시 사용할 웹훅 URL (채널 설정 → 연동 → 웹후크)
+CPU_WEBHOOK_URL = os.getenv("CPU_WEBHOOK_URL", "")
 
 # 보고 주기 (초)
 REPORT_INTERVAL = 10  # 10초마다
 TOP_N = 5             # 상위 몇 개 프로세스
+# 집계 단위: "pid" = 개별 프로세스, "unit" = systemd 유닛 / cgroup v2 (서비스별 합산)
+PROC_GROUP_MODE = os.getenv("PROC_GROUP_MODE", "pid")
+STATUS_HEARTBEAT = 60 # 표시 내용이 그대로여도 이 주기(초)마다 상태 메시지 갱신
+# 자체 상태 지표 포트 (단독 실행 시, 0 이면 비활성화 — bot.py 의 METRICS_PORT 와 겹치지 않게)
+CPU_METRICS_PORT = int(os.getenv("CPU_METRICS_PORT", "0"))
+# 장기 추적: 최근 몇 시간의 CPU 누적 상위 / RSS 증가 속도 (고정 메모리)
+HISTORY_HOURS = int(os.getenv("PROC_HISTORY_HOURS", "6"))
+HISTORY_CAPACITY = 64         # 1시간 슬롯당 추적할 프로세스(이름) 수
+RSS_TRACK_CAPACITY = 128      # RSS 기울기를 추적할 프로세스 수
+RSS_GROWTH_MIN_MB_H = 1.0     # 이보다 느리게 느는 프로세스는 표시하지 않음
+HISTORY_SAVE_SECONDS = 600    # CPU 누적 요약 저장 주기
+# /top-procs 로 조회할 수 있는 구간 (보관은 이 중 가장 긴 구간과 HISTORY_HOURS 중 긴 쪽)
+TOP_PROCS_RANGES = {"1h": 3600, "6h": 6 * 3600, "24h": 24 * 3600}
+HISTORY_KEEP_SECONDS = max(HISTORY_HOURS * 3600, *TOP_PROCS_RANGES.values())
 
 # ── 임베드 색상 ───────────────────────────────────────────
 COLOR_NORMAL = 0x3498DB   # 파랑
@@ -42,8 +70,137 @@ COLOR_WARN   = 0xE67E22   # 주황 — CPU 1위 프로세스가 50% 이상
 # 프로세스 정보 수집 (블로킹)
 # ══════════════════════════════════════════════════════════
 
-def collect_top_processes() -> dict:
-    """CPU / 메모리 상위 프로세스 수집"""
+# 리눅스에서는 증분 프로세스 테이블 사용, 그 외에는 psutil
+try:
+    _proc_table: ProcessTable | None = ProcessTable(cgroups=PROC_GROUP_MODE == "unit")
+except OSError:
+    _proc_table = None
+
+# 유닛 모드 + cgroup v2 → 유닛 cgroup 파일을 직접 읽음 (프로세스 스캔 생략)
+_cgroup_table: CgroupTable | None = (
+    CgroupTable() if PROC_GROUP_MODE == "unit" and CgroupTable.available() else None
+)
+
+
+# 장기 추적 상태 (모드와 무관하게 하나 — 키는 "이름 (사용자)" 또는 유닛 이름)
+_cpu_history = RollingHeavyHitters(HISTORY_KEEP_SECONDS, 3600, HISTORY_CAPACITY)
+_rss_growth = RssSlopeTracker(RSS_TRACK_CAPACITY)
+_last_track: float | None = None
+# 수집 스레드의 누적과 이벤트 루프의 조회(/top-procs, 상태 저장)가 겹치지 않도록
+_history_lock = threading.Lock()
+
+
+def use_proc_root(root: str):
+    """수집 대상 /proc 경로 변경 (벤치마크의 가짜 /proc 트리 등)"""
+    global _proc_table, _cpu_history, _rss_growth, _last_track
+    _proc_table = ProcessTable(root, cgroups=PROC_GROUP_MODE == "unit")
+    _cpu_history = RollingHeavyHitters(HISTORY_KEEP_SECONDS, 3600, HISTORY_CAPACITY)
+    _rss_growth = RssSlopeTracker(RSS_TRACK_CAPACITY)
+    _last_track = None
+
+
+def _track(cpu_items, rss_items, rss_label=str) -> dict:
+    """한 스캔 결과를 장기 추적에 반영하고 표시용 요약 반환
+
+    cpu_items: [(키, CPU 사용률 %)] — 직전 스캔 이후 평균이므로 경과 시간을 곱해 CPU-초로 누적
+    rss_items: [(키, RSS 바이트)], rss_label: 키 → 표시 이름
+    """
+    global _last_track
+    now = time.time()
+    mono = time.monotonic()
+    elapsed = mono - _last_track if _last_track is not None else 0.0
+    _last_track = mono
+    span = HISTORY_HOURS * 3600
+    with _history_lock:
+        if elapsed > 0:
+            _cpu_history.add_many(((key, pct * elapsed / 100) for key, pct in cpu_items), now)
+        top = _cpu_history.top(TOP_N, now, span)
+    _rss_growth.update(rss_items, now, rss_label)
+    return {
+        "history": {
+            "seconds":  _cpu_history.coverage(now, span),
+            "top":      [(h.key, h.cpu_seconds) for h in top],
+        },
+        "rss_growth": [
+            (g.label, g.mb_per_hour, g.rss_mb)
+            for g in _rss_growth.top(TOP_N, now) if g.mb_per_hour >= RSS_GROWTH_MIN_MB_H
+        ],
+    }
+
+
+def history_top(span: float, n: int = 10) -> tuple[list[tuple[str, float]], float]:
+    """/top-procs — 최근 span 초 CPU 누적 상위 [(키, CPU-초)] 와 실제 포함 구간 (초)"""
+    now = time.time()
+    with _history_lock:
+        top = _cpu_history.top(n, now, span)
+        covered = _cpu_history.coverage(now, span)
+    return [(h.key, h.cpu_seconds) for h in top], covered
+
+
+def collect_top_processes(total_mem_gb: float | None = None) -> dict:
+    """CPU / 메모리 상위 프로세스 수집
+
+    total_mem_gb 를 넘기면 (공유 수집기에서 이미 읽은 값) 메모리 총량을 다시 읽지 않는다.
+    """
+    if PROC_GROUP_MODE == "unit" and (_cgroup_table is not None or _proc_table is not None):
+        return _collect_top_units(total_mem_gb)
+    if _proc_table is None:
+        return _collect_top_processes_psutil(total_mem_gb)
+
+    procs = _proc_table.scan()
+    top_cpu = heapq.nlargest(TOP_N, procs, key=lambda e: e.cpu_percent)
+    top_mem = heapq.nlargest(TOP_N, procs, key=lambda e: e.rss)
+    if total_mem_gb is None:
+        total_mem_gb = _proc_table.mem_total / (1024 ** 3)
+
+    # CPU 누적은 이름+사용자 단위 (짧게 여러 번 뜨는 작업도 합산), RSS 는 프로세스 인스턴스 단위
+    # 항목 객체는 (pid, 시작 시각) 이 같은 동안 유지되므로 그대로 RSS 추적 키로 사용
+    tracked = _track(
+        ((f"{e.name} ({e.username})", e.cpu_percent) for e in procs if e.cpu_percent > 0),
+        ((e, e.rss) for e in procs),
+        lambda e: f"{e.name} PID {e.pid}",
+    )
+    return {
+        "top_cpu":      [e.as_dict() for e in top_cpu],
+        "top_mem":      [e.as_dict() for e in top_mem],
+        "total_mem_gb": total_mem_gb,
+        **tracked,
+    }
+
+
+def _collect_top_units(total_mem_gb: float | None = None) -> dict:
+    """systemd 유닛 / cgroup 단위 상위 집계"""
+    if _cgroup_table is not None:
+        units = _cgroup_table.scan()
+    else:
+        units = rollup_processes(_proc_table.scan())
+    if total_mem_gb is None:
+        total_mem_gb = _proc_table.mem_total / (1024 ** 3) if _proc_table else psutil.virtual_memory().total / (1024 ** 3)
+    total_bytes = total_mem_gb * (1024 ** 3)
+
+    def as_dict(u) -> dict:
+        return {
+            "name":           u.name,
+            "cpu_percent":    u.cpu_percent,
+            "memory_percent": u.mem_bytes / total_bytes * 100 if total_bytes else 0.0,
+            "procs":          u.procs,
+        }
+
+    tracked = _track(
+        ((u.name, u.cpu_percent) for u in units if u.cpu_percent > 0),
+        ((u.name, u.mem_bytes) for u in units),
+    )
+    return {
+        "mode":         "unit",
+        "top_cpu":      [as_dict(u) for u in heapq.nlargest(TOP_N, units, key=lambda u: u.cpu_percent)],
+        "top_mem":      [as_dict(u) for u in heapq.nlargest(TOP_N, units, key=lambda u: u.mem_bytes)],
+        "total_mem_gb": total_mem_gb,
+        **tracked,
+    }
+
+
+def _collect_top_processes_psutil(total_mem_gb: float | None = None) -> dict:
+    """psutil 기반 수집 (리눅스 /proc 을 쓸 수 없는 환경용)"""
     procs = []
     for p in psutil.process_iter(["pid", "name", "cpu_percent", "memory_percent", "username"]):
         try:
@@ -54,15 +211,23 @@ def collect_top_processes() -> dict:
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
 
-    top_cpu = sorted(procs, key=lambda x: x["cpu_percent"],    reverse=True)[:TOP_N]
-    top_mem = sorted(procs, key=lambda x: x["memory_percent"], reverse=True)[:TOP_N]
+    top_cpu = heapq.nlargest(TOP_N, procs, key=lambda x: x["cpu_percent"])
+    top_mem = heapq.nlargest(TOP_N, procs, key=lambda x: x["memory_percent"])
 
-    total_mem_gb = psutil.virtual_memory().total / (1024 ** 3)
+    if total_mem_gb is None:
+        total_mem_gb = psutil.virtual_memory().total / (1024 ** 3)
 
+    mem_bytes = total_mem_gb * (1024 ** 3)
+    tracked = _track(
+        ((f"{p['name']} ({p['username']})", p["cpu_percent"]) for p in procs if p["cpu_percent"] > 0),
+        (((p["pid"], p["name"]), p["memory_percent"] / 100 * mem_bytes) for p in procs),
+        lambda key: f"{key[1]} PID {key[0]}",
+    )
     return {
         "top_cpu":      top_cpu,
         "top_mem":      top_mem,
         "total_mem_gb": total_mem_gb,
+        **tracked,
     }
 
 
@@ -80,6 +245,9 @@ def build_embed(data: dict) -> discord.Embed:
     # 1위 프로세스 CPU가 50% 이상이면 주황
     color = COLOR_WARN if top_cpu and top_cpu[0]["cpu_percent"] >= 50 else COLOR_NORMAL
 
+    if data.get("mode") == "unit":
+        return _build_unit_embed(data, color, now_kst)
+
     embed = discord.Embed(
         title="📊 상위 프로세스 모니터",
         color=color,
@@ -115,22 +283,155 @@ def build_embed(data: dict) -> discord.Embed:
         inline=False,
     )
 
+    _add_history_fields(embed, data)
+    embed.set_footer(text=now_kst)
+    return embed
+
+
+def _build_unit_embed(data: dict, color: int, now_kst: str) -> discord.Embed:
+    """유닛(cgroup) 단위 순위 Embed"""
+    total_mem_gb = data["total_mem_gb"]
+    embed = discord.Embed(
+        title="📊 상위 서비스(유닛) 모니터",
+        color=color,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+    def suffix(u: dict) -> str:
+        return f"  ({u['procs']}개 프로세스)" if u["procs"] else ""
+
+    cpu_lines = [
+        f"`{i}.` **{u['name'][:32]}** — **{u['cpu_percent']:.1f}%**{suffix(u)}"
+        for i, u in enumerate(data["top_cpu"], 1)
+    ]
+    embed.add_field(
+        name=f"CPU 상위 {TOP_N} 유닛",
+        value="\n".join(cpu_lines) if cpu_lines else "정보 없음",
+        inline=False,
+    )
+
+    mem_lines = []
+    for i, u in enumerate(data["top_mem"], 1):
+        used_mb = u["memory_percent"] / 100 * total_mem_gb * 1024
+        mem_lines.append(
+            f"`{i}.` **{u['name'][:32]}** — **{u['memory_percent']:.1f}%** ({used_mb:.0f} MB){suffix(u)}"
+        )
+    embed.add_field(
+        name=f"메모리 상위 {TOP_N} 유닛",
+        value="\n".join(mem_lines) if mem_lines else "정보 없음",
+        inline=False,
+    )
+
+    _add_history_fields(embed, data)
     embed.set_footer(text=now_kst)
     return embed
 
 
+def _fmt_duration(sec: float) -> str:
+    if sec >= 3600:
+        return f"{sec / 3600:.1f}시간"
+    if sec >= 60:
+        return f"{sec / 60:.1f}분"
+    return f"{sec:.0f}초"
+
+
+def _add_history_fields(embed: discord.Embed, data: dict):
+    """장기 추적 필드 — 최근 N시간 CPU 누적 상위 / RSS 증가 속도 상위 (데이터가 없으면 생략)"""
+    history = data.get("history")
+    if history and history["top"]:
+        span = max(history["seconds"], 1.0)
+        lines = [
+            f"`{i}.` **{key[:32]}** — **{_fmt_duration(sec)}** (평균 {sec / span * 100:.1f}%)"
+            for i, (key, sec) in enumerate(history["top"], 1)
+        ]
+        covered = f" · 수집 {_fmt_duration(span)}" if span < HISTORY_HOURS * 3600 else ""
+        embed.add_field(
+            name=f"최근 {HISTORY_HOURS}시간 CPU 누적 상위{covered}",
+            value="\n".join(lines),
+            inline=False,
+        )
+    growth = data.get("rss_growth")
+    if growth:
+        lines = [
+            f"`{i}.` **{label[:32]}** — **+{slope:.1f} MB/h** (현재 {rss:.0f} MB)"
+            for i, (label, slope, rss) in enumerate(growth, 1)
+        ]
+        embed.add_field(name="RSS 증가 속도 상위", value="\n".join(lines), inline=False)
+
+
 # ══════════════════════════════════════════════════════════
 # Discord 봇
 # ══════════════════════════════════════════════════════════
 
 class ProcMonitorBot(discord.Client):
-    def __init__(self):
+    def __init__(self, standalone: bool = True, transport=None):
         intents = discord.Intents.default()
-        super().__init__(intents=intents)
-        self._status_message: discord.Message | None = None
+        # standalone=False 이면 자체 보고 루프 없이 공유 수집기(host.py)가 publish 를 호출
+        self._standalone = standalone
+        limiter = getattr(transport, "limiter", None) or RateLimitTracker()
+        super().__init__(intents=intents, http_trace=limiter.trace_config())
+        self._state = StateFile(state_path("proc"))
+        # 재시작 전 CPU 누적 요약 이어받기 (RSS 기울기는 PID 단위라 새로 시작)
+        _cpu_history.load_dict(self._state.get("cpu_history") or {})
+        self._last_history_save = time.monotonic()
+        # 슬래시 명령 (/top-procs) — 게이트웨이 접속 시에만, 웹훅 전용 실행에서는 사용 불가
+        self.tree = discord.app_commands.CommandTree(self)
+        register_proc_commands(self.tree, history_top, TOP_PROCS_RANGES)
+        # 발신 스케줄러 (상태 메시지 edit 은 최신 것만 전송)
+        self._outbox = Outbox(
+            transport or ChannelTransport(self, CPU_CHANNEL_ID), limiter, "proc",
+            heartbeat=STATUS_HEARTBEAT, state=self._state,
+        )
+        # 저장된 상태 메시지 ID 가 있으면 채널 히스토리 조회 없이 바로 edit
+        self._outbox.restore_message()
+        # 절대 마감 시각 기반 보고 주기 (bot.py 와 같은 monotonic 격자)
+        self._ticker = Ticker(REPORT_INTERVAL, "proc")
+        self._report_task: asyncio.Task | None = None
+
+    def start_detached(self):
+        """게이트웨이 접속 없이 발신 작업자만 시작 (webhook.py 가 publish 를 호출)"""
+        self._outbox.start()
 
     async def setup_hook(self):
-        self.loop.create_task(self._report_loop())
+        self._outbox.start()
+        if self._standalone and CPU_METRICS_PORT:
+            await metrics.start(CPU_METRICS_PORT)
+        if self._standalone:
+            self._report_task = self.loop.create_task(self._report_loop())
+
+    async def close(self):
+        if self._report_task is not None:
+            self._report_task.cancel()
+        self._snapshot_history()
+        self._save_state()
+        await self._outbox.close()
+        if self._standalone:
+            await metrics.stop()
+        await super().close()
+
+    def _snapshot_history(self):
+        """CPU 누적 요약을 상태에 반영 (수집 스레드가 쉬는 이벤트 루프에서 호출)"""
+        self._last_history_save = time.monotonic()
+        with _history_lock:
+            snapshot = _cpu_history.to_dict()
+        self._state.update(cpu_history=snapshot)
+
+    def _save_state(self):
+        try:
+            self._state.save()
+        except OSError as e:
+            log.warning(f"상태 파일 저장 실패: {e}")
+
+    async def _save_state_async(self):
+        """직렬화는 이벤트 루프에서 (Outbox 가 같은 상태를 바꿀 수 있음), 파일 쓰기만 executor 에서"""
+        data = self._state.dump()
+        if data is None:
+            return
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self._state.write, data)
+        except OSError as e:
+            self._state.mark_dirty()
+            log.warning(f"상태 파일 저장 실패: {e}")
 
     async def on_ready(self):
         log.info(f"프로세스 모니터 봇 로그인 완료: {self.user} (ID: {self.user.id})")
@@ -141,17 +442,19 @@ class ProcMonitorBot(discord.Client):
                 name="프로세스 모니터링"
             )
         )
-        await self._recover_status_message()
+        if self._outbox.message is None:
+            await self._recover_status_message()
+        await sync_commands(self.tree, self.get_channel(CPU_CHANNEL_ID))
 
     async def _recover_status_message(self):
-        """채널 최근 메시지에서 봇이 보낸 embed 메시지를 찾아 _status_message로 복구"""
+        """채널 최근 메시지에서 봇이 보낸 embed 메시지를 찾아 상태 메시지로 복구"""
         channel = self.get_channel(CPU_CHANNEL_ID)
         if channel is None:
             return
         try:
             async for msg in channel.history(limit=20):
                 if msg.author.id == self.user.id and msg.embeds:
-                    self._status_message = msg
+                    self._outbox.adopt(msg)
                     log.info(f"이전 상태 메시지 복구: {msg.id}")
                     return
         except Exception as e:
@@ -159,30 +462,36 @@ class ProcMonitorBot(discord.Client):
 
     async def _report_loop(self):
         await self.wait_until_ready()
-        await asyncio.sleep(5)
+        # 상태 메시지 복구(on_ready) 시간을 두고 첫 격자 틱부터 시작
+        await self._ticker.run(self._send_report, start_after=5)
+
+    async def _send_report(self, tick: int = 0):
+        try:
+            loop = asyncio.get_event_loop()
+            with metrics.timed("proc", "collect"):
+                data = await loop.run_in_executor(None, collect_top_processes)
+        except Exception as e:
+            log.error(f"수집 오류: {e}", exc_info=True)
+            return
+        await self.publish(data)
 
-        while not self.is_closed():
-            await self._send_report()
-            await asyncio.sleep(REPORT_INTERVAL)
+    async def on_sample(self, sample):
+        """공유 수집기(collector.Collector) 구독 콜백"""
+        await self.publish(sample.procs)
 
-    async def _send_report(self):
-        channel = self.get_channel(CPU_CHANNEL_ID)
-        if channel is None:
+    async def publish(self, data: dict):
+        if not self._outbox.ready:
             log.warning(f"채널을 찾을 수 없습니다: {CPU_CHANNEL_ID}")
             return
 
         try:
-            loop = asyncio.get_event_loop()
-            data  = await loop.run_in_executor(None, collect_top_processes)
-            embed = build_embed(data)
-
-            if self._status_message is None:
-                self._status_message = await channel.send(embed=embed)
-            else:
-                try:
-                    await self._status_message.edit(embed=embed)
-                except discord.NotFound:
-                    self._status_message = await channel.send(embed=embed)
+            with metrics.timed("proc", "render"):
+                embed = build_embed(data)
+                self._outbox.set_status(embed)
+
+            if time.monotonic() - self._last_history_save >= HISTORY_SAVE_SECONDS:
+                self._snapshot_history()
+                await self._save_state_async()
 
             top1 = data["top_cpu"][0] if data["top_cpu"] else {}
             log.info(
@@ -0,0 +1,818 @@
+"""
+fleet.py — 여러 서버 통합 모니터링 (에이전트 / 수집 서버)
+서버마다 봇 토큰 / 게이트웨이 연결 / 상태 메시지를 두는 대신, 각 서버의 에이전트가
+get_system_stats 결과를 압축 바이너리 차분으로 TCP 전송하고, 수집 서버 하나가 서버별
+이동 통계 / 알림 규칙을 유지하며 서버 현황 embed 하나와 서버별 알림을 보냅니다.
+
+- 프레임: <종류 B><본문 길이 H> + 본문 — 연결마다 HELLO(인증 토큰, 이름, 코어 수) 후 BATCH 반복
+- 샘플: 직전 샘플 이후 시간(ms) + 바뀐 필드 비트마스크 + 바뀐 필드 값만 (정수 양자화)
+  → 보통 틱당 20~30 바이트, 연결마다 첫 샘플만 전체 필드
+- 에이전트: 수집 루프는 전송 큐(최근 FLEET_AGENT_QUEUE 개, 넘치면 오래된 것부터 버림)에 넣기만 하고,
+  전송 작업자가 쓰기 버퍼가 빌 때마다 쌓인 샘플을 한 프레임으로 묶어 보냄
+  → 수집 서버가 느리거나 끊겨도 수집은 멈추지 않고, 재접속하면 남은 샘플부터 이어서 전송
+- 수집 서버: 연결당 코루틴 하나가 프레임 단위로 읽어 한 번에 반영 (읽지 않으면 TCP 흐름 제어로 송신 측이 대기)
+  embed 는 샘플 수와 무관하게 렌더 주기마다 한 번, 알림 규칙은 프레임의 마지막 샘플로 평가
+- UDP 대신 TCP — 차분은 순서가 보장되고 유실이 없어야 기준값이 어긋나지 않음
+
+실행:
+    python fleet.py agent        # 각 서버 (FLEET_SERVER, FLEET_TOKEN, FLEET_NAME)
+    python fleet.py aggregator   # 수집 서버 + Discord (DISCORD_BOT_TOKEN + FLEET_CHANNEL_ID 또는 FLEET_WEBHOOK_URL)
+"""
+
+import argparse
+import asyncio
+import hmac
+import logging
+import struct
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import aiohttp
+import discord
+
+import config
+import metrics
+import system_info
+from alerts import METRICS as ALERT_METRICS, AlertEngine, Firing, compile_rules
+from outbound import ChannelTransport, Outbox, RateLimitTracker, WebhookTransport
+from rolling import RollingWindows
+from scheduler import Ticker
+from state import StateFile, state_path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+log = logging.getLogger("fleet")
+
+KST = timezone(timedelta(hours=9))
+
+
+# ══════════════════════════════════════════════════════════
+# 전송 형식
+# ══════════════════════════════════════════════════════════
+
+PROTOCOL_VERSION = 1
+FRAME = struct.Struct("<BH")          # 종류, 본문 길이
+FRAME_HELLO = 1
+FRAME_BATCH = 2
+MAX_BODY = 0xFFFF
+HELLO = struct.Struct("<BdHff")       # 버전, 기준 시각, 코어 수, 메모리 총량 GB, 디스크 총량 GB
+SAMPLE = struct.Struct("<IH")         # 직전 샘플 이후 ms, 바뀐 필드 비트마스크
+
+# 전송 필드 (SystemStats 속성, 형식, 배율) — 값 = round(속성 × 배율), 값이 없으면(None) 형식의 최댓값
+WIRE_FIELDS = (
+    ("cpu_percent",       "H", 100),
+    ("mem_percent",       "H", 100),
+    ("swap_percent",      "H", 100),
+    ("disk_percent",      "H", 100),
+    ("mount_max_percent", "H", 100),
+    ("disk_busy_percent", "H", 100),
+    ("net_recv_kb",       "I", 10),
+    ("net_sent_kb",       "I", 10),
+    ("cpu_iowait",        "H", 100),
+    ("cpu_steal",         "H", 100),
+    ("load_1",            "H", 100),
+    ("psi_memory_full",   "H", 100),
+    ("psi_io_full",       "H", 100),
+    ("cpu_peak",          "H", 100),
+    ("net_recv_peak_kb",  "I", 10),
+    ("net_sent_peak_kb",  "I", 10),
+)
+_CODECS = tuple(struct.Struct("<" + fmt) for _, fmt, _ in WIRE_FIELDS)
+_NONE = tuple((1 << (8 * c.size)) - 1 for c in _CODECS)
+MAX_SAMPLE = SAMPLE.size + sum(c.size for c in _CODECS)
+
+
+def quantize(stats) -> list[int]:
+    """SystemStats → 전송 필드 정수 목록"""
+    row = []
+    for (attr, _, scale), none in zip(WIRE_FIELDS, _NONE):
+        v = getattr(stats, attr)
+        row.append(none if v is None else min(none - 1, max(0, round(v * scale))))
+    return row
+
+
+def encode_frame(kind: int, body: bytes) -> bytes:
+    return FRAME.pack(kind, len(body)) + body
+
+
+def encode_hello(name: str, token: str, base_ts: float, cores: int,
+                 mem_total_gb: float, disk_total_gb: float) -> bytes:
+    name_b, token_b = name.encode()[:255], token.encode()[:255]
+    body = (
+        HELLO.pack(PROTOCOL_VERSION, base_ts, cores, mem_total_gb, disk_total_gb)
+        + bytes((len(token_b),)) + token_b + bytes((len(name_b),)) + name_b
+    )
+    return encode_frame(FRAME_HELLO, body)
+
+
+def decode_hello(body: bytes) -> SimpleNamespace:
+    """HELLO 본문 → (version, base_ts, cores, mem_total_gb, disk_total_gb, token, name), 형식 오류는 ValueError"""
+    try:
+        version, base_ts, cores, mem, disk = HELLO.unpack_from(body)
+        off = HELLO.size
+        token = body[off + 1:off + 1 + body[off]]
+        off += 1 + body[off]
+        name = body[off + 1:off + 1 + body[off]].decode()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"잘못된 HELLO: {e}") from None
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"지원하지 않는 프로토콜 버전 {version}")
+    if not name:
+        raise ValueError("서버 이름이 비어 있습니다")
+    return SimpleNamespace(version=version, base_ts=base_ts, cores=max(1, cores),
+                           mem_total_gb=mem, disk_total_gb=disk, token=token, name=name)
+
+
+class DeltaEncoder:
+    """샘플 → 직전 샘플 대비 차분 레코드 (연결마다 새로)"""
+
+    def __init__(self, base_ts: float):
+        self._ts = base_ts
+        self._last: list[int] | None = None
+
+    def encode(self, ts: float, row: list[int]) -> bytes:
+        dt = min(0xFFFFFFFF, max(0, round((ts - self._ts) * 1000)))
+        # 수신 측과 같은 방식으로 누적 (반올림 오차가 쌓이지 않게)
+        self._ts += dt / 1000
+        last = self._last
+        mask = 0
+        parts = []
+        for i, v in enumerate(row):
+            if last is None or last[i] != v:
+                mask |= 1 << i
+                parts.append(_CODECS[i].pack(v))
+        self._last = row
+        return SAMPLE.pack(dt, mask) + b"".join(parts)
+
+
+class DeltaDecoder:
+    """차분 레코드 → 현재 값 (연결마다 새로, 받지 못한 필드는 None)"""
+
+    def __init__(self, base_ts: float):
+        self.ts = base_ts
+        self.row = list(_NONE)
+
+    def decode(self, buf: bytes, off: int) -> int:
+        """buf[off:] 의 레코드 하나를 반영하고 다음 오프셋 반환"""
+        dt, mask = SAMPLE.unpack_from(buf, off)
+        off += SAMPLE.size
+        self.ts += dt / 1000
+        row = self.row
+        i = 0
+        while mask:
+            if mask & 1:
+                codec = _CODECS[i]
+                row[i] = codec.unpack_from(buf, off)[0]
+                off += codec.size
+            mask >>= 1
+            i += 1
+        return off
+
+    def values(self) -> dict[str, float | None]:
+        return {
+            attr: None if v == none else v / scale
+            for (attr, _, scale), v, none in zip(WIRE_FIELDS, self.row, _NONE)
+        }
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """프레임 하나 (연결이 끊기면 IncompleteReadError)"""
+    kind, length = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return kind, await reader.readexactly(length)
+
+
+# ══════════════════════════════════════════════════════════
+# 에이전트 (각 서버)
+# ══════════════════════════════════════════════════════════
+
+class FleetAgent:
+    """로컬 수집 → 전송 큐 → 수집 서버로 묶음 전송
+
+    stats_fn     : 샘플 수집 함수 (블로킹, executor 에서 실행 — 벤치마크에서는 합성 샘플)
+    queue_size   : 전송 대기 샘플 최대 수 (넘치면 오래된 것부터 버림)
+    batch_seconds: 0 보다 크면 첫 샘플 이후 이만큼 더 모아서 전송
+    stable_seconds: 이 시간 이상 유지된 연결이 끊긴 뒤에만 재접속 간격을 1초로 되돌림
+    """
+
+    def __init__(self, server: str, token: str, name: str, interval: float = config.FLEET_AGENT_INTERVAL,
+                 stats_fn=system_info.get_system_stats, queue_size: int = config.FLEET_AGENT_QUEUE,
+                 batch_seconds: float = config.FLEET_AGENT_BATCH_SECONDS, write_buffer: int = 64 * 1024,
+                 stable_seconds: float = config.FLEET_AGENT_STABLE_SECONDS):
+        host, _, port = server.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"수집 서버 주소는 host:port 형식이어야 합니다: {server}")
+        self.host, self.port = host.strip("[]"), int(port)
+        self.token = token
+        self.name = name
+        self.interval = interval
+        self.batch_seconds = batch_seconds
+        self.stable_seconds = stable_seconds
+        self.write_buffer = write_buffer
+        self._stats_fn = stats_fn
+        self._queue: deque[tuple[float, list[int]]] = deque(maxlen=queue_size)
+        self._info: tuple[int, float, float] | None = None   # (코어 수, 메모리 GB, 디스크 GB)
+        self._wake = asyncio.Event()
+        self._ticker = Ticker(interval, "fleet-agent")
+        self.connected = False
+        # 통계
+        self.collected = 0
+        self.sent = 0          # 전송한 샘플 수
+        self.frames = 0
+        self.bytes_sent = 0
+        self.dropped = 0       # 큐가 넘쳐 버린 샘플 수
+        self.reconnects = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def push(self, stats, ts: float | None = None):
+        """샘플 하나를 전송 큐에 추가 (가득 차면 가장 오래된 샘플을 버림)"""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((time.time() if ts is None else ts, quantize(stats)))
+        self._info = (len(stats.cpu_per_core) or 1, stats.mem_total_gb, stats.disk_total_gb)
+        self.collected += 1
+        self._wake.set()
+
+    async def _collect(self, tick: int = 0):
+        stats = await asyncio.get_event_loop().run_in_executor(None, self._stats_fn)
+        self.push(stats)
+
+    async def run(self):
+        """수집 루프 + 전송 작업자 (취소될 때까지)"""
+        sender = asyncio.ensure_future(self.send_loop())
+        try:
+            await self._ticker.run(self._collect)
+        finally:
+            sender.cancel()
+            try:
+                await sender
+            except asyncio.CancelledError:
+                pass
+
+    async def send_loop(self):
+        """접속 → 전송, 끊기면 지수 백오프로 재접속 (대기 중에도 샘플은 큐에 쌓임)"""
+        backoff = 1.0
+        while True:
+            while not self._queue:
+                self._wake.clear()
+                await self._wake.wait()
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout=10)
+            except (OSError, asyncio.TimeoutError) as e:
+                log.warning(f"수집 서버 접속 실패 ({self.host}:{self.port}): {e} — {backoff:.0f}초 후 재시도")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+                continue
+            self.connected = True
+            started = time.monotonic()
+            log.info(f"수집 서버 접속: {self.host}:{self.port} (대기 샘플 {len(self._queue)}개)")
+            try:
+                await self._stream(reader, writer)
+            except (OSError, ConnectionError) as e:
+                log.warning(f"수집 서버 연결 끊김: {e}")
+            finally:
+                self.connected = False
+                self.reconnects += 1
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except (OSError, ConnectionError):
+                    pass
+            # 수집 서버는 응답을 보내지 않으므로 연결 유지 시간으로 성공 판정
+            # (인증 실패는 HELLO 직후 끊김 → 백오프를 유지해 초 단위 재접속 반복을 막음)
+            lived = time.monotonic() - started
+            if lived >= self.stable_seconds:
+                backoff = 1.0
+                await asyncio.sleep(backoff)
+                continue
+            log.warning(f"수집 서버 연결이 {lived:.1f}초 만에 끊김 (인증 실패라면 FLEET_TOKEN 확인) "
+                        f"— {backoff:.0f}초 후 재시도")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    async def _stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # 쓰기 버퍼가 이 크기를 넘으면 drain 에서 대기 → 그동안 새 샘플은 큐에 쌓였다가 다음 묶음으로
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        base = self._queue[0][0]
+        encoder = DeltaEncoder(base)
+        writer.write(encode_hello(self.name, self.token, base, *self._info))
+        # 수집 서버는 데이터를 보내지 않으므로 읽기가 끝나면 연결 종료 (인증 실패 등)
+        closed = asyncio.ensure_future(reader.read(1))
+        try:
+            while True:
+                while not self._queue:
+                    self._wake.clear()
+                    wake = asyncio.ensure_future(self._wake.wait())
+                    await asyncio.wait((wake, closed), return_when=asyncio.FIRST_COMPLETED)
+                    wake.cancel()
+                    if closed.done():
+                        raise ConnectionError("수집 서버가 연결을 닫았습니다")
+                if self.batch_seconds > 0:
+                    await asyncio.sleep(self.batch_seconds)
+                body = bytearray()
+                queue = self._queue
+                while queue and len(body) <= MAX_BODY - MAX_SAMPLE:
+                    ts, row = queue.popleft()
+                    body += encoder.encode(ts, row)
+                    self.sent += 1
+                writer.write(encode_frame(FRAME_BATCH, bytes(body)))
+                self.frames += 1
+                self.bytes_sent += FRAME.size + len(body)
+                await writer.drain()
+                if closed.done():
+                    raise ConnectionError("수집 서버가 연결을 닫았습니다")
+        finally:
+            if closed.done() and not closed.cancelled():
+                closed.exception()   # 읽기 오류는 위에서 연결 끊김으로 처리됨
+            closed.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "collected":   self.collected,
+            "sent":        self.sent,
+            "frames":      self.frames,
+            "bytes":       self.bytes_sent,
+            "dropped":     self.dropped,
+            "queue_depth": self.queue_depth,
+            "reconnects":  self.reconnects,
+        }
+
+
+# ══════════════════════════════════════════════════════════
+# 수집 서버
+# ══════════════════════════════════════════════════════════
+
+# 수집 서버에서 알림 규칙이 읽을 수 있는 SystemStats 속성 (전송 필드 + FleetHost.stats 파생 값)
+FLEET_STATS = frozenset(attr for attr, _, _ in WIRE_FIELDS) | {"load_per_core"}
+
+
+def fleet_rules(specs: list[dict]) -> list[dict]:
+    """알림 규칙 중 수집 서버에서 평가할 수 있는 것만 (전송하지 않는 지표 / 이동 통계가 없는 avg 규칙은 경고 후 제외)"""
+    usable = []
+    for spec in specs:
+        metric = spec.get("metric", spec["name"])
+        attr = ALERT_METRICS.get(metric)
+        if attr is not None and attr not in FLEET_STATS:
+            log.warning(f"알림 규칙 {spec['name']}: 지표 {metric} 는 에이전트가 전송하지 않아 제외합니다")
+        elif spec.get("kind") == "avg" and metric not in FleetHost.METRICS:
+            log.warning(f"알림 규칙 {spec['name']}: 지표 {metric} 는 서버별 이동 통계가 없어 제외합니다")
+        else:
+            usable.append(spec)
+    return usable
+
+
+class FleetHost:
+    """수집 서버가 유지하는 서버 하나의 상태 (현재 값, 이동 통계, 알림 규칙)"""
+
+    # 이동 통계 지표 → 전송 필드
+    METRICS = {
+        "cpu":      "cpu_percent",
+        "mem":      "mem_percent",
+        "disk":     "disk_percent",
+        "net_recv": "net_recv_kb",
+        "net_sent": "net_sent_kb",
+    }
+
+    def __init__(self, name: str, rules: list[dict], windows: dict[str, float], min_push: float):
+        self.name = name
+        self.cores = 1
+        self.mem_total_gb = 0.0
+        self.disk_total_gb = 0.0
+        self.addr = ""
+        self.conn = 0                 # 현재 연결 번호 (같은 이름으로 다시 접속하면 이전 연결은 무시)
+        self.connected = False
+        self.online = True            # 응답 없음 알림 상태
+        self.last_seen = 0.0          # 마지막 프레임 수신 (monotonic)
+        self.values: dict[str, float | None] = {}
+        self.samples = 0
+        self.bytes = 0
+        self._min_push = min_push
+        self._last_push: float | None = None   # 이동 통계에 마지막으로 넣은 샘플 시각 (에이전트 기준)
+        capacity = int(max(windows.values()) // min_push) + 2
+        self.windows = RollingWindows(tuple(self.METRICS), windows, capacity)
+        self.alerts = AlertEngine(compile_rules(rules, windows))
+
+    def stats(self) -> SimpleNamespace:
+        """알림 규칙 평가용 (SystemStats 와 같은 속성 이름)"""
+        v = self.values
+        load_1 = v.get("load_1")
+        return SimpleNamespace(**v, load_per_core=None if load_1 is None else load_1 / self.cores)
+
+    def observe(self, ts: float, values: dict[str, float | None]):
+        """샘플 하나 반영 — 이동 통계에는 min_push 간격 이상인 샘플만 (샘플 간격을 가중치로)"""
+        self.values = values
+        self.samples += 1
+        last = self._last_push
+        if last is not None and ts < last:
+            # 에이전트 시계가 뒤로 간 경우 — 이동 통계는 시각 순서가 필요하므로 새로 시작
+            # (min_push 판정보다 먼저 — 그렇지 않으면 원래 시각을 따라잡을 때까지 샘플을 모두 건너뜀)
+            self.windows = RollingWindows(self.windows.metrics, self.windows.windows, self.windows.capacity)
+            last = None
+        elif last is not None and ts - last < self._min_push:
+            return
+        self._last_push = ts
+        weight = self._min_push if last is None else min(ts - last, 60.0)
+        self.windows.push({m: values[attr] or 0.0 for m, attr in self.METRICS.items()}, ts, weight)
+
+    def evaluate(self, now: float) -> tuple[list[Firing], list[Firing]]:
+        return self.alerts.evaluate(self.stats(), self.windows.snapshot(), now)
+
+
+class FleetAggregator:
+    """에이전트 연결을 받아 서버별 상태를 유지 (Discord 와 무관 — 렌더 / 전송은 FleetMonitorBot)"""
+
+    def __init__(self, token: str, rules: list[dict] | None = None, windows: dict[str, float] | None = None,
+                 stale: float = config.FLEET_STALE_SECONDS, min_push: float = config.FLEET_MIN_PUSH_SECONDS,
+                 restore: dict | None = None):
+        if not token:
+            raise ValueError("FLEET_TOKEN 이 비어 있습니다")
+        self._token = token.encode()
+        self._rules = fleet_rules(config.FLEET_ALERT_RULES if rules is None else rules)
+        self._windows = config.FLEET_WINDOWS if windows is None else windows
+        self.stale = stale
+        self._min_push = min_push
+        self._restore = restore or {}          # {서버 이름: {규칙 이름: bool}} — 재시작 전 알림 상태
+        compile_rules(self._rules, self._windows)   # 잘못된 규칙은 시작 시 ValueError
+        self.hosts: dict[str, FleetHost] = {}
+        # 렌더 틱마다 가져갈 이벤트 — (서버 이름, 발생, 해제), (서버 이름, 온라인 여부)
+        self._alerts: list[tuple[str, list[Firing], list[Firing]]] = []
+        self._status: list[tuple[str, bool]] = []
+        self._server: asyncio.AbstractServer | None = None
+        self._conns_open: dict[asyncio.Task, asyncio.StreamWriter] = {}   # 연결 처리 코루틴 → 연결
+        self._conns = 0
+        # 통계
+        self.frames = 0
+        self.samples = 0
+        self.bytes = 0
+        self.rejected = 0
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1] if self._server else 0
+
+    async def start(self, host: str = config.FLEET_BIND, port: int = config.FLEET_PORT):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        log.info(f"수집 서버 시작: {host}:{self.port}")
+
+    async def close(self):
+        """수신 중지 + 연결된 에이전트 연결 종료 (에이전트는 큐에 쌓으며 재접속 시도)"""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._conns_open.values():
+                writer.close()
+            await asyncio.gather(*self._conns_open, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _host(self, name: str) -> FleetHost:
+        host = self.hosts.get(name)
+        if host is None:
+            host = self.hosts[name] = FleetHost(name, self._rules, self._windows, self._min_push)
+            host.alerts.restore(self._restore.get(name, {}))
+        return host
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        addr = f"{peer[0]}:{peer[1]}" if peer else "?"
+        host = None
+        self._conns += 1
+        conn = self._conns
+        task = asyncio.current_task()
+        self._conns_open[task] = writer
+        try:
+            kind, body = await asyncio.wait_for(read_frame(reader), timeout=10)
+            if kind != FRAME_HELLO:
+                raise ValueError(f"첫 프레임이 HELLO 가 아님 ({kind})")
+            hello = decode_hello(body)
+            if not hmac.compare_digest(hello.token, self._token):
+                self.rejected += 1
+                log.warning(f"인증 실패: {addr} ({hello.name})")
+                return
+            host = self._host(hello.name)
+            if host.connected:
+                log.warning(f"[{host.name}] 같은 이름으로 새 연결 ({host.addr} → {addr})")
+            host.conn, host.connected, host.addr = conn, True, addr
+            host.cores, host.mem_total_gb, host.disk_total_gb = hello.cores, hello.mem_total_gb, hello.disk_total_gb
+            host.last_seen = time.monotonic()
+            log.info(f"[{host.name}] 에이전트 접속: {addr} (코어 {host.cores}개)")
+            decoder = DeltaDecoder(hello.base_ts)
+            while True:
+                kind, body = await read_frame(reader)
+                if kind != FRAME_BATCH:
+                    raise ValueError(f"알 수 없는 프레임 종류 {kind}")
+                self._ingest(host, decoder, body)
+        except asyncio.IncompleteReadError:
+            pass
+        except asyncio.TimeoutError:
+            log.warning(f"HELLO 대기 시간 초과: {addr}")
+        except (ValueError, struct.error) as e:
+            log.warning(f"프로토콜 오류 ({host.name if host else addr}): {e}")
+        except (OSError, ConnectionError) as e:
+            log.warning(f"연결 오류 ({host.name if host else addr}): {e}")
+        except Exception as e:
+            # 반영 / 평가 중 예기치 못한 오류 — 이 연결만 정리하고 수집 서버는 계속
+            log.error(f"연결 처리 오류 ({host.name if host else addr}): {e}", exc_info=True)
+        finally:
+            if host is not None and host.conn == conn:
+                host.connected = False
+                log.info(f"[{host.name}] 에이전트 연결 종료")
+            self._conns_open.pop(task, None)
+            writer.close()
+
+    def _ingest(self, host: FleetHost, decoder: DeltaDecoder, body: bytes):
+        """프레임 하나의 샘플을 모두 반영하고 마지막 샘플로 알림 규칙 평가"""
+        off, n, count = 0, len(body), 0
+        while off < n:
+            off = decoder.decode(body, off)
+            host.observe(decoder.ts, decoder.values())
+            count += 1
+        if not count:
+            return
+        host.bytes += FRAME.size + n
+        host.last_seen = time.monotonic()
+        self.frames += 1
+        self.samples += count
+        self.bytes += FRAME.size + n
+        if not host.online:
+            host.online = True
+            self._status.append((host.name, True))
+        # 밀린 샘플을 한꺼번에 받아도 (재접속 직후) 알림은 최신 상태로 한 번만
+        fired, cleared = host.evaluate(decoder.ts)
+        if fired or cleared:
+            self._alerts.append((host.name, fired, cleared))
+
+    def check_stale(self, now: float | None = None):
+        """FLEET_STALE_SECONDS 동안 샘플이 없는 서버 → 응답 없음"""
+        now = time.monotonic() if now is None else now
+        for host in self.hosts.values():
+            if host.online and now - host.last_seen >= self.stale:
+                host.online = False
+                self._status.append((host.name, False))
+
+    def drain_events(self) -> tuple[list[tuple[str, list[Firing], list[Firing]]], list[tuple[str, bool]]]:
+        alerts, status = self._alerts, self._status
+        self._alerts, self._status = [], []
+        return alerts, status
+
+    def alert_state(self) -> dict:
+        return {name: host.alerts.active() for name, host in self.hosts.items()}
+
+
+# ══════════════════════════════════════════════════════════
+# Embed
+# ══════════════════════════════════════════════════════════
+
+FLEET_LINES = 40   # 서버 현황 embed 에 표시할 최대 서버 수 (설명 4096자 제한)
+
+
+def _fmt_rate(kb: float | None) -> str:
+    if kb is None:
+        return "-"
+    return f"{kb / 1024:.1f}M" if kb >= 1024 else f"{kb:.0f}K"
+
+
+def _host_level(host: FleetHost) -> int:
+    """정렬 / 색상용 상태 (0 = 알림 중, 1 = 응답 없음, 2 = 경고 색상, 3 = 정상)"""
+    if not host.online:
+        return 1
+    if any(r.active for r in host.alerts.rules):
+        return 0
+    v = host.values
+    if ((v.get("cpu_percent") or 0.0) >= config.CPU_WARN_THRESHOLD
+            or (v.get("mem_percent") or 0.0) >= config.MEM_WARN_THRESHOLD
+            or (v.get("mount_max_percent") or 0.0) >= config.DISK_WARN_THRESHOLD):
+        return 2
+    return 3
+
+
+_LEVEL_ICONS = ("🔴", "⚫", "🟠", "🟢")
+
+
+def _host_line(host: FleetHost, level: int, now: float) -> str:
+    if level == 1:
+        ago = int(now - host.last_seen)
+        return f"⚫ **{host.name}** 응답 없음 ({ago // 60}분 {ago % 60}초 전)"
+    v = host.values
+    avg = host.windows.summary("cpu", "10m") if "10m" in host.windows.windows else None
+    cpu_avg = f" (10m {avg.mean:.0f}%)" if avg is not None and avg.count else ""
+    return (
+        f"{_LEVEL_ICONS[level]} **{host.name}** CPU {v.get('cpu_percent') or 0.0:.0f}%{cpu_avg} · "
+        f"메모리 {v.get('mem_percent') or 0.0:.0f}% · 디스크 {v.get('mount_max_percent') or 0.0:.0f}% · "
+        f"↓{_fmt_rate(v.get('net_recv_kb'))} ↑{_fmt_rate(v.get('net_sent_kb'))}"
+    )
+
+
+def build_fleet_embed(hosts: list[FleetHost], now: float | None = None) -> discord.Embed:
+    """서버 현황 — 서버마다 한 줄 (알림 중 → 응답 없음 → 경고 → 정상, 같은 상태는 CPU 높은 순)"""
+    now = time.monotonic() if now is None else now
+    ranked = sorted(((_host_level(h), -(h.values.get("cpu_percent") or 0.0), h.name, h) for h in hosts),
+                    key=lambda x: x[:3])
+    lines, size = [], 0
+    for level, _, _, h in ranked[:FLEET_LINES]:
+        line = _host_line(h, level, now)
+        if size + len(line) > 3900:   # 설명 4096자 제한 (서버 이름이 긴 경우)
+            break
+        lines.append(line)
+        size += len(line) + 1
+    if len(lines) < len(ranked):
+        lines.append(f"… 외 {len(ranked) - len(lines)}대")
+
+    levels = {level for level, _, _, _ in ranked}
+    alerting = sum(1 for level, _, _, _ in ranked if level == 0)
+    online = sum(1 for h in hosts if h.online)
+    if levels & {0, 1}:
+        color = config.COLOR_CRIT
+    elif 2 in levels:
+        color = config.COLOR_WARN
+    else:
+        color = config.COLOR_NORMAL
+    embed = discord.Embed(
+        title=f"🛰️ 서버 현황 ({online}/{len(hosts)}대 응답)",
+        description="\n".join(lines) or "접속한 에이전트가 없습니다.",
+        color=color,
+        timestamp=datetime.now(timezone.utc),
+    )
+    embed.set_footer(text=f"알림 중 {alerting}대 · " + datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S KST"))
+    return embed
+
+
+def build_fleet_alert_embed(alerts: list[tuple[str, list[Firing], list[Firing]]],
+                            offline: list[str]) -> discord.Embed:
+    """같은 렌더 틱에 발생한 서버별 알림 + 응답 없음을 묶은 Embed"""
+    lines = [f"• **{name}** {f.rule.describe(f.value)}" for name, fired, _ in alerts for f in fired]
+    lines += [f"• **{name}** 응답 없음 ({config.FLEET_STALE_SECONDS}초 이상 샘플 없음)" for name in offline]
+    embed = discord.Embed(
+        title="🚨 서버 경고",
+        description="\n".join(lines),
+        color=config.COLOR_CRIT,
+        timestamp=datetime.now(timezone.utc),
+    )
+    embed.set_footer(text=datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S KST"))
+    return embed
+
+
+def build_fleet_recover_embed(alerts: list[tuple[str, list[Firing], list[Firing]]],
+                              online: list[str]) -> discord.Embed:
+    """같은 렌더 틱에 해제된 서버별 알림 + 응답 재개를 묶은 Embed"""
+    lines = [f"• **{name}** {f.rule.describe_clear(f.value)}" for name, _, cleared in alerts for f in cleared]
+    lines += [f"• **{name}** 응답 재개" for name in online]
+    embed = discord.Embed(
+        title="✅ 서버 정상화",
+        description="\n".join(lines),
+        color=config.COLOR_NORMAL,
+        timestamp=datetime.now(timezone.utc),
+    )
+    embed.set_footer(text=datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S KST"))
+    return embed
+
+
+# ══════════════════════════════════════════════════════════
+# Discord 봇 (수집 서버)
+# ══════════════════════════════════════════════════════════
+
+class FleetMonitorBot(discord.Client):
+    def __init__(self, transport=None):
+        intents = discord.Intents.default()
+        limiter = getattr(transport, "limiter", None) or RateLimitTracker()
+        super().__init__(intents=intents, http_trace=limiter.trace_config())
+        self._state = StateFile(state_path("fleet"))
+        # 서버별 알림 상태는 재시작해도 이어받음 (조건이 계속되면 다시 알리지 않음)
+        self.aggregator = FleetAggregator(config.FLEET_TOKEN, restore=self._state.get("alerts", {}))
+        self._outbox = Outbox(
+            transport or ChannelTransport(self, config.FLEET_CHANNEL_ID), limiter, "fleet",
+            heartbeat=config.STATUS_HEARTBEAT_SECONDS, state=self._state,
+        )
+        self._outbox.restore_message()
+        self._ticker = Ticker(config.FLEET_RENDER_SECONDS, "fleet")
+        self._render_task: asyncio.Task | None = None
+
+    async def start_detached(self):
+        """게이트웨이 접속 없이 수집 서버 + 발신 작업자만 시작 (웹훅 전송)"""
+        self._outbox.start()
+        await self.aggregator.start()
+        self._render_task = asyncio.get_event_loop().create_task(self._ticker.run(self.render))
+
+    async def setup_hook(self):
+        self._outbox.start()
+        await self.aggregator.start()
+        self._render_task = self.loop.create_task(self._render_loop())
+
+    async def _render_loop(self):
+        await self.wait_until_ready()
+        await self._ticker.run(self.render, start_after=5)
+
+    async def close(self):
+        if self._render_task is not None:
+            self._render_task.cancel()
+        await self.aggregator.close()
+        self._state.update(alerts=self.aggregator.alert_state())
+        try:
+            self._state.save()
+        except OSError as e:
+            log.warning(f"상태 파일 저장 실패: {e}")
+        await self._outbox.close()
+        await super().close()
+
+    async def on_ready(self):
+        log.info(f"서버 현황 봇 로그인 완료: {self.user} (ID: {self.user.id})")
+        log.info(f"채널 ID: {config.FLEET_CHANNEL_ID} | 수신 포트: {self.aggregator.port}")
+        await self.change_presence(
+            activity=discord.Activity(type=discord.ActivityType.watching, name="서버 현황")
+        )
+        if self._outbox.message is None:
+            await self._recover_status_message()
+
+    async def _recover_status_message(self):
+        """채널 최근 메시지에서 봇이 보낸 embed 메시지를 찾아 상태 메시지로 복구"""
+        channel = self.get_channel(config.FLEET_CHANNEL_ID)
+        if channel is None:
+            return
+        try:
+            async for msg in channel.history(limit=20):
+                if msg.author.id == self.user.id and msg.embeds:
+                    self._outbox.adopt(msg)
+                    log.info(f"이전 상태 메시지 복구: {msg.id}")
+                    return
+        except Exception as e:
+            log.warning(f"메시지 복구 실패: {e}")
+
+    async def render(self, tick: int = 0):
+        """서버 현황 embed 갱신 + 이번 틱에 쌓인 서버별 알림을 메시지 하나씩으로 전송"""
+        if not self._outbox.ready:
+            log.warning(f"채널을 찾을 수 없습니다: {config.FLEET_CHANNEL_ID}")
+            return
+        agg = self.aggregator
+        with metrics.timed("fleet", "render"):
+            agg.check_stale()
+            self._outbox.set_status(build_fleet_embed(list(agg.hosts.values())))
+        alerts, status = agg.drain_events()
+        offline = [name for name, up in status if not up]
+        online = [name for name, up in status if up]
+        if any(fired for _, fired, _ in alerts) or offline:
+            self._outbox.post(build_fleet_alert_embed(alerts, offline), content="@here")
+            log.warning(f"서버 알림 전송 | {len(offline)}대 응답 없음, "
+                        f"{sum(len(f) for _, f, _ in alerts)}건 발생")
+        if any(cleared for _, _, cleared in alerts) or online:
+            self._outbox.post(build_fleet_recover_embed(alerts, online))
+
+
+# ══════════════════════════════════════════════════════════
+# 실행
+# ══════════════════════════════════════════════════════════
+
+async def run_agent():
+    if not config.FLEET_SERVER or not config.FLEET_TOKEN:
+        log.error("FLEET_SERVER / FLEET_TOKEN 환경변수가 설정되지 않았습니다.")
+        return
+    agent = FleetAgent(config.FLEET_SERVER, config.FLEET_TOKEN, config.FLEET_NAME)
+    system_info.start_burst_sampler(config.BURST_SAMPLE_MS / 1000)
+    log.info(f"에이전트 시작 | {config.FLEET_NAME} → {config.FLEET_SERVER} | 수집 주기 {agent.interval}초")
+    try:
+        await agent.run()
+    finally:
+        system_info.stop_burst_sampler()
+
+
+async def run_aggregator():
+    if not config.FLEET_TOKEN:
+        log.error("FLEET_TOKEN 환경변수가 설정되지 않았습니다.")
+        return
+    if config.FLEET_WEBHOOK_URL:
+        limiter = RateLimitTracker()
+        session = aiohttp.ClientSession(trace_configs=[limiter.trace_config()])
+        bot = FleetMonitorBot(WebhookTransport(session, config.FLEET_WEBHOOK_URL, limiter))
+        try:
+            await bot.start_detached()
+            log.info("서버 현황 웹훅 모드 시작")
+            await asyncio.Event().wait()
+        finally:
+            await bot.close()
+            await session.close()
+        return
+    if not config.DISCORD_BOT_TOKEN or config.FLEET_CHANNEL_ID == 0:
+        log.error("DISCORD_BOT_TOKEN / FLEET_CHANNEL_ID (또는 FLEET_WEBHOOK_URL) 이 설정되지 않았습니다.")
+        return
+    bot = FleetMonitorBot()
+    async with bot:
+        await bot.start(config.DISCORD_BOT_TOKEN)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 서버 통합 모니터링")
+    parser.add_argument("mode", choices=("agent", "aggregator"))
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_agent() if args.mode == "agent" else run_aggregator())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+hitters.py — 고정 메모리 장기 프로세스 추적 (CPU 누적 상위 / RSS 증가 속도)
+현재 상위 N 스냅샷은 "지금" 바쁜 프로세스만 보여 주므로, 몇 시간에 걸쳐 조금씩 CPU 를
+쓰는 프로세스나 천천히 메모리가 새는 프로세스는 보이지 않습니다.
+
+- CPU 누적 상위: 1시간 슬롯마다 Space-Saving 요약(키 최대 capacity 개)에 CPU-초를 누적하고
+  조회 시 최근 N시간 슬롯을 병합 → 메모리는 (N + 1) × capacity 항목으로 고정
+- RSS 증가 속도: 추적 대상별 지수 감쇠 최소제곱 기울기 (MB/시간), 항목당 누적합 5개만 유지
+  추적 대상은 capacity 개로 제한, 가득 차면 충분히 지켜본 뒤 늘지 않는 항목을 새 후보로 교체
+"""
+
+import heapq
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from operator import itemgetter
+
+_MB = 1024 * 1024
+
+
+class SpaceSaving:
+    """가중치 Space-Saving 요약 — 키 최대 capacity 개
+
+    추적 중인 키의 추정값은 실제 누적값 이상이고, 초과분은 그 키의 error 이하이다.
+    가득 찬 요약에 없는 키의 실제 누적값은 floor(최소 추정값) 이하.
+    """
+
+    __slots__ = ("capacity", "counts", "errors", "_heap")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[str, float] = {}
+        self.errors: dict[str, float] = {}
+        # (기록 당시 값, 키) 최소 힙 — 키당 항목 하나, 값은 늘기만 하므로 꺼낼 때만 최신화 (지연 갱신)
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def floor(self) -> float:
+        """요약에 없는 키의 상한 (밀려난 키가 없었으면 0)"""
+        if len(self.counts) < self.capacity or not self.counts:
+            return 0.0
+        return min(self.counts.values())
+
+    def add(self, key: str, weight: float):
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+        elif len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0.0
+            heapq.heappush(self._heap, (weight, key))
+        else:
+            # 가장 작은 항목을 밀어내고 그 값을 오차로 물려받음
+            heap = self._heap
+            while True:
+                recorded, victim = heap[0]
+                current = counts[victim]
+                if current == recorded:
+                    break
+                heapq.heapreplace(heap, (current, victim))
+            floor = counts.pop(victim)
+            del self.errors[victim]
+            counts[key] = floor + weight
+            self.errors[key] = floor
+            heapq.heapreplace(heap, (floor + weight, key))
+
+    def to_dict(self) -> dict:
+        return {key: [_compact(c), _compact(self.errors[key])] for key, c in self.counts.items()}
+
+    def load_dict(self, data: dict):
+        self.counts = {key: float(c) for key, (c, _) in data.items()}
+        self.errors = {key: float(e) for key, (_, e) in data.items()}
+        self._heap = [(c, key) for key, c in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+def _compact(v: float):
+    r = round(v, 2)
+    return int(r) if r == int(r) else r
+
+
+@dataclass
+class HeavyHitter:
+    key: str
+    cpu_seconds: float   # 추정 누적 CPU-초 (상한)
+    error: float         # 추정 오차 상한 (0 이면 정확)
+
+
+class RollingHeavyHitters:
+    """최근 span 초 구간의 CPU-초 누적 상위 — slot 초 단위 Space-Saving 요약을 돌려 쓰는 방식
+
+    구간 경계는 slot 단위로만 맞춰지므로 실제 포함 구간은 span ~ span + slot 이다.
+    """
+
+    def __init__(self, span: float, slot: float = 3600, capacity: int = 64):
+        self.span = span
+        self.slot = slot
+        self.capacity = capacity
+        self._slots: deque[tuple[int, SpaceSaving]] = deque()
+        self._first_ts: float | None = None
+
+    def add(self, key: str, weight: float, ts: float):
+        if weight <= 0:
+            return
+        self._current(ts).add(key, weight)
+
+    def add_many(self, items, ts: float):
+        """[(키, CPU-초)] 를 한 슬롯에 누적 (0 이하는 건너뜀)"""
+        summary = self._current(ts)
+        for key, weight in items:
+            if weight > 0:
+                summary.add(key, weight)
+
+    def _current(self, ts: float) -> SpaceSaving:
+        slot_id = int(ts // self.slot)
+        if self._first_ts is None:
+            self._first_ts = ts
+        if not self._slots or self._slots[-1][0] != slot_id:
+            self._slots.append((slot_id, SpaceSaving(self.capacity)))
+            self._expire(slot_id)
+        return self._slots[-1][1]
+
+    def _expire(self, slot_id: int):
+        oldest = slot_id - int(math.ceil(self.span / self.slot))
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.popleft()
+
+    def top(self, n: int, now: float | None = None, span: float | None = None) -> list[HeavyHitter]:
+        """슬롯 요약을 병합해 상위 n 개 (슬롯에 없는 키는 그 슬롯의 floor 를 더해 상한 유지)
+
+        span: 최근 span 초에 걸친 슬롯만 병합 (없으면 보관 중인 전체)
+        """
+        if now is not None:
+            self._expire(int(now // self.slot))
+        oldest = None
+        if span is not None:
+            ref = time.time() if now is None else now
+            oldest = int((ref - span) // self.slot)
+        summaries = [s for slot_id, s in self._slots if oldest is None or slot_id >= oldest]
+        floors = [s.floor for s in summaries]
+        keys = set()
+        for s in summaries:
+            keys.update(s.counts)
+        merged = []
+        for key in keys:
+            count = error = 0.0
+            for s, floor in zip(summaries, floors):
+                c = s.counts.get(key)
+                if c is None:
+                    count += floor
+                    error += floor
+                else:
+                    count += c
+                    error += s.errors[key]
+            merged.append(HeavyHitter(key, count, error))
+        return heapq.nlargest(n, merged, key=lambda h: h.cpu_seconds)
+
+    def coverage(self, now: float, span: float | None = None) -> float:
+        """데이터가 존재하는 구간 길이 (초, 최대 span)"""
+        if not self._slots or self._first_ts is None:
+            return 0.0
+        return max(0.0, min(self.span if span is None else span, now - self._first_ts))
+
+    def to_dict(self) -> dict:
+        return {
+            "first": self._first_ts,
+            "slots": [[slot_id, s.to_dict()] for slot_id, s in self._slots],
+        }
+
+    def load_dict(self, data: dict):
+        self._first_ts = data.get("first")
+        self._slots.clear()
+        for slot_id, raw in data.get("slots", []):
+            s = SpaceSaving(self.capacity)
+            s.load_dict(raw)
+            self._slots.append((int(slot_id), s))
+
+
+class _SlopeTrack:
+    """지수 감쇠 가중 최소제곱 (x = 시간, y = RSS)
+
+    원점을 항상 마지막 샘플 시각으로 옮겨 두므로 오래 추적해도 Σx² 가 커지지 않는다.
+    """
+
+    __slots__ = ("label", "since", "last", "rss", "samples", "s", "sx", "sy", "sxx", "sxy", "seen")
+
+    def __init__(self, label: str, ts: float, rss_mb: float):
+        self.label = label
+        self.since = ts
+        self.last = ts
+        self.rss = rss_mb
+        self.samples = 1
+        self.s, self.sx, self.sy, self.sxx, self.sxy = 1.0, 0.0, rss_mb, 0.0, 0.0
+        self.seen = 0
+
+    def update(self, ts: float, rss_mb: float, decay: float):
+        """decay: 시간(h)당 감쇠 지수 (ln2 / 반감기)"""
+        d = (ts - self.last) / 3600
+        if d <= 0:
+            self.rss = rss_mb
+            return
+        # 원점 이동 (x → x - d)
+        s, sx = self.s, self.sx
+        self.sxx += -2 * d * sx + d * d * s
+        self.sxy -= d * self.sy
+        self.sx = sx - d * s
+        # 감쇠 후 새 샘플 (x = 0)
+        f = math.exp(-decay * d)
+        self.s = s * f + 1
+        self.sx *= f
+        self.sy = self.sy * f + rss_mb
+        self.sxx *= f
+        self.sxy *= f
+        self.last = ts
+        self.rss = rss_mb
+        self.samples += 1
+
+    def slope(self) -> float:
+        """MB / 시간"""
+        den = self.s * self.sxx - self.sx * self.sx
+        if den <= 0:
+            return 0.0
+        return (self.s * self.sxy - self.sx * self.sy) / den
+
+
+@dataclass
+class RssGrowth:
+    label: str
+    mb_per_hour: float
+    rss_mb: float
+    tracked_seconds: float
+
+
+class RssSlopeTracker:
+    """추적 대상별 RSS 증가 기울기 (최대 capacity 개)
+
+    half_life : 기울기 가중치 반감기 (초) — 이보다 오래된 샘플은 점점 덜 반영
+    min_age   : 이 시간(초) 이상 지켜본 항목만 순위에 올리고 교체 대상으로 삼음
+    min_rss_mb: 이보다 작은 프로세스는 추적하지 않음 (커널 스레드 등)
+    """
+
+    def __init__(self, capacity: int = 128, half_life: float = 2 * 3600,
+                 min_age: float = 600, min_rss_mb: float = 8):
+        self.capacity = capacity
+        self.min_age = min_age
+        self.min_rss_mb = min_rss_mb
+        self._decay = math.log(2) / (half_life / 3600)
+        self._tracks: dict = {}
+        self._round = 0
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def update(self, items, ts: float, label=str):
+        """items: [(키, RSS 바이트)] — 한 번의 스캔 전체 (없어진 키는 추적 종료)
+
+        label: 키 → 표시 이름 (새로 추적을 시작하는 키에만 호출)
+        """
+        self._round += 1
+        rnd = self._round
+        tracks = self._tracks
+        decay = self._decay
+        min_rss = self.min_rss_mb * _MB
+        pending = []
+        for key, rss in items:
+            tr = tracks.get(key)
+            if tr is not None:
+                tr.update(ts, rss / _MB, decay)
+                tr.seen = rnd
+            elif rss >= min_rss:
+                pending.append((rss, key))
+
+        for key in [k for k, tr in tracks.items() if tr.seen != rnd]:
+            del tracks[key]
+        if not pending:
+            return
+
+        free = self.capacity - len(tracks)
+        if len(pending) > free:
+            # 충분히 지켜봤는데 늘지 않는 항목을 큰 RSS 후보에게 넘김 (순환하며 모두 한 번씩 관찰)
+            idle = [k for k, tr in tracks.items()
+                    if ts - tr.since >= self.min_age and tr.slope() <= 0]
+            if free + len(idle) <= 0:
+                return
+            pending = heapq.nlargest(free + len(idle), pending, key=itemgetter(0))
+            for key in idle[:len(pending) - free]:
+                del tracks[key]
+        for rss, key in pending:
+            tr = tracks[key] = _SlopeTrack(label(key), ts, rss / _MB)
+            tr.seen = rnd
+
+    def top(self, n: int, now: float) -> list[RssGrowth]:
+        """min_age 이상 추적한 항목 중 증가 속도 상위 n 개 (증가 중인 것만)"""
+        ranked = []
+        for tr in self._tracks.values():
+            if now - tr.since < self.min_age or tr.samples < 3:
+                continue
+            slope = tr.slope()
+            if slope > 0:
+                ranked.append(RssGrowth(tr.label, slope, tr.rss, now - tr.since))
+        return heapq.nlargest(n, ranked, key=lambda g: g.mb_per_hour)
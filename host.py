@@ -0,0 +1,83 @@
+"""
+host.py — 시스템 모니터 봇 + 프로세스 모니터 봇 단일 프로세스 실행
+두 봇을 하나의 이벤트 루프에서 돌리고, 공유 수집기로 /proc 을 틱당 한 번만 읽어
+양쪽 렌더러에 나눠 줍니다. (discord.py / psutil 을 한 번만 로드 → RSS 절약)
+
+실행: python host.py
+각 봇은 HOST_SYSTEM_BOT / HOST_PROC_BOT 환경변수(기본 1)로 개별 비활성화할 수 있습니다.
+"""
+
+import asyncio
+import logging
+import os
+
+import config
+import metrics
+import system_info
+from bot import HomeServerMonitorBot
+from collector import Collector
+from cpu_bot import CPU_BOT_TOKEN, CPU_CHANNEL_ID, REPORT_INTERVAL, ProcMonitorBot, collect_top_processes
+
+log = logging.getLogger("monitor-host")
+
+HOST_SYSTEM_BOT = os.getenv("HOST_SYSTEM_BOT", "1") == "1"
+HOST_PROC_BOT   = os.getenv("HOST_PROC_BOT", "1") == "1"
+
+
+def _build_bots(collector: Collector) -> list[tuple[object, str]]:
+    """활성화된 봇 생성 및 수집기 구독 등록 → [(봇, 토큰), ...]"""
+    bots = []
+    if HOST_SYSTEM_BOT:
+        if not config.DISCORD_BOT_TOKEN or config.MONITOR_CHANNEL_ID == 0:
+            log.error("DISCORD_BOT_TOKEN / MONITOR_CHANNEL_ID 가 없어 시스템 모니터 봇을 건너뜁니다.")
+        else:
+            bot = HomeServerMonitorBot(standalone=False)
+            collector.subscribe(bot.on_sample, cadence=bot.cadence)
+            bots.append((bot, config.DISCORD_BOT_TOKEN))
+    if HOST_PROC_BOT:
+        if not CPU_BOT_TOKEN or CPU_CHANNEL_ID == 0:
+            log.error("CPU_BOT_TOKEN / CPU_CHANNEL_ID 가 없어 프로세스 모니터 봇을 건너뜁니다.")
+        else:
+            bot = ProcMonitorBot(standalone=False)
+            every = max(1, round(REPORT_INTERVAL / collector.interval))
+            collector.subscribe(bot.on_sample, needs_procs=True, every=every, needs_stats=False)
+            bots.append((bot, CPU_BOT_TOKEN))
+    return bots
+
+
+async def run_host():
+    collector = Collector(config.COLLECT_GRID_SECONDS, collect_top_processes)
+    bots = _build_bots(collector)
+    if not bots:
+        log.error("실행할 봇이 없습니다.")
+        return
+
+    async def collect():
+        # 한 봇이라도 준비되면 수집 시작 (준비 안 된 봇은 publish 에서 건너뜀)
+        ready = [asyncio.ensure_future(bot.wait_until_ready()) for bot, _ in bots]
+        await asyncio.wait(ready, return_when=asyncio.FIRST_COMPLETED)
+        await collector.run()
+
+    if config.METRICS_PORT:
+        await metrics.start(config.METRICS_PORT, config.METRICS_HOST)
+    system_info.start_burst_sampler(config.BURST_SAMPLE_MS / 1000)
+    log.info(f"모니터 호스트 시작 | 봇 {len(bots)}개 | 수집 주기: {'/'.join(map(str, config.MONITOR_INTERVALS))}초")
+    try:
+        await asyncio.gather(collect(), *(bot.start(token) for bot, token in bots))
+    finally:
+        for bot, _ in bots:
+            if not bot.is_closed():
+                await bot.close()
+        system_info.stop_burst_sampler()
+        await metrics.stop()
+
+
+def main():
+    try:
+        asyncio.run(run_host())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
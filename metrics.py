@@ -0,0 +1,295 @@
+"""
+metrics.py — 봇 자체 상태 계측 (Prometheus 텍스트 형식 /metrics)
+모니터 봇이 오히려 서버 부하의 원인이 되지 않는지 확인하기 위한 내부 지표를 노출합니다.
+
+- 이벤트 루프 지연 (주기적으로 sleep 한 뒤 늦게 깨어난 시간)
+- 기본 executor 대기 작업 수 / 실행 중 스레드 수
+- 틱 단계별 소요 시간 (collect / render / discord)
+- Discord REST 요청 지연 히스토그램 (aiohttp trace, outbound.RateLimitTracker 에서 기록)
+- 스케줄러 지터 / 건너뛴 틱, 발신 큐 상태
+- 자기 프로세스 RSS / CPU 시간
+
+config.METRICS_PORT 가 0 이 아니면 127.0.0.1:<포트>/metrics 로 제공합니다.
+"""
+
+import asyncio
+import bisect
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+
+import psutil
+from aiohttp import web
+
+log = logging.getLogger("metrics")
+
+# 지연 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_INTERVAL = 0.5   # 이벤트 루프 지연 측정 주기 (초)
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = []
+    for n, v in zip(names, values):
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{n}="{v}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램 (executor 스레드에서도 기록 가능)"""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # 레이블 값 → [버킷별 개수..., +Inf 개수, 합계, 총 개수]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        i = bisect.bisect_left(self.buckets, value)   # value <= 경계인 첫 버킷
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [0] * (len(self.buckets) + 3)
+            s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(k, list(v)) for k, v in self._series.items()]
+        for values, s in series:
+            cum = 0
+            for bound, n in zip(self.buckets, s):
+                cum += n
+                le = _labels(self.labels, values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cum}")
+            le = _labels(self.labels, values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {s[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {s[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {s[-1]}")
+        return lines
+
+
+class _Gauge:
+    """스크레이프 시점에 fn() 으로 값을 읽는 지표 (단일 값 또는 [(레이블 값들, 값), ...])"""
+
+    def __init__(self, name: str, help: str, fn: Callable, labels: tuple[str, ...] = (),
+                 kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labels = labels
+        self.kind = kind
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        value = self.fn()
+        if self.labels:
+            for values, v in value:
+                lines.append(f"{self.name}{_labels(self.labels, values)} {v}")
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+
+# ══════════════════════════════════════════════════════════
+# 지표 정의
+# ══════════════════════════════════════════════════════════
+
+STAGE_SECONDS = Histogram(
+    "monitor_stage_seconds", "틱 단계별 소요 시간 (collect / render / discord)", ("bot", "stage"),
+)
+DISCORD_REQUEST_SECONDS = Histogram(
+    "monitor_discord_request_seconds", "Discord REST 요청 지연", ("method", "route", "status"),
+)
+LOOP_LAG_SECONDS = Histogram(
+    "monitor_event_loop_lag_seconds", "이벤트 루프 지연 (예정보다 늦게 깨어난 시간)", (),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+_outboxes: "weakref.WeakSet" = weakref.WeakSet()
+_tickers: "weakref.WeakSet" = weakref.WeakSet()
+_executor: "InstrumentedExecutor | None" = None
+_lag: "LoopLagMonitor | None" = None
+_runner: web.AppRunner | None = None
+_process = psutil.Process()
+
+
+def track_outbox(outbox):
+    """발신 큐(outbound.Outbox) 를 지표 대상으로 등록"""
+    _outboxes.add(outbox)
+
+
+def track_ticker(ticker):
+    """주기 실행기(scheduler.Ticker) 를 지표 대상으로 등록"""
+    _tickers.add(ticker)
+
+
+@contextmanager
+def timed(bot: str, stage: str):
+    """with 블록 소요 시간을 monitor_stage_seconds 에 기록"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t0, bot, stage)
+
+
+# ══════════════════════════════════════════════════════════
+# 이벤트 루프 / executor 계측
+# ══════════════════════════════════════════════════════════
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """대기 작업 수와 실행 중 스레드 수를 셀 수 있는 기본 executor"""
+
+    def __init__(self, max_workers: int | None = None):
+        super().__init__(max_workers=max_workers, thread_name_prefix="monitor-exec")
+        self.busy = 0
+        self._busy_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(self._call, fn, args, kwargs)
+
+    def _call(self, fn, args, kwargs):
+        with self._busy_lock:
+            self.busy += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._busy_lock:
+                self.busy -= 1
+
+    @property
+    def queue_depth(self) -> int:
+        return self._work_queue.qsize()
+
+    @property
+    def threads(self) -> int:
+        return len(self._threads)
+
+
+class LoopLagMonitor:
+    """interval 마다 sleep 하고 예정보다 늦게 깨어난 시간을 기록"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, loop.time() - t0 - self.interval)
+            self.max = max(self.max, self.last)
+            LOOP_LAG_SECONDS.observe(self.last)
+
+
+def _process_stats() -> tuple[int, float]:
+    """(RSS 바이트, 누적 CPU 시간 초)"""
+    with _process.oneshot():
+        rss = _process.memory_info().rss
+        cpu = _process.cpu_times()
+    return rss, cpu.user + cpu.system
+
+
+_GAUGES = [
+    _Gauge("monitor_event_loop_lag_last_seconds", "마지막 이벤트 루프 지연",
+           lambda: _lag.last if _lag else 0.0),
+    _Gauge("monitor_event_loop_lag_max_seconds", "시작 이후 최대 이벤트 루프 지연",
+           lambda: _lag.max if _lag else 0.0),
+    _Gauge("monitor_executor_queue_depth", "기본 executor 대기 작업 수",
+           lambda: _executor.queue_depth if _executor else 0),
+    _Gauge("monitor_executor_busy_threads", "기본 executor 실행 중 스레드 수",
+           lambda: _executor.busy if _executor else 0),
+    _Gauge("monitor_executor_threads", "기본 executor 생성된 스레드 수",
+           lambda: _executor.threads if _executor else 0),
+    _Gauge("monitor_outbox_queue_depth", "발신 큐 대기 요청 수",
+           lambda: [((o._name,), o.queue_depth) for o in list(_outboxes)], ("bot",)),
+    _Gauge("monitor_outbox_sent_total", "Discord 전송 성공 수",
+           lambda: [((o._name,), o.sent) for o in list(_outboxes)], ("bot",), "counter"),
+    _Gauge("monitor_outbox_errors_total", "Discord 전송 실패 수",
+           lambda: [((o._name,), o.errors) for o in list(_outboxes)], ("bot",), "counter"),
+    _Gauge("monitor_outbox_superseded_total", "전송 전에 교체된 상태 edit 수",
+           lambda: [((o._name,), o.superseded) for o in list(_outboxes)], ("bot",), "counter"),
+    _Gauge("monitor_outbox_unchanged_total", "내용이 같아 생략된 상태 edit 수",
+           lambda: [((o._name,), o.unchanged) for o in list(_outboxes)], ("bot",), "counter"),
+    _Gauge("monitor_ticks_total", "실행한 틱 수",
+           lambda: [((t.name,), t.ticks) for t in list(_tickers)], ("loop",), "counter"),
+    _Gauge("monitor_ticks_skipped_total", "주기 초과로 건너뛴 틱 수",
+           lambda: [((t.name,), t.skipped) for t in list(_tickers)], ("loop",), "counter"),
+    _Gauge("monitor_tick_jitter_p95_seconds", "최근 틱 지터 p95",
+           lambda: [((t.name,), t.stats()["jitter_ms_p95"] / 1000) for t in list(_tickers)], ("loop",)),
+    _Gauge("process_resident_memory_bytes", "상주 메모리 (RSS)", lambda: _process_stats()[0]),
+    _Gauge("process_cpu_seconds_total", "누적 CPU 시간 (user + system)",
+           lambda: _process_stats()[1], kind="counter"),
+]
+
+
+def render() -> str:
+    lines = []
+    for h in (STAGE_SECONDS, DISCORD_REQUEST_SECONDS, LOOP_LAG_SECONDS):
+        lines.extend(h.render())
+    for g in _GAUGES:
+        lines.extend(g.render())
+    return "\n".join(lines) + "\n"
+
+
+# ══════════════════════════════════════════════════════════
+# HTTP 서버
+# ══════════════════════════════════════════════════════════
+
+async def _handle(request: web.Request) -> web.Response:
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8",
+                        headers={"X-Prometheus-Format": "0.0.4"})
+
+
+async def start(port: int, host: str = "127.0.0.1"):
+    """기본 executor 교체 + 이벤트 루프 지연 측정 시작 + /metrics 서버 기동 (한 번만)"""
+    global _executor, _lag, _runner
+    if _runner is not None:
+        return
+    loop = asyncio.get_running_loop()
+    _executor = InstrumentedExecutor()
+    loop.set_default_executor(_executor)
+    _lag = LoopLagMonitor()
+    _lag.start()
+
+    app = web.Application()
+    app.router.add_get("/metrics", _handle)
+    _runner = web.AppRunner(app, access_log=None)
+    await _runner.setup()
+    await web.TCPSite(_runner, host, port).start()
+    log.info(f"자체 지표 제공: http://{host}:{port}/metrics")
+
+
+async def stop():
+    global _runner
+    if _lag is not None:
+        _lag.stop()
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
@@ -0,0 +1,395 @@
+"""
+outbound.py — Discord 발신 스케줄러
+수집 루프는 HTTP 를 기다리지 않고 Outbox 에 결과만 넘기며, 실제 전송은 Outbox 의
+작업 태스크가 담당합니다.
+
+- 상태 메시지 edit 은 최신 것만 유지 (latest-wins): 전송 대기 중 새 embed 가 오면 교체
+- 표시 내용(푸터 시각 제외)이 마지막 전송과 같으면 edit 생략, 단 heartbeat 초마다 한 번은 갱신
+- @here 알림은 상태 edit 보다 먼저 전송
+- 응답 헤더 (X-RateLimit-Remaining / Reset-After) 로 라우트별 버킷을 추적하여
+  남은 요청이 없으면 리셋까지 기다린 뒤 보냄 (429 를 받지 않도록)
+- 전송 경로는 봇 채널(ChannelTransport) 또는 웹훅(WebhookTransport, 게이트웨이 불필요)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import deque
+
+import aiohttp
+import discord
+
+import metrics
+from state import StateFile
+
+log = logging.getLogger("outbound")
+
+# /channels/{channel_id}/messages[/{message_id}]
+#  /webhooks/{webhook_id}/{token}[/messages/{message_id}]
+_ROUTE_RE = re.compile(
+    r"/(?:channels/(\d+)/messages(/\d+)?|webhooks/(\d+)/[^/]+(?:/messages(/\d+))?)$"
+)
+# 지연 지표 레이블용 (스노플레이크 ID 일반화, 웹훅 토큰 제거)
+_SNOWFLAKE_RE = re.compile(r"/\d{15,}")
+_WEBHOOK_TOKEN_RE = re.compile(r"(/webhooks/[^/]+)/[^/]+")
+
+
+def route_key(method: str, path: str) -> str | None:
+    """요청 경로 → 레이트 리밋 라우트 키 (메시지 ID / 웹훅 토큰은 버킷에 영향 없으므로 제거)"""
+    m = _ROUTE_RE.search(path)
+    if m is None:
+        return None
+    if m.group(1) is not None:
+        return f"{method} /channels/{m.group(1)}/messages" + ("/:id" if m.group(2) else "")
+    return f"{method} /webhooks/{m.group(3)}" + ("/messages/:id" if m.group(4) else "")
+
+
+def _metric_path(path: str) -> str:
+    return _SNOWFLAKE_RE.sub("/:id", _WEBHOOK_TOKEN_RE.sub(r"\1/:token", path))
+
+
+def embed_fingerprint(embed: discord.Embed) -> bytes:
+    """표시 정밀도로 포맷된 embed 내용의 지문 (매 틱 바뀌는 timestamp / footer 제외)"""
+    data = embed.to_dict()
+    data.pop("timestamp", None)
+    data.pop("footer", None)
+    return hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=16).digest()
+
+
+class MessageGone(Exception):
+    """수정하려던 메시지가 삭제됨"""
+
+
+class RateLimitTracker:
+    """라우트별 레이트 리밋 버킷 상태 (응답 헤더로 갱신)"""
+
+    def __init__(self):
+        # 라우트 키 → (남은 요청 수, 리셋 시각 monotonic)
+        self._routes: dict[str, tuple[int, float]] = {}
+        self.hits_429 = 0
+
+    def update(self, key: str, headers, status: int):
+        now = time.monotonic()
+        if status == 429:
+            self.hits_429 += 1
+            retry_after = float(headers.get("Retry-After", headers.get("X-RateLimit-Reset-After", 1)))
+            self._routes[key] = (0, now + retry_after)
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            self._routes[key] = (int(remaining), now + float(reset_after))
+
+    def delay(self, key: str) -> float:
+        """이 라우트로 지금 보내려면 기다려야 하는 시간 (초)"""
+        state = self._routes.get(key)
+        if state is None:
+            return 0.0
+        remaining, reset_at = state
+        if remaining > 0:
+            return 0.0
+        return max(0.0, reset_at - time.monotonic())
+
+    def consume(self, key: str):
+        """요청 직전 남은 횟수 차감 (응답 헤더가 오기 전 연속 요청 대비)"""
+        state = self._routes.get(key)
+        if state is not None and state[0] > 0:
+            self._routes[key] = (state[0] - 1, state[1])
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """discord.Client(http_trace=...) 에 넘겨 응답 헤더와 요청 지연을 관찰"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+
+        async def on_request_end(session, ctx, params):
+            path = params.url.path
+            key = route_key(params.method, path)
+            if key is not None:
+                self.update(key, params.response.headers, params.response.status)
+            started = getattr(ctx, "started", None)
+            if started is not None:
+                metrics.DISCORD_REQUEST_SECONDS.observe(
+                    time.perf_counter() - started, params.method,
+                    _metric_path(path), params.response.status,
+                )
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+
+class ChannelTransport:
+    """discord.py 채널로 메시지 전송/수정"""
+
+    def __init__(self, client: discord.Client, channel_id: int):
+        self._client = client
+        self._channel_id = channel_id
+        self.send_route = f"POST /channels/{channel_id}/messages"
+        self.edit_route = f"PATCH /channels/{channel_id}/messages/:id"
+
+        self.target = f"channel:{channel_id}"   # 상태 파일에 저장한 메시지 ID 의 소속
+
+    @property
+    def ready(self) -> bool:
+        return self._client.get_channel(self._channel_id) is not None
+
+    def message_ref(self, message_id: int):
+        """ID 만으로 edit 가능한 메시지 참조 (길드 캐시 / API 조회 불필요)"""
+        return self._client.get_partial_messageable(self._channel_id).get_partial_message(message_id)
+
+    async def send(self, content: str | None, embed: discord.Embed):
+        channel = self._client.get_channel(self._channel_id)
+        if channel is None:
+            raise LookupError(f"채널을 찾을 수 없습니다: {self._channel_id}")
+        return await channel.send(content=content, embed=embed)
+
+    async def edit(self, message, embed: discord.Embed):
+        try:
+            return await message.edit(embed=embed)
+        except discord.NotFound:
+            raise MessageGone()
+
+
+class WebhookError(Exception):
+    """웹훅 요청 실패 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, status: int, text: str):
+        super().__init__(f"{status} {text[:200]}")
+        self.status = status
+
+
+class WebhookMessage:
+    """웹훅으로 보낸 메시지 (edit 에 필요한 ID 만 유지)"""
+    __slots__ = ("id",)
+
+    def __init__(self, message_id: int):
+        self.id = message_id
+
+
+class WebhookTransport:
+    """Discord 웹훅으로 메시지 전송/수정 (게이트웨이 / 길드 캐시 없이 REST 만 사용)
+
+    session 은 keep-alive 연결을 재사용하도록 호출자가 하나를 만들어 공유하며,
+    레이트 리밋 헤더를 관찰하도록 limiter.trace_config() 를 trace_configs 로 넘겨야 한다.
+    """
+
+    MAX_ATTEMPTS = 3   # 429 응답 시 Retry-After 만큼 기다린 뒤 재시도하는 횟수
+    ready = True
+
+    def __init__(self, session: aiohttp.ClientSession, url: str, limiter: RateLimitTracker):
+        self._session = session
+        self._url = url.rstrip("/")
+        self.limiter = limiter
+        m = _ROUTE_RE.search(self._url)
+        if m is None or m.group(3) is None:
+            raise ValueError(f"웹훅 URL 형식이 아닙니다: {_metric_path(url)}")
+        self._webhook_id = m.group(3)
+        self.send_route = f"POST /webhooks/{self._webhook_id}"
+        self.edit_route = f"PATCH /webhooks/{self._webhook_id}/messages/:id"
+        self.target = f"webhook:{self._webhook_id}"
+
+    def message_ref(self, message_id: int) -> WebhookMessage:
+        return WebhookMessage(message_id)
+
+    async def _request(self, method: str, url: str, payload: dict) -> dict | None:
+        for _ in range(self.MAX_ATTEMPTS):
+            async with self._session.request(method, url, json=payload) as resp:
+                if resp.status == 429:
+                    retry_after = float(resp.headers.get("Retry-After", 1))
+                    await asyncio.sleep(retry_after)
+                    continue
+                if resp.status == 404:
+                    raise MessageGone()
+                if resp.status >= 400:
+                    raise WebhookError(resp.status, await resp.text())
+                if resp.status == 204:
+                    return None
+                return await resp.json(content_type=None)
+        raise WebhookError(429, "레이트 리밋 재시도 초과")
+
+    @staticmethod
+    def _payload(content: str | None, embed: discord.Embed) -> dict:
+        return {"content": content or "", "embeds": [embed.to_dict()]}
+
+    async def send(self, content: str | None, embed: discord.Embed) -> WebhookMessage:
+        # wait=true 여야 생성된 메시지(ID)를 응답으로 받음
+        try:
+            data = await self._request("POST", f"{self._url}?wait=true", self._payload(content, embed))
+        except MessageGone:
+            raise WebhookError(404, "웹훅이 삭제되었습니다")
+        return WebhookMessage(int(data["id"]))
+
+    async def edit(self, message, embed: discord.Embed):
+        await self._request("PATCH", f"{self._url}/messages/{message.id}", self._payload(None, embed))
+
+
+class Outbox:
+    """상태 메시지 1개 + 알림 큐를 관리하는 발신 작업자"""
+
+    def __init__(self, transport, limiter: RateLimitTracker | None = None, name: str = "outbox",
+                 heartbeat: float = 60.0, state: StateFile | None = None):
+        self._transport = transport
+        self._state = state                        # 상태 메시지 ID 저장 (재시작 시 바로 edit)
+        self._limiter = limiter or RateLimitTracker()
+        self._name = name
+        self._heartbeat = heartbeat                # 내용이 같아도 이 주기(초)마다 edit
+        self.message = None                       # 현재 상태 메시지 (edit 대상)
+        self._pending: discord.Embed | None = None
+        self._pending_fp: bytes | None = None
+        self._sent_fp: bytes | None = None        # 마지막으로 전송된 상태 embed 지문
+        self._sent_at = 0.0
+        self._alerts: deque[tuple[str | None, discord.Embed]] = deque()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        # 통계
+        self.superseded = 0    # 전송 전에 새 embed 로 교체된 상태 edit 수
+        self.unchanged = 0     # 표시 내용이 같아 생략된 상태 edit 수
+        self.sent = 0
+        self.errors = 0
+        self.limited_waits = 0
+        metrics.track_outbox(self)
+
+    @property
+    def ready(self) -> bool:
+        """전송 경로 사용 가능 여부 (봇 채널이 캐시에 있는지 등)"""
+        return self._transport.ready
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._alerts) + (1 if self._pending is not None else 0)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "superseded":  self.superseded,
+            "unchanged":   self.unchanged,
+            "sent":        self.sent,
+            "errors":      self.errors,
+            "limited":     self.limited_waits,
+            "429":         self._limiter.hits_429,
+        }
+
+    def restore_message(self) -> bool:
+        """상태 파일에 저장된 상태 메시지 ID 로 edit 대상 복원 (같은 채널 / 웹훅일 때만)"""
+        saved = self._state.get("status_message") if self._state is not None else None
+        if not saved or saved.get("target") != self._transport.target:
+            return False
+        self.message = self._transport.message_ref(int(saved["id"]))
+        return True
+
+    def adopt(self, message):
+        """기존 메시지를 상태 메시지로 사용 (채널 히스토리에서 찾은 경우 등) 하고 ID 저장"""
+        self.message = message
+        self._remember_message()
+
+    def _remember_message(self):
+        if self._state is None:
+            return
+        self._state.update(status_message={"target": self._transport.target, "id": str(self.message.id)})
+        try:
+            self._state.save()
+        except OSError as e:
+            log.warning(f"[{self._name}] 상태 메시지 ID 저장 실패: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def set_status(self, embed: discord.Embed):
+        """상태 embed 갱신 요청 (대기 중인 이전 embed 는 버림)
+
+        표시 내용이 마지막 전송과 같고 heartbeat 가 지나지 않았으면 아무것도 하지 않는다.
+        """
+        fp = embed_fingerprint(embed)
+        if (
+            self._pending is None
+            and self.message is not None
+            and fp == self._sent_fp
+            and time.monotonic() - self._sent_at < self._heartbeat
+        ):
+            self.unchanged += 1
+            return
+        if self._pending is not None:
+            self.superseded += 1
+        self._pending, self._pending_fp = embed, fp
+        self._wake.set()
+
+    def post(self, embed: discord.Embed, content: str | None = None):
+        """알림 전송 요청 (상태 edit 보다 우선)"""
+        self._alerts.append((content, embed))
+        self._wake.set()
+
+    async def _sleep(self, delay: float):
+        """delay 동안 대기하되 새 요청이 들어오면 즉시 깨어남"""
+        self.limited_waits += 1
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._alerts or self._pending is not None:
+                if self._alerts:
+                    route = self._transport.send_route
+                    delay = self._limiter.delay(route)
+                    if delay > 0:
+                        await self._sleep(delay)
+                        continue
+                    content, embed = self._alerts.popleft()
+                    self._limiter.consume(route)
+                    await self._guarded(self._transport.send(content, embed))
+                    continue
+
+                route = self._transport.send_route if self.message is None else self._transport.edit_route
+                delay = self._limiter.delay(route)
+                if delay > 0:
+                    # 기다리는 동안 들어온 새 상태가 _pending 을 교체함
+                    await self._sleep(delay)
+                    continue
+                embed, fp = self._pending, self._pending_fp
+                self._pending = self._pending_fp = None
+                self._limiter.consume(route)
+                if await self._guarded(self._deliver_status(embed)):
+                    self._sent_fp, self._sent_at = fp, time.monotonic()
+
+    async def _deliver_status(self, embed: discord.Embed):
+        if self.message is not None:
+            try:
+                await self._transport.edit(self.message, embed)
+                return
+            except MessageGone:
+                # 메시지가 삭제된 경우 새로 전송
+                pass
+        self.message = await self._transport.send(None, embed)
+        self._remember_message()
+
+    async def _guarded(self, coro) -> bool:
+        try:
+            with metrics.timed(self._name, "discord"):
+                await coro
+            self.sent += 1
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors += 1
+            log.error(f"[{self._name}] Discord 전송 오류: {e}")
+            return False
@@ -0,0 +1,38 @@
+"""
+persist.py — 로컬 상태 파일 저장 헬퍼
+임시 파일에 쓴 뒤 os.replace 로 교체하여, 쓰는 도중 종료되어도 파일이 깨지지 않게 합니다.
+"""
+
+import json
+import logging
+import os
+
+log = logging.getLogger("persist")
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """path 를 data 로 원자적으로 교체 (같은 디렉터리의 임시 파일 → fsync → rename)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def atomic_write_json(path: str, obj):
+    atomic_write_bytes(path, json.dumps(obj, separators=(",", ":")).encode())
+
+
+def load_json(path: str, default=None):
+    """JSON 파일 읽기 (없거나 손상되었으면 default)"""
+    try:
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        log.warning(f"상태 파일을 읽을 수 없습니다 ({path}): {e}")
+        return default
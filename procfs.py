@@ -0,0 +1,356 @@
+"""
+procfs.py — 리눅스 /proc 직접 수집 엔진
+/proc/stat, /proc/meminfo, /proc/net/dev, /proc/diskstats, /proc/loadavg, /proc/pressure/* 를
+한 번 열어 두고 매 틱 pread 로 재사용 버퍼에 다시 읽어 SystemStats 에 필요한 필드만 파싱합니다.
+(psutil 호출/namedtuple 생성 없음)
+마운트 목록은 /proc/self/mounts 가 바뀌었을 때만(poll 로 확인) 다시 읽습니다.
+
+리눅스가 아니거나 /proc 을 읽을 수 없으면 system_info 가 psutil 경로로 대체합니다.
+"""
+
+import os
+import re
+import select
+
+
+class ProcFile:
+    """열린 채로 유지되는 /proc 파일 (pread 로 offset 0 부터 재읽기)
+
+    /proc 의 seq_file 은 offset 0 에서 읽을 때마다 내용을 새로 생성하므로
+    파일을 다시 열 필요가 없다. 버퍼는 내용이 넘치면 두 배로 키워 재사용한다.
+    """
+
+    __slots__ = ("path", "_fd", "_buf")
+
+    def __init__(self, path: str, bufsize: int = 4096):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buf = bytearray(bufsize)
+
+    def read(self) -> bytes:
+        while True:
+            n = os.preadv(self._fd, [self._buf], 0)
+            if n < len(self._buf):
+                return bytes(memoryview(self._buf)[:n])
+            self._buf = bytearray(len(self._buf) * 2)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def head(self) -> bytes:
+        """버퍼 크기만큼 앞부분만 읽기 (버퍼를 키우지 않음 — 첫 줄만 필요한 경우)"""
+        n = os.preadv(self._fd, [self._buf], 0)
+        return bytes(memoryview(self._buf)[:n])
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def parse_cpu_times(data: bytes) -> list[tuple[int, int]]:
+    """/proc/stat → [(busy, total), ...] — 0번은 전체, 이후 코어 순서"""
+    snap = []
+    for line in data.split(b"\n"):
+        if not line.startswith(b"cpu"):
+            break
+        # user nice system idle iowait irq softirq steal (guest 는 user 에 포함됨)
+        fields = [int(x) for x in line.split()[1:9]]
+        total = sum(fields)
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        snap.append((total - idle, total))
+    return snap
+
+
+def parse_cpu_wait(data: bytes) -> tuple[int, int]:
+    """/proc/stat 전체 CPU 줄 → (iowait, steal) 누적 틱 (없는 필드는 0)"""
+    fields = data[:data.find(b"\n")].split()
+    iowait = int(fields[5]) if len(fields) > 5 else 0
+    steal = int(fields[8]) if len(fields) > 8 else 0
+    return iowait, steal
+
+
+def parse_loadavg(data: bytes) -> tuple[float, float, float]:
+    """/proc/loadavg → (1분, 5분, 15분) 부하 평균"""
+    fields = data.split()
+    return float(fields[0]), float(fields[1]), float(fields[2])
+
+
+def parse_pressure(data: bytes) -> tuple[float, int, float | None, int | None]:
+    """/proc/pressure/<자원> → (some avg10 %, some 누적 µs, full avg10 %, full 누적 µs)
+
+    full 줄이 없는 커널(5.13 이전 cpu)이면 full 값은 None.
+    """
+    f = data.split()
+    # some avg10=.. avg60=.. avg300=.. total=.. [full avg10=.. avg60=.. avg300=.. total=..]
+    some = float(f[1][6:]), int(f[4][6:])
+    if len(f) >= 10:
+        return some[0], some[1], float(f[6][6:]), int(f[9][6:])
+    return some[0], some[1], None, None
+
+
+def _meminfo_field(data: bytes, key: bytes) -> int:
+    """meminfo 에서 key 한 줄만 찾아 바이트 단위로 반환 (없으면 -1)"""
+    i = data.find(key)
+    if i < 0:
+        return -1
+    i += len(key)
+    j = data.find(b"\n", i)
+    return int(data[i:j].split()[0]) * 1024
+
+
+# 필요한 필드만 (전체 줄 파싱 없이 find 로 바로 접근)
+_MEMINFO_KEYS = {
+    "total":      b"MemTotal:",
+    "free":       b"MemFree:",
+    "available":  b"MemAvailable:",
+    "buffers":    b"Buffers:",
+    "cached":     b"\nCached:",
+    "reclaim":    b"SReclaimable:",
+    "swap_total": b"SwapTotal:",
+    "swap_free":  b"SwapFree:",
+}
+
+
+def parse_meminfo(data: bytes) -> dict[str, int]:
+    """/proc/meminfo → psutil 과 같은 방식으로 계산한 메모리/스왑 값 (바이트)"""
+    m = {k: _meminfo_field(data, key) for k, key in _MEMINFO_KEYS.items()}
+    total = m["total"]
+    available = m["available"]
+    if available < 0:
+        # 구형 커널 (MemAvailable 없음) — psutil 과 동일한 근사
+        cached = max(m["cached"], 0) + max(m["reclaim"], 0)
+        available = m["free"] + max(m["buffers"], 0) + cached
+    swap_total = max(m["swap_total"], 0)
+    swap_used = swap_total - max(m["swap_free"], 0)
+    return {
+        "mem_total":  total,
+        "mem_used":   total - available,
+        "swap_total": swap_total,
+        "swap_used":  swap_used,
+    }
+
+
+def parse_net_dev(data: bytes) -> tuple[int, int]:
+    """/proc/net/dev → 모든 인터페이스 합계 (수신 바이트, 송신 바이트)
+
+    psutil.net_io_counters() 와 같이 lo 를 포함한다.
+    """
+    recv = sent = 0
+    for line in data.split(b"\n")[2:]:
+        _, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        fields = rest.split()
+        recv += int(fields[0])
+        sent += int(fields[8])
+    return recv, sent
+
+
+def parse_net_ifaces(data: bytes) -> dict[str, tuple[int, int]]:
+    """/proc/net/dev → {인터페이스: (수신 바이트, 송신 바이트)}"""
+    ifaces = {}
+    for line in data.split(b"\n")[2:]:
+        name, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        fields = rest.split()
+        ifaces[name.strip().decode()] = (int(fields[0]), int(fields[8]))
+    return ifaces
+
+
+# 가상 블록 장치 (루프백 이미지, 램디스크, 광학 / 플로피)
+_VIRTUAL_DISKS = (b"loop", b"ram", b"zram", b"sr", b"fd")
+_PARTITION_SUFFIX = re.compile(rb"p?\d+$")
+
+
+def is_partition(name: bytes, names) -> bool:
+    """다른 장치 이름 + (p)숫자 형태면 파티션 (sda1 ← sda, nvme0n1p2 ← nvme0n1, mmcblk0p1 ← mmcblk0)"""
+    m = _PARTITION_SUFFIX.search(name)
+    if m is None or m.start() == 0:
+        return False
+    # "p" 가 장치 이름의 일부인 경우도 확인 (sdp1 ← sdp)
+    return name[:m.start()] in names or name.rstrip(b"0123456789") in names
+
+
+def is_physical_disk(name: bytes, names) -> bool:
+    """파티션 / 가상 장치가 아닌 블록 장치인지"""
+    return not name.startswith(_VIRTUAL_DISKS) and not is_partition(name, names)
+
+
+def parse_diskstats(data: bytes, disks: dict[bytes, bool]) -> dict[str, tuple[int, int, int, int, int]]:
+    """/proc/diskstats → {장치: (읽기 완료 수, 읽은 섹터, 쓰기 완료 수, 쓴 섹터, I/O 처리 시간 ms)}
+
+    disks: 장치 이름 → 물리 디스크 여부 캐시 (파티션 / 가상 장치 제외, 처음 보는 이름일 때만 판정)
+    섹터는 커널 규약상 항상 512 바이트.
+    """
+    lines = [line.split() for line in data.split(b"\n")]
+    lines = [f for f in lines if len(f) >= 13]
+    if any(f[2] not in disks for f in lines):
+        names = {f[2] for f in lines}
+        for f in lines:
+            name = f[2]
+            if name not in disks:
+                disks[name] = is_physical_disk(name, names)
+    return {
+        f[2].decode(): (int(f[3]), int(f[5]), int(f[7]), int(f[9]), int(f[12]))
+        for f in lines if disks[f[2]]
+    }
+
+
+def _unescape_mount(field: bytes) -> str:
+    """mounts 의 8진 이스케이프 (공백 → \\040 등) 복원"""
+    return re.sub(rb"\\([0-7]{3})", lambda m: bytes([int(m.group(1), 8)]), field).decode(errors="replace")
+
+
+def parse_mounts(data: bytes) -> list[tuple[str, str, str]]:
+    """/proc/self/mounts → 실제 블록 장치 마운트 [(장치, 마운트 지점, 파일시스템)]
+
+    /dev/ 장치만 (tmpfs / proc / overlay / 네트워크 마운트 제외, 루프 장치 제외),
+    같은 장치의 bind 마운트는 처음 나온 마운트 지점만.
+    """
+    mounts = []
+    seen = set()
+    for line in data.split(b"\n"):
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        dev, mountpoint, fstype = fields[0], fields[1], fields[2]
+        if not dev.startswith(b"/dev/") or dev.startswith(b"/dev/loop") or dev in seen:
+            continue
+        seen.add(dev)
+        mounts.append((_unescape_mount(dev), _unescape_mount(mountpoint), fstype.decode()))
+    return mounts
+
+
+class MountTable:
+    """마운트 목록 캐시 — 마운트 / 해제가 있을 때만 다시 읽음
+
+    커널은 마운트 테이블이 바뀌면 열려 있는 /proc/self/mounts 에 POLLPRI 를 알리므로
+    매 틱 poll(0) 한 번으로 변경 여부만 확인한다.
+    """
+
+    def __init__(self, path: str):
+        self._file = ProcFile(path, 16384)
+        self._poll = select.poll()
+        self._poll.register(self._file.fileno(), select.POLLPRI)
+        self.mounts = parse_mounts(self._file.read())
+        self.reloads = 0
+
+    def refresh(self) -> bool:
+        """바뀌었으면 다시 읽고 True"""
+        if not self._poll.poll(0):
+            return False
+        self.mounts = parse_mounts(self._file.read())
+        self.reloads += 1
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+def usage_percent(used: float, total: float) -> float:
+    """psutil 과 같은 반올림 (소수 첫째 자리)"""
+    return round(used / total * 100, 1) if total > 0 else 0.0
+
+
+PSI_RESOURCES = ("cpu", "memory", "io")
+
+
+class ProcCollector:
+    """SystemStats 수집용 /proc 파일 묶음 (프로세스 수명 동안 열어 둠)"""
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+        self.stat = ProcFile(os.path.join(root, "stat"))
+        self.meminfo = ProcFile(os.path.join(root, "meminfo"))
+        self.net_dev = ProcFile(os.path.join(root, "net", "dev"))
+        # 장치별 I/O / 마운트 목록은 없어도 기본 지표는 수집 (컨테이너 등)
+        self.diskstats = self._open_optional(os.path.join(root, "diskstats"))
+        self._disks: dict[bytes, bool] = {}
+        try:
+            self.mount_table: MountTable | None = MountTable(os.path.join(root, "self", "mounts"))
+        except OSError:
+            self.mount_table = None
+        self.loadavg = self._open_optional(os.path.join(root, "loadavg"))
+        # PSI — CONFIG_PSI 가 없거나 psi=0 으로 부팅한 커널에서는 열기 / 읽기가 실패
+        self.pressure: dict[str, ProcFile] = {}
+        for resource in PSI_RESOURCES:
+            f = self._open_optional(os.path.join(root, "pressure", resource))
+            if f is not None:
+                self.pressure[resource] = f
+        self.boot_time = self._read_boot_time()
+
+    @staticmethod
+    def _open_optional(path: str) -> ProcFile | None:
+        try:
+            return ProcFile(path)
+        except OSError:
+            return None
+
+    def _read_boot_time(self) -> float:
+        data = self.stat.read()
+        i = data.find(b"\nbtime ")
+        if i >= 0:
+            return float(data[i + 7:data.find(b"\n", i + 7)])
+        # btime 이 없는 경우 /proc/uptime 으로 역산
+        import time
+        with open(os.path.join(self.root, "uptime"), "rb") as f:
+            return time.time() - float(f.read().split()[0])
+
+    def cpu_times(self) -> list[tuple[int, int]]:
+        return parse_cpu_times(self.stat.read())
+
+    def cpu_stat(self) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+        """/proc/stat 한 번 읽기 → (cpu_times, (iowait, steal))"""
+        data = self.stat.read()
+        return parse_cpu_times(data), parse_cpu_wait(data)
+
+    def memory(self) -> dict[str, int]:
+        return parse_meminfo(self.meminfo.read())
+
+    def net_bytes(self) -> tuple[int, int]:
+        return parse_net_dev(self.net_dev.read())
+
+    def net_ifaces(self) -> dict[str, tuple[int, int]]:
+        return parse_net_ifaces(self.net_dev.read())
+
+    def disk_io(self) -> dict[str, tuple[int, int, int, int, int]]:
+        if self.diskstats is None:
+            return {}
+        return parse_diskstats(self.diskstats.read(), self._disks)
+
+    def load(self) -> tuple[float, float, float] | None:
+        if self.loadavg is None:
+            return None
+        return parse_loadavg(self.loadavg.read())
+
+    def pressure_stats(self) -> dict[str, tuple[float, int, float | None, int | None]]:
+        """{자원: parse_pressure 결과} — 읽기가 실패한 자원은 이후 건너뜀"""
+        result = {}
+        for resource, f in list(self.pressure.items()):
+            try:
+                result[resource] = parse_pressure(f.read())
+            except (OSError, ValueError, IndexError):
+                f.close()
+                del self.pressure[resource]
+        return result
+
+    def mounts(self) -> list[tuple[str, str, str]]:
+        """실제 블록 장치 마운트 목록 (마운트 테이블이 바뀐 경우에만 다시 읽음)"""
+        if self.mount_table is None:
+            return []
+        self.mount_table.refresh()
+        return self.mount_table.mounts
+
+    def close(self):
+        for f in (self.stat, self.meminfo, self.net_dev, self.diskstats, self.mount_table,
+                  self.loadavg, *self.pressure.values()):
+            if f is not None:
+                f.close()
@@ -0,0 +1,149 @@
+"""
+proctable.py — 증분 프로세스 테이블 (리눅스 /proc 직접 읽기)
+(pid, 시작 시각) 을 키로 프로세스 항목을 유지하며, 매 틱 /proc/[pid]/stat 과 statm 만 읽어
+CPU 틱 차분과 RSS 를 갱신합니다.
+
+- 프로세스 이름(comm)과 사용자 이름은 PID 가 재사용되기 전까지 캐시
+- uid → 사용자 이름 조회도 캐시 (pwd 조회는 uid 당 한 번)
+- 상위 N 개 선택은 전체 정렬 대신 heapq.nlargest
+- cgroups=True 이면 새 프로세스마다 cgroup v2 경로도 한 번 읽어 둠 (유닛별 합산용)
+"""
+
+import heapq
+import os
+import pwd
+import time
+
+from cgroups import read_proc_cgroup
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class ProcEntry:
+    __slots__ = ("pid", "start", "name", "uid", "username", "cgroup", "ticks", "rss",
+                 "cpu_percent", "memory_percent", "seen")
+
+    def __init__(self, pid: int, start: int, name: str, uid: int, username: str):
+        self.pid = pid
+        self.start = start
+        self.name = name
+        self.uid = uid
+        self.username = username
+        self.cgroup = ""        # cgroup v2 경로 (cgroups=True 일 때만)
+        self.ticks = 0          # utime + stime 누적 (clock tick)
+        self.rss = 0            # 상주 메모리 (바이트)
+        self.cpu_percent = 0.0  # 직전 스캔 이후 사용률 (코어 1개 = 100%)
+        self.memory_percent = 0.0
+        self.seen = 0           # 마지막으로 관측된 스캔 번호
+
+    def as_dict(self) -> dict:
+        return {
+            "pid":            self.pid,
+            "name":           self.name,
+            "username":       self.username,
+            "cpu_percent":    self.cpu_percent,
+            "memory_percent": self.memory_percent,
+        }
+
+
+class ProcessTable:
+    """/proc 스캔 결과를 틱 사이에 유지하는 프로세스 테이블"""
+
+    def __init__(self, root: str = "/proc", cgroups: bool = False):
+        self.root = root
+        self._cgroups = cgroups
+        self._entries: dict[int, ProcEntry] = {}
+        self._users: dict[int, str] = {}
+        self._scan_no = 0
+        self._last_scan = 0.0
+        self._mem_total = self._read_mem_total()
+
+    def _read_mem_total(self) -> int:
+        with open(os.path.join(self.root, "meminfo"), "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def _username(self, uid: int) -> str:
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        return name
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def scan(self) -> list[ProcEntry]:
+        """모든 프로세스 갱신 후 살아 있는 항목 목록 반환"""
+        now = time.monotonic()
+        elapsed = now - self._last_scan if self._last_scan else 0.0
+        self._last_scan = now
+        self._scan_no += 1
+        scan_no = self._scan_no
+        entries = self._entries
+        root = self.root
+        mem_total = self._mem_total
+        # 1 clock tick 이 사용률 몇 % 에 해당하는지
+        tick_pct = 100.0 / (_CLK_TCK * elapsed) if elapsed > 0 else 0.0
+
+        for name in os.listdir(root):
+            if not name.isdigit():
+                continue
+            pid = int(name)
+            base = f"{root}/{name}"
+            try:
+                with open(f"{base}/stat", "rb") as f:
+                    stat = f.read()
+                with open(f"{base}/statm", "rb") as f:
+                    statm = f.read()
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                continue
+
+            # comm 에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 필드로 사용
+            rparen = stat.rfind(b")")
+            fields = stat[rparen + 2:].split()
+            ticks = int(fields[11]) + int(fields[12])   # utime + stime
+            start = int(fields[19])                     # starttime
+
+            entry = entries.get(pid)
+            if entry is None or entry.start != start:
+                # 새 프로세스 또는 PID 재사용 → 이름/사용자 다시 조회
+                try:
+                    uid = os.stat(base).st_uid
+                except OSError:
+                    continue
+                comm = stat[stat.find(b"(") + 1:rparen].decode(errors="replace")
+                entry = ProcEntry(pid, start, comm, uid, self._username(uid))
+                if self._cgroups:
+                    entry.cgroup = read_proc_cgroup(base)
+                entry.ticks = ticks
+                entries[pid] = entry
+            else:
+                entry.cpu_percent = (ticks - entry.ticks) * tick_pct
+                entry.ticks = ticks
+
+            entry.rss = int(statm.split()[1]) * _PAGE_SIZE
+            entry.memory_percent = entry.rss / mem_total * 100 if mem_total else 0.0
+            entry.seen = scan_no
+
+        # 사라진 프로세스 제거
+        for pid in [pid for pid, e in entries.items() if e.seen != scan_no]:
+            del entries[pid]
+        return list(entries.values())
+
+    def top(self, n: int) -> tuple[list[ProcEntry], list[ProcEntry]]:
+        """스캔 후 (CPU 상위 n, 메모리 상위 n) — 힙 선택 O(P log n)"""
+        procs = self.scan()
+        top_cpu = heapq.nlargest(n, procs, key=lambda e: e.cpu_percent)
+        top_mem = heapq.nlargest(n, procs, key=lambda e: e.rss)
+        return top_cpu, top_mem
+
+    @property
+    def mem_total(self) -> int:
+        return self._mem_total
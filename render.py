@@ -0,0 +1,32 @@
+"""
+render.py — embed 표시용 텍스트 도우미 (막대 / 스파크라인)
+수집 모듈을 불러오지 않으므로 렌더만 하는 모듈에서 가져가도 /proc 수집기가 열리지 않습니다.
+"""
+
+
+def make_bar(percent: float, width: int = 10) -> str:
+    """퍼센트를 시각적 막대로 변환 (유니코드 블록 문자 사용)"""
+    filled = round(percent / 100 * width)
+    filled = max(0, min(width, filled))
+    return "█" * filled + "░" * (width - filled)
+
+
+_SPARK = "▁▂▃▄▅▆▇█"
+
+
+def make_sparkline(values: list[float | None], lo: float | None = None, hi: float | None = None) -> str:
+    """값 목록을 한 줄 막대 그래프로 변환 (make_bar 와 같은 유니코드 블록 문자, 값이 없는 칸은 공백)
+
+    lo / hi 를 생략하면 값의 최솟값 / 최댓값 기준 (퍼센트 지표는 0 / 100 을 넘기면 칸끼리 비교 가능)
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return " " * len(values)
+    lo = min(present) if lo is None else lo
+    hi = max(present) if hi is None else hi
+    span = hi - lo
+    top = len(_SPARK) - 1
+    return "".join(
+        " " if v is None else _SPARK[max(0, min(top, round((v - lo) / span * top))) if span > 0 else 0]
+        for v in values
+    )
@@ -0,0 +1,227 @@
+"""
+rolling.py — 다중 구간 이동 통계 (링 버퍼)
+모든 지표를 하나의 배열 기반 링 버퍼에 저장하고, 구간(1분/10분/1시간/24시간 등)별로
+누적합·최솟값·최댓값·p95 를 샘플 추가 시점에 갱신합니다.
+
+샘플마다 가중치(그 샘플이 대표하는 시간, 초)를 함께 저장하여 시간 가중 통계를 냅니다.
+수집 주기가 바뀌어도(적응형 주기) 느린 구간의 샘플 하나가 빠른 구간의 샘플 하나와
+같은 비중이 되지 않도록 하기 위함입니다.
+
+- 평균: 구간별 (값 × 가중치) 누적합 / 가중치 합 → O(1)
+- 최솟값/최댓값: 구간별 단조 덱 → 분할 상환 O(1)
+- p95: 구간별 고정 버킷 가중치 히스토그램 → 추가 / 제거 O(1), 조회는 직전 p95 버킷에서 이동한 칸 수만큼
+  0~100 은 0.1 단위 선형 버킷 (% 지표), 100 이상은 1% 간격 로그 버킷 (KB/s 등)
+  → 구간 길이(24시간 = 샘플 8640개)와 무관하게 샘플당 비용 일정, 오차는 버킷 폭 이내
+"""
+
+import math
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+
+# p95 히스토그램 버킷 — [0, LINEAR_MAX) 는 LINEAR_STEP 폭, 그 위는 LOG_GROWTH 배씩 (LOG_MAX 이상은 마지막 버킷)
+LINEAR_MAX = 100.0
+LINEAR_STEP = 0.1
+LOG_GROWTH = 1.01
+LOG_MAX = 1e7
+_LINEAR_BUCKETS = round(LINEAR_MAX / LINEAR_STEP)
+_LOG_SCALE = 1 / math.log(LOG_GROWTH)
+BUCKETS = _LINEAR_BUCKETS + math.ceil(math.log(LOG_MAX / LINEAR_MAX) * _LOG_SCALE) + 1
+
+
+def _bucket(v: float) -> int:
+    if v < LINEAR_MAX:
+        return int(v / LINEAR_STEP) if v > 0 else 0
+    return min(BUCKETS - 1, _LINEAR_BUCKETS + int(math.log(v / LINEAR_MAX) * _LOG_SCALE))
+
+
+def _bucket_value(b: int) -> float:
+    """버킷 대푯값 (가운데)"""
+    if b < _LINEAR_BUCKETS:
+        return (b + 0.5) * LINEAR_STEP
+    return LINEAR_MAX * LOG_GROWTH ** (b - _LINEAR_BUCKETS + 0.5)
+
+
+@dataclass
+class WindowSummary:
+    mean: float
+    min: float
+    max: float
+    p95: float
+    count: int
+
+
+_EMPTY = WindowSummary(0.0, 0.0, 0.0, 0.0, 0)
+
+
+class _WindowState:
+    """한 구간 × 한 지표의 집계 상태"""
+
+    __slots__ = ("total", "mins", "maxs", "hist", "p95_bucket", "above")
+
+    def __init__(self):
+        self.total = 0.0                  # Σ 값 × 가중치
+        self.mins: deque[int] = deque()   # 값이 증가하는 인덱스 덱 (앞이 최솟값)
+        self.maxs: deque[int] = deque()   # 값이 감소하는 인덱스 덱 (앞이 최댓값)
+        # 버킷별 가중치 합 + 직전 p95 버킷과 그보다 위 버킷들의 가중치 합 (조회 시 그 자리에서 조금씩 이동)
+        self.hist = array("d", bytes(8 * BUCKETS))
+        self.p95_bucket = 0
+        self.above = 0.0
+
+
+class RollingWindows:
+    """여러 지표 × 여러 시간 구간 이동 통계
+
+    metrics  : 지표 이름 (push 시 같은 순서/키로 전달)
+    windows  : {구간 이름: 길이(초)}
+    capacity : 링 버퍼 크기 — 가장 긴 구간 ÷ 샘플 주기 이상이어야 함
+    """
+
+    def __init__(self, metrics: tuple[str, ...], windows: dict[str, float], capacity: int):
+        self.metrics = tuple(metrics)
+        self.windows = dict(windows)
+        self.capacity = capacity
+        self._ts = array("d", bytes(8 * capacity))
+        self._w = array("d", bytes(8 * capacity))
+        self._vals = [array("d", bytes(8 * capacity)) for _ in self.metrics]
+        self._n = 0  # 지금까지 추가된 샘플 수 (절대 인덱스)
+        # 구간별 가장 오래된 샘플의 절대 인덱스
+        self._start = {w: 0 for w in self.windows}
+        self._state = {
+            w: [_WindowState() for _ in self.metrics] for w in self.windows
+        }
+        # 구간별 가중치 합
+        self._weight = {w: 0.0 for w in self.windows}
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    def push(self, values: dict[str, float], ts: float | None = None, weight: float = 1.0):
+        """샘플 하나 추가
+
+        ts     : 초 단위 단조 시각 (생략 시 time.monotonic())
+        weight : 샘플이 대표하는 시간 (초) — 평균 / p95 의 가중치
+        """
+        if ts is None:
+            ts = time.monotonic()
+        weight = float(weight)
+        if not weight > 0:
+            raise ValueError(f"가중치는 양수여야 합니다: {weight}")
+        idx = self._n
+        pos = idx % self.capacity
+        self._ts[pos] = ts
+        self._w[pos] = weight
+        row = [float(values[m]) for m in self.metrics]
+        for m, v in enumerate(row):
+            self._vals[m][pos] = v
+        self._n = idx + 1
+        buckets = [_bucket(v) for v in row]
+
+        for w, length in self.windows.items():
+            states = self._state[w]
+            self._weight[w] += weight
+            for m, v in enumerate(row):
+                st = states[m]
+                st.total += v * weight
+                vals = self._vals[m]
+                cap = self.capacity
+                while st.mins and vals[st.mins[-1] % cap] >= v:
+                    st.mins.pop()
+                st.mins.append(idx)
+                while st.maxs and vals[st.maxs[-1] % cap] <= v:
+                    st.maxs.pop()
+                st.maxs.append(idx)
+                b = buckets[m]
+                st.hist[b] += weight
+                if b > st.p95_bucket:
+                    st.above += weight
+            self._evict(w, ts - length)
+
+        # 누적합 부동소수 오차 보정 (버퍼 한 바퀴마다 재계산, 분할 상환 O(1))
+        if self._n % self.capacity == 0:
+            self._resync()
+
+    def _evict(self, window: str, cutoff: float):
+        """cutoff 이하 시각의 샘플과 링 버퍼에서 밀려날 샘플을 구간에서 제거"""
+        start = self._start[window]
+        floor = self._n - self.capacity
+        states = self._state[window]
+        cap = self.capacity
+        while start < self._n and (start <= floor or self._ts[start % cap] <= cutoff):
+            pos = start % cap
+            weight = self._w[pos]
+            self._weight[window] -= weight
+            for m, st in enumerate(states):
+                v = self._vals[m][pos]
+                st.total -= v * weight
+                b = _bucket(v)
+                st.hist[b] -= weight
+                if b > st.p95_bucket:
+                    st.above -= weight
+                if st.mins and st.mins[0] == start:
+                    st.mins.popleft()
+                if st.maxs and st.maxs[0] == start:
+                    st.maxs.popleft()
+            start += 1
+        self._start[window] = start
+
+    def _resync(self):
+        """구간 안 샘플로 누적합을 다시 계산 (히스토그램은 같은 가중치를 더하고 빼므로 오차가 쌓이지 않음)"""
+        cap = self.capacity
+        for w, states in self._state.items():
+            live = [i % cap for i in range(self._start[w], self._n)]
+            weights = [self._w[pos] for pos in live]
+            self._weight[w] = math.fsum(weights)
+            for m, st in enumerate(states):
+                vals = self._vals[m]
+                st.total = math.fsum(vals[pos] * x for pos, x in zip(live, weights))
+                st.above = math.fsum(st.hist[st.p95_bucket + 1:])
+
+    def mean(self, metric: str, window: str) -> float:
+        weight = self._weight[window]
+        if self._n - self._start[window] <= 0 or weight <= 0:
+            return 0.0
+        return self._state[window][self.metrics.index(metric)].total / weight
+
+    def _p95(self, st: _WindowState, window: str) -> float:
+        """시간 가중 nearest-rank p95 — 위쪽 가중치 합이 전체의 5% 를 처음 넘는 버킷
+
+        직전 조회의 버킷에서 조건을 만족할 때까지 위 / 아래로 이동 (분포가 천천히 바뀌므로 보통 몇 칸)
+        """
+        line = 0.05 * self._weight[window]
+        hist = st.hist
+        b, above = st.p95_bucket, st.above
+        while above > line and b < BUCKETS - 1:
+            b += 1
+            above -= hist[b]
+        while b > 0 and above + hist[b] <= line:
+            above += hist[b]
+            b -= 1
+        st.p95_bucket, st.above = b, above
+        return _bucket_value(b)
+
+    def summary(self, metric: str, window: str) -> WindowSummary:
+        m = self.metrics.index(metric)
+        st = self._state[window][m]
+        count = self._n - self._start[window]
+        if count <= 0:
+            return _EMPTY
+        vals = self._vals[m]
+        cap = self.capacity
+        lo, hi = vals[st.mins[0] % cap], vals[st.maxs[0] % cap]
+        return WindowSummary(
+            mean=st.total / self._weight[window],
+            min=lo,
+            max=hi,
+            # 버킷 대푯값이 실제 범위를 벗어나지 않게 (값이 모두 0 이면 0)
+            p95=min(hi, max(lo, self._p95(st, window))),
+            count=count,
+        )
+
+    def snapshot(self) -> dict[str, dict[str, WindowSummary]]:
+        """{지표: {구간: WindowSummary}}"""
+        return {
+            metric: {w: self.summary(metric, w) for w in self.windows}
+            for metric in self.metrics
+        }
@@ -0,0 +1,158 @@
+"""
+scheduler.py — 절대 마감 시각 기반 주기 실행기
+작업이 끝난 뒤 sleep(interval) 하는 방식은 작업 시간만큼 주기가 밀리므로,
+time.monotonic() 격자(phase + k × interval) 위의 마감 시각에 맞춰 깨어납니다.
+
+- 작업이 길어져 다음 마감을 넘기면 밀린 틱을 몰아서 실행하지 않고 건너뛰며 개수를 셈
+- 깨어난 시각 - 마감 시각(지터)을 기록
+- CLOCK_MONOTONIC 은 시스템 전역이므로 같은 interval / phase 를 쓰는 루프는
+  별도 프로세스여도 같은 순간에 틱이 맞춰짐 (bot.py, cpu_bot.py, host.py 공통)
+- AdaptiveCadence: 격자 틱 중 수집할 틱을 골라 임계값과의 거리에 따라 주기를 늘이고 줄임
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable
+
+import metrics
+
+log = logging.getLogger("scheduler")
+
+
+class Ticker:
+    """monotonic 격자 위의 절대 마감 시각마다 콜백 실행"""
+
+    def __init__(self, interval: float, name: str = "tick", phase: float = 0.0,
+                 summary_seconds: float = 3600, history: int = 256):
+        self.interval = interval
+        self.name = name
+        self.phase = phase % interval
+        # 이 틱 수마다 지터 / 건너뜀 요약 로그 (summary_seconds=0 이면 끔)
+        self.summary_every = max(1, round(summary_seconds / interval)) if summary_seconds else 0
+        self.ticks = 0                       # 실행한 틱 수
+        self.skipped = 0                     # 마감 초과로 건너뛴 틱 수
+        self.overruns = 0                    # 마감을 넘긴 실행 횟수
+        self._jitter: deque[float] = deque(maxlen=history)   # 최근 지터 (초)
+        metrics.track_ticker(self)
+
+    def tick_index(self, deadline: float) -> int:
+        """마감 시각의 격자 번호 (같은 interval / phase 면 루프끼리 같은 값)"""
+        return round((deadline - self.phase) / self.interval)
+
+    def next_deadline(self, after: float) -> float:
+        """after 이후 첫 격자 마감 시각"""
+        k = math.floor((after - self.phase) / self.interval) + 1
+        return k * self.interval + self.phase
+
+    async def run(self, callback: Callable[[int], Awaitable[None]], start_after: float = 0.0):
+        """callback(틱 번호) 를 주기적으로 실행 (취소될 때까지)
+
+        start_after: 첫 틱을 최소 이만큼(초) 뒤로 미룸 (준비 작업 대기용)
+        """
+        deadline = self.next_deadline(time.monotonic() + start_after)
+        while True:
+            # asyncio 타이머는 시계 해상도만큼 일찍 깨어날 수 있으므로 마감까지 반복
+            while (delay := deadline - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            started = time.monotonic()
+            self._jitter.append(started - deadline)
+            self.ticks += 1
+
+            try:
+                await callback(self.tick_index(deadline))
+            except Exception as e:
+                log.error(f"[{self.name}] 틱 처리 오류: {e}", exc_info=True)
+
+            deadline += self.interval
+            now = time.monotonic()
+            if now >= deadline:
+                # 밀린 틱은 몰아서 실행하지 않고 다음 격자로 건너뜀
+                missed = int((now - deadline) // self.interval) + 1
+                deadline += missed * self.interval
+                self.skipped += missed
+                self.overruns += 1
+                log.warning(
+                    f"[{self.name}] 틱 실행 {now - started:.2f}초 (주기 {self.interval}초) "
+                    f"→ {missed}틱 건너뜀 (누적 {self.skipped})"
+                )
+
+            if self.summary_every and self.ticks % self.summary_every == 0:
+                s = self.stats()
+                log.info(
+                    f"[{self.name}] 틱 {s['ticks']} | 지터 평균 {s['jitter_ms_mean']:.1f} ms "
+                    f"p95 {s['jitter_ms_p95']:.1f} ms 최대 {s['jitter_ms_max']:.1f} ms "
+                    f"| 건너뜀 {s['skipped']}"
+                )
+
+    def stats(self) -> dict:
+        jitter = sorted(self._jitter)
+        n = len(jitter)
+        return {
+            "ticks":          self.ticks,
+            "skipped":        self.skipped,
+            "overruns":       self.overruns,
+            "jitter_ms_mean": sum(jitter) / n * 1000 if n else 0.0,
+            "jitter_ms_p95":  jitter[min(n - 1, int(n * 0.95))] * 1000 if n else 0.0,
+            "jitter_ms_max":  jitter[-1] * 1000 if n else 0.0,
+        }
+
+
+class AdaptiveCadence:
+    """격자 틱 중 실제로 수집할 틱을 고르는 적응형 주기
+
+    grid      : 격자 주기 (Ticker.interval, 가장 짧은 수집 주기)
+    intervals : (임계값 근처, 보통, 여유) 수집 주기 (초, grid 의 배수) — 값이 하나면 고정 주기
+    headroom  : (근처, 여유) 경계 — 임계값까지 남은 비율이 near 미만이면 가장 빠르게,
+                far 이상이면 가장 느리게
+    calm_ticks: 느린 단계로 내려가기 전에 연속으로 여유가 있어야 하는 수집 횟수
+                (빨라질 때는 즉시 반영)
+    """
+
+    def __init__(self, grid: float, intervals: tuple[float, ...], headroom: tuple[float, float] = (0.15, 0.4),
+                 calm_ticks: int = 3, name: str = "cadence"):
+        self.grid = grid
+        self.steps = tuple(max(1, round(i / grid)) for i in intervals)
+        self.near, self.far = headroom
+        self.calm_ticks = calm_ticks
+        self.name = name
+        # 시작은 보통 단계 (첫 샘플을 보고 바로 조정)
+        self.level = min(1, len(self.steps) - 1)
+        self._calm = 0
+        self._last: int | None = None
+
+    @property
+    def interval(self) -> float:
+        """현재 수집 주기 (초)"""
+        return self.steps[self.level] * self.grid
+
+    def due(self, tick: int) -> bool:
+        """이 격자 틱에 수집할지 (True 면 마지막 수집 틱으로 기록)"""
+        if self._last is None or tick - self._last >= self.steps[self.level]:
+            self._last = tick
+            return True
+        return False
+
+    def observe(self, headroom: float):
+        """가장 가까운 임계값까지 남은 비율(예측 포함)로 다음 수집 주기 결정"""
+        n = len(self.steps)
+        if headroom < self.near:
+            want = 0
+        elif headroom >= self.far:
+            want = n - 1
+        else:
+            want = min(1, n - 1)
+        if want < self.level:
+            self.level = want
+            self._calm = 0
+            log.info(f"[{self.name}] 수집 주기 {self.interval:g}초로 단축 (여유 {headroom:.0%})")
+        elif want > self.level:
+            self._calm += 1
+            if self._calm >= self.calm_ticks:
+                self.level += 1
+                self._calm = 0
+                log.info(f"[{self.name}] 수집 주기 {self.interval:g}초로 완화 (여유 {headroom:.0%})")
+        else:
+            self._calm = 0
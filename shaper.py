@@ -0,0 +1,176 @@
+"""
+shaper.py — Oracle 회수 방지 부하 유지 (duty cycle 합성 부하)
+7일 CPU p95 가 회수선(20%) 아래로 내려가지 않도록 필요한 만큼만 합성 부하를 더합니다.
+
+- 코어마다 워커 프로세스 하나 (해당 코어에 고정), period 마다 duty 비율만큼만 바쁜 대기 후 휴식
+- 워커는 SCHED_IDLE (없으면 nice 19) — 실제 작업이 생기면 커널이 즉시 워커를 밀어냄
+- 워커가 실제로 쓴 CPU 시간을 공유 메모리에 기록 → 주입 부하를 측정값으로 따로 보고
+- 제어기는 봇의 CPU 샘플마다 실제 부하(전체 - 주입)를 계산해 duty 를 다시 정함
+  · 7일 p95 가 유지선 미만(회복): 매 틱 전체 CPU 가 유지선에 닿도록 부족분만 채움
+  · 그 밖(유지): p95 조건(상위 5%)에 필요한 시간 비율만큼 매 주기 앞부분에만 가동
+    실제 부하만으로 유지선을 넘는 시간 비율(24시간 지수 평균)이 충분하면 가동하지 않음
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import time
+
+log = logging.getLogger("shaper")
+
+_STOP = -1.0
+_NATURAL_TAU = 24 * 3600   # 실제 부하 유지선 초과 비율의 지수 평균 시간 상수 (초)
+_TRIM_GAIN = 0.2           # 적분 보정 이득 (유지선 - 측정 전체 CPU, %p → duty)
+_TRIM_LIMIT = 0.05         # 적분 보정 최대 크기 (duty)
+
+
+def _worker(index: int, cpu: int | None, duty, busy, period: float, parent: int):
+    """duty cycle 워커 — duty.value 비율만큼 바쁜 대기, 나머지는 sleep (음수면 종료)"""
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError:
+            pass
+    try:
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (AttributeError, OSError):
+        os.nice(19)
+    deadline = time.monotonic()
+    while True:
+        d = duty.value
+        # 부모가 비정상 종료되면 (SIGKILL 등) 고아로 남지 않도록
+        if d == _STOP or os.getppid() != parent:
+            return
+        if d > 0:
+            start = time.process_time()
+            end = deadline + d * period
+            while time.monotonic() < end:
+                pass
+            busy[index] += time.process_time() - start
+        deadline += period
+        delay = deadline - time.monotonic()
+        if delay < 0:
+            deadline = time.monotonic()
+            delay = 0
+        time.sleep(delay)
+
+
+class LoadShaper:
+    """코어별 duty cycle 워커 + 전체 CPU 유지 제어기
+
+    floor : 가동 중 유지할 전체 CPU 사용률 (%)
+    share : 유지선 이상이어야 할 시간 비율 (p95 조건은 0.05, 여유를 두고 설정)
+    cycle : 유지 모드에서 가동 구간을 배치하는 주기 (초)
+    period: duty cycle 주기 (초)
+    """
+
+    def __init__(self, floor: float, share: float = 0.10, cycle: float = 3600,
+                 period: float = 0.1, workers: int | None = None, max_duty: float = 0.9):
+        self.floor = floor
+        self.share = share
+        self.cycle = cycle
+        self.period = period
+        self.max_duty = max_duty
+        self.cores = os.cpu_count() or 1
+        self.workers = workers or self.cores
+        # 리눅스는 fork (부모 메모리를 공유해 워커당 추가 메모리가 거의 없음)
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self._duty = self._ctx.RawValue("d", 0.0)
+        self._busy = self._ctx.RawArray("d", self.workers)
+        self._procs: list = []
+        # 제어 상태
+        self.natural = 0.0          # 실제 부하만으로 유지선 이상인 시간 비율 (지수 평균)
+        self.active = 0.0           # 유지 모드의 주기당 가동 비율
+        self.mode = "off"           # off / recover / maintain
+        self.injected = 0.0         # 직전 구간 주입 부하 (전체 CPU 대비 %)
+        self.real = 0.0             # 직전 구간 실제 부하 (%)
+        self._trim = 0.0
+        self._last: tuple[float, float] | None = None   # (monotonic, 워커 CPU 시간 합)
+
+    @property
+    def duty(self) -> float:
+        return max(0.0, self._duty.value)
+
+    def start(self):
+        if self._procs:
+            return
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        for i in range(self.workers):
+            cpu = cpus[i % len(cpus)] if cpus else None
+            p = self._ctx.Process(
+                target=_worker, name=f"load-shaper-{i}", daemon=True,
+                args=(i, cpu, self._duty, self._busy, self.period, os.getpid()),
+            )
+            p.start()
+            self._procs.append(p)
+        log.info(f"부하 유지 시작 | 워커 {self.workers}개 · 유지선 {self.floor:g}% · "
+                 f"시간 비율 {self.share:.0%} · duty 주기 {self.period * 1000:.0f} ms")
+
+    def stop(self):
+        self._duty.value = _STOP
+        for p in self._procs:
+            p.join(timeout=self.period * 3)
+            if p.is_alive():
+                p.terminate()
+        self._procs.clear()
+
+    def _measure(self, now: float) -> float:
+        """직전 호출 이후 워커가 실제로 쓴 CPU (전체 CPU 대비 %)"""
+        busy = sum(self._busy)
+        last, self._last = self._last, (now, busy)
+        if last is None or now <= last[0]:
+            return 0.0
+        return max(0.0, (busy - last[1]) / ((now - last[0]) * self.cores) * 100)
+
+    def observe(self, cpu_percent: float, p95: float, ts: float | None = None, now: float | None = None):
+        """봇의 CPU 샘플 하나로 제어 (cpu_percent: 전체 사용률, p95: 7일 CPU p95)
+
+        ts: 가동 구간 배치용 벽시계 시각, now: 측정용 monotonic 시각
+        """
+        ts = time.time() if ts is None else ts
+        now = time.monotonic() if now is None else now
+        prev = self._last[0] if self._last is not None else None
+        self.injected = min(cpu_percent, self._measure(now))
+        self.real = max(0.0, cpu_percent - self.injected)
+
+        if prev is not None:
+            a = 1 - math.exp(-(now - prev) / _NATURAL_TAU)
+            self.natural += a * ((self.real >= self.floor) - self.natural)
+        # 실제 부하가 유지선 이상인 시간을 제외하고 부족한 비율만 채움
+        self.active = min(1.0, max(0.0, (self.share - self.natural) / max(1e-9, 1 - self.natural)))
+
+        if p95 < self.floor:
+            self.mode = "recover"
+            on = True
+        else:
+            self.mode = "maintain"
+            on = (ts % self.cycle) < self.active * self.cycle
+
+        if not on or self.real >= self.floor:
+            # 실제 부하만으로 충분하면 즉시 중단 (적분 보정도 초기화)
+            self._trim = 0.0
+            self._duty.value = 0.0
+            if not on:
+                self.mode = "maintain" if self.active > 0 else "idle"
+            return
+
+        # 부족분 (전체 CPU %p) → 워커당 duty, 측정 전체 CPU 와 유지선 차이로 적분 보정
+        if self.duty > 0:
+            self._trim += _TRIM_GAIN * (self.floor - cpu_percent) / 100
+            self._trim = max(-_TRIM_LIMIT, min(_TRIM_LIMIT, self._trim))
+        need = (self.floor - self.real) / 100 * self.cores / self.workers
+        self._duty.value = max(0.0, min(self.max_duty, need + self._trim))
+
+    def status(self) -> dict:
+        """embed 표시용 — 주입 / 실제 부하 (%), 현재 duty, 모드, 유지 모드 가동 비율"""
+        return {
+            "injected": self.injected,
+            "real":     self.real,
+            "duty":     self.duty,
+            "mode":     self.mode,
+            "active":   self.active,
+            "natural":  self.natural,
+            "floor":    self.floor,
+        }
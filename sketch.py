@@ -0,0 +1,149 @@
+"""
+sketch.py — 스트리밍 분위수 스케치 (DDSketch)
+값을 로그 간격 버킷에 세어 두고 분위수를 근사합니다.
+
+오차 한계: 반환되는 분위수 값 q' 는 실제 분위수 값 q 에 대해 |q' - q| <= alpha * q
+(상대 오차, alpha 기본 1%). min_value 이하의 값은 0 버킷에 모아 0 으로 보고합니다.
+"""
+
+import math
+from collections import deque
+
+
+class DDSketch:
+    """상대 오차 alpha 를 보장하는 분위수 스케치 (가중치 지원, 병합 가능)"""
+
+    __slots__ = ("alpha", "min_value", "max_bins", "_gamma_ln", "bins", "zero", "count")
+
+    def __init__(self, alpha: float = 0.01, min_value: float = 0.01, max_bins: int = 1024):
+        self.alpha = alpha
+        self.min_value = min_value
+        self.max_bins = max_bins
+        self._gamma_ln = math.log((1 + alpha) / (1 - alpha))
+        self.bins: dict[int, float] = {}
+        self.zero = 0.0    # min_value 이하 값의 가중치 합
+        self.count = 0.0   # 전체 가중치 합
+
+    def add(self, value: float, weight: float = 1.0):
+        self.count += weight
+        if value <= self.min_value:
+            self.zero += weight
+            return
+        key = math.ceil(math.log(value) / self._gamma_ln)
+        self.bins[key] = self.bins.get(key, 0.0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        """버킷 수 상한 초과 시 가장 낮은 두 버킷을 합침 (낮은 분위수 정확도만 희생)"""
+        lo, nxt = sorted(self.bins)[:2]
+        self.bins[nxt] += self.bins.pop(lo)
+
+    def merge(self, other: "DDSketch"):
+        self.count += other.count
+        self.zero += other.zero
+        for key, w in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0.0) + w
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> float:
+        if self.count <= 0:
+            return 0.0
+        rank = q * self.count
+        acc = self.zero
+        if acc > rank:
+            return 0.0
+        keys = sorted(self.bins)
+        if not keys:
+            return 0.0
+        key = keys[-1]
+        for k in keys:
+            acc += self.bins[k]
+            if acc > rank:
+                key = k
+                break
+        # 버킷 (gamma^(k-1), gamma^k] 의 상대 오차 중앙값
+        gamma = math.exp(self._gamma_ln)
+        return 2 * math.exp(key * self._gamma_ln) / (gamma + 1)
+
+    def to_dict(self) -> dict:
+        """직렬화 — 연속 구간 배열 (시작 키 + 버킷별 가중치)로 압축"""
+        if not self.bins:
+            return {"z": _compact(self.zero), "n": _compact(self.count), "k": 0, "c": []}
+        lo, hi = min(self.bins), max(self.bins)
+        counts = [_compact(self.bins.get(k, 0)) for k in range(lo, hi + 1)]
+        return {"z": _compact(self.zero), "n": _compact(self.count), "k": lo, "c": counts}
+
+    def load_dict(self, data: dict):
+        self.zero = float(data.get("z", 0.0))
+        self.count = float(data.get("n", 0.0))
+        lo = int(data.get("k", 0))
+        self.bins = {lo + i: float(w) for i, w in enumerate(data.get("c", [])) if w}
+
+
+def _compact(w: float):
+    """가중치를 짧게 (정수면 int, 아니면 소수 셋째 자리)"""
+    r = round(w, 3)
+    return int(r) if r == int(r) else r
+
+
+class RollingSketch:
+    """최근 span 초 구간의 분위수 — slot 초 단위 DDSketch 를 돌려 쓰는 방식
+
+    구간 경계는 slot 단위로만 맞춰지므로 실제 포함 구간은 span ~ span + slot 이다.
+    메모리는 (span / slot + 1) 개 스케치로 고정된다.
+    """
+
+    def __init__(self, span: float, slot: float, alpha: float = 0.01, min_value: float = 0.01):
+        self.span = span
+        self.slot = slot
+        self.alpha = alpha
+        self.min_value = min_value
+        self._slots: deque[tuple[int, DDSketch]] = deque()
+        self._first_ts: float | None = None  # 첫 샘플 시각 (수집 기간 계산용)
+
+    def _new_sketch(self) -> DDSketch:
+        return DDSketch(self.alpha, self.min_value)
+
+    def add(self, value: float, ts: float, weight: float = 1.0):
+        slot_id = int(ts // self.slot)
+        if self._first_ts is None:
+            self._first_ts = ts
+        if not self._slots or self._slots[-1][0] != slot_id:
+            self._slots.append((slot_id, self._new_sketch()))
+        self._slots[-1][1].add(value, weight)
+        self._expire(slot_id)
+
+    def _expire(self, slot_id: int):
+        oldest = slot_id - int(math.ceil(self.span / self.slot))
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.popleft()
+
+    def quantile(self, q: float, now: float | None = None) -> float:
+        if now is not None:
+            self._expire(int(now // self.slot))
+        merged = self._new_sketch()
+        for _, sk in self._slots:
+            merged.merge(sk)
+        return merged.quantile(q)
+
+    def coverage(self, now: float) -> float:
+        """데이터가 존재하는 구간 길이 (초, 최대 span)"""
+        if not self._slots or self._first_ts is None:
+            return 0.0
+        return max(0.0, min(self.span, now - self._first_ts))
+
+    def to_dict(self) -> dict:
+        return {
+            "first": self._first_ts,
+            "slots": [[slot_id, sk.to_dict()] for slot_id, sk in self._slots],
+        }
+
+    def load_dict(self, data: dict):
+        self._first_ts = data.get("first")
+        self._slots.clear()
+        for slot_id, raw in data.get("slots", []):
+            sk = self._new_sketch()
+            sk.load_dict(raw)
+            self._slots.append((int(slot_id), sk))
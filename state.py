@@ -0,0 +1,79 @@
+"""
+state.py — 봇별 재시작 상태 파일
+재시작 직후 필요한 작은 상태(상태 메시지 ID, 알림 상태, 네트워크 누적 카운터)를
+data/state_<봇>.json 하나에 원자적으로 저장합니다.
+
+- 상태 메시지 ID 가 있으면 채널 히스토리를 조회하지 않고 바로 edit (API 호출 0회)
+- 알림 상태를 이어받아 조건이 계속되는 동안 재시작마다 @here 가 다시 울리지 않음
+- 내용이 바뀌었을 때만 디스크에 씀
+"""
+
+import json
+import os
+import threading
+
+import config
+from persist import atomic_write_bytes, load_json
+
+
+def state_path(name: str) -> str:
+    return os.path.join(config.STATE_DIR, f"state_{name}.json")
+
+
+class StateFile:
+    """JSON 상태 파일 (update 로 변경 → save 로 원자적 저장)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: dict = load_json(path, {}) or {}
+        self._dirty = False
+        self._seq = 0            # dump 순번
+        self._written = 0        # 디스크에 쓴 마지막 dump 순번
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+    def update(self, **values):
+        for key, value in values.items():
+            if self._data.get(key) != value:
+                self._data[key] = value
+                self._dirty = True
+
+    def dump(self) -> tuple[int, bytes] | None:
+        """저장할 내용 (순번, JSON) — 바뀐 것이 없으면 None
+
+        update 와 같은 스레드(이벤트 루프)에서 호출 — 직렬화 도중 다른 곳에서 딕셔너리를 바꾸지 않도록.
+        파일 쓰기만 executor 로 넘기려면 dump() 결과를 write() 로.
+        """
+        if not self._dirty:
+            return None
+        self._dirty = False
+        self._seq += 1
+        return self._seq, json.dumps(self._data, separators=(",", ":")).encode()
+
+    def write(self, dumped: tuple[int, bytes]):
+        """dump() 결과를 원자적으로 저장 (다른 스레드에서 호출해도 됨)
+
+        쓰기는 한 번에 하나씩, 더 나중에 dump 한 내용이 이미 저장됐으면 건너뜀
+        """
+        seq, data = dumped
+        with self._lock:
+            if seq <= self._written:
+                return
+            atomic_write_bytes(self.path, data)
+            self._written = seq
+
+    def mark_dirty(self):
+        """쓰기에 실패한 경우 다음 save 에서 다시 쓰도록"""
+        self._dirty = True
+
+    def save(self):
+        dumped = self.dump()
+        if dumped is None:
+            return
+        try:
+            self.write(dumped)
+        except OSError:
+            self._dirty = True
+            raise
@@ -1,11 +1,237 @@
+import os
 import psutil
 import time
-from dataclasses import dataclass
-from typing import Optional, Any
+from dataclasses import dataclass, field
+from typing import Optional
 
-# 이전 네트워크 카운터 (전송량 계산용)
-_prev_net_io: Optional[Any] = None
+from burst import BurstSampler
+from procfs import ProcCollector, is_physical_disk, usage_percent
+
+# 이전 네트워크 카운터 (전송량 계산용) — (수신 바이트, 송신 바이트)
+_prev_net_io: Optional[tuple[int, int]] = None
 _prev_net_time: float = 0.0
+# 재시작 후 이어받을 카운터의 최대 나이 (초) — 이보다 오래되면 평균이 무의미하므로 버림
+NET_RESTORE_MAX_AGE = 15 * 60
+
+
+class CpuSampler:
+    """/proc/stat 누적 틱의 차분으로 CPU 사용률 계산 (블로킹 없음)
+
+    sample() 호출 사이 구간의 사용률을 반환하므로 별도 대기 없이 수 µs 안에 끝난다.
+    전체와 코어별 값은 같은 스냅샷에서 계산된다.
+    /proc 수집기가 없는 환경에서는 psutil.cpu_percent(interval=None) 으로 대체한다.
+    """
+
+    def __init__(self, collector: Optional[ProcCollector] = None):
+        self._collector = collector
+        # 직전 sample() 구간의 I/O 대기 / 스틸 비율 (%, 전체 CPU 기준)
+        self.iowait_percent = 0.0
+        self.steal_percent = 0.0
+        if collector is None:
+            psutil.cpu_percent(interval=None, percpu=True)
+            psutil.cpu_times_percent(interval=None)
+        # 기준 스냅샷 (첫 sample() 은 생성 이후 구간을 측정)
+        self._prev, self._prev_wait = self._read()
+
+    def _read(self) -> tuple[list[tuple[int, int]], tuple[int, int]]:
+        """([(busy, total), ...], (iowait, steal)) — 0번은 전체, 이후 코어 순서"""
+        if self._collector is None:
+            return [], (0, 0)
+        return self._collector.cpu_stat()
+
+    def sample(self) -> tuple[float, list[float]]:
+        """(전체 사용률, 코어별 사용률) — 직전 sample() 이후 구간 기준"""
+        if self._collector is None:
+            per_core = psutil.cpu_percent(interval=None, percpu=True)
+            times = psutil.cpu_times_percent(interval=None)
+            self.iowait_percent = getattr(times, "iowait", 0.0)
+            self.steal_percent = getattr(times, "steal", 0.0)
+            total = sum(per_core) / len(per_core) if per_core else 0.0
+            return total, per_core
+
+        cur, wait = self._read()
+        prev = self._prev if len(self._prev) == len(cur) else [(0, 0)] * len(cur)
+        if cur and prev and cur[0][1] > prev[0][1]:
+            d_total = cur[0][1] - prev[0][1]
+            self.iowait_percent = max(0.0, min(100.0, (wait[0] - self._prev_wait[0]) / d_total * 100))
+            self.steal_percent = max(0.0, min(100.0, (wait[1] - self._prev_wait[1]) / d_total * 100))
+        self._prev, self._prev_wait = cur, wait
+        percents = []
+        for (busy, total), (p_busy, p_total) in zip(cur, prev):
+            d_total = total - p_total
+            percents.append(
+                max(0.0, min(100.0, (busy - p_busy) / d_total * 100)) if d_total > 0 else 0.0
+            )
+        if not percents:
+            return 0.0, []
+        return percents[0], percents[1:]
+
+
+def _open_collector(root: str = "/proc") -> Optional[ProcCollector]:
+    """리눅스 /proc 수집기 생성 (실패 시 None → psutil 사용)"""
+    try:
+        return ProcCollector(root)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_collector: Optional[ProcCollector] = _open_collector()
+# 모듈 로드 시점을 기준점으로 삼아 첫 get_system_stats() 부터 유효한 값을 반환
+_cpu_sampler = CpuSampler(_collector)
+# 보고 틱 사이 고빈도 샘플러 (start_burst_sampler() 로 시작, 없으면 최댓값 = 평균)
+_burst: Optional[BurstSampler] = None
+
+
+def use_proc_root(root: str):
+    """수집 대상 /proc 경로 변경 (벤치마크의 가짜 /proc 트리 등)"""
+    global _collector, _cpu_sampler, _prev_net_io, _prev_net_time, _disk_rates, _nic_rates, _psi_rates
+    if _collector is not None:
+        _collector.close()
+    _collector = _open_collector(root)
+    _cpu_sampler = CpuSampler(_collector)
+    _prev_net_io = None
+    _prev_net_time = 0.0
+    _disk_rates = CounterRates()
+    _nic_rates = CounterRates()
+    _psi_rates = CounterRates()
+    if _burst is not None:
+        interval = _burst.interval
+        stop_burst_sampler()
+        start_burst_sampler(interval)
+
+
+def start_burst_sampler(interval: float) -> bool:
+    """보고 틱 사이 최댓값 / p95 를 위한 고빈도 샘플러 시작 (/proc 수집기가 있을 때만)"""
+    global _burst
+    if _burst is not None or _collector is None or interval <= 0:
+        return False
+    try:
+        _burst = BurstSampler(_collector.root, interval)
+    except OSError:
+        return False
+    _burst.start()
+    return True
+
+
+def stop_burst_sampler():
+    global _burst
+    if _burst is not None:
+        _burst.stop()
+        _burst = None
+
+
+class CounterRates:
+    """이름별 누적 카운터 묶음 → 직전 호출 대비 초당 증가량
+
+    처음 보이는 이름은 기준점만 잡고 결과에서 빠지며, 사라진 이름은 다음 호출에서 정리된다.
+    카운터가 줄어든 경우(장치 재연결 등) 음수 대신 0.
+    """
+
+    def __init__(self):
+        self._prev: dict[str, tuple] = {}
+        self._time = 0.0
+
+    def rates(self, counters: dict[str, tuple]) -> dict[str, tuple[float, ...]]:
+        now = time.monotonic()
+        elapsed = now - self._time
+        result = {}
+        if elapsed > 0:
+            for name, cur in counters.items():
+                prev = self._prev.get(name)
+                if prev is not None:
+                    result[name] = tuple(max(0, c - p) / elapsed for c, p in zip(cur, prev))
+        self._prev = counters
+        self._time = now
+        return result
+
+
+@dataclass
+class DiskIO:
+    name: str
+    read_kb: float        # KB/s
+    write_kb: float       # KB/s
+    iops: float           # 초당 읽기 + 쓰기 완료 수
+    busy_percent: float   # 장치가 I/O 를 처리 중이던 시간 비율 (iostat %util)
+
+
+@dataclass
+class MountUsage:
+    mountpoint: str
+    device: str
+    used_gb: float
+    total_gb: float
+    percent: float
+
+
+@dataclass
+class NicIO:
+    name: str
+    recv_kb: float        # KB/s
+    sent_kb: float        # KB/s
+
+
+_disk_rates = CounterRates()
+_nic_rates = CounterRates()
+_SECTOR = 512   # /proc/diskstats 섹터 단위 (장치 섹터 크기와 무관)
+
+
+def _disk_io(counters: dict[str, tuple]) -> list[DiskIO]:
+    """{장치: (읽기 수, 읽은 섹터, 쓰기 수, 쓴 섹터, I/O 시간 ms)} → 장치별 초당 값"""
+    disks = []
+    for name, (reads, rsec, writes, wsec, busy_ms) in sorted(_disk_rates.rates(counters).items()):
+        disks.append(DiskIO(
+            name=name,
+            read_kb=rsec * _SECTOR / 1024,
+            write_kb=wsec * _SECTOR / 1024,
+            iops=reads + writes,
+            busy_percent=min(100.0, busy_ms / 10),   # ms/s → %
+        ))
+    return disks
+
+
+def _nic_io(counters: dict[str, tuple[int, int]]) -> list[NicIO]:
+    """{인터페이스: (수신 바이트, 송신 바이트)} → 인터페이스별 초당 KB (lo 제외)"""
+    return [
+        NicIO(name, rx / 1024, tx / 1024)
+        for name, (rx, tx) in sorted(_nic_rates.rates(counters).items()) if name != "lo"
+    ]
+
+
+def _mount_usage(mounts: list[tuple[str, str, str]]) -> list[MountUsage]:
+    """마운트 지점별 사용량 (statvfs — 마운트 목록 자체는 캐시된 것을 사용)"""
+    gb = 1024 ** 3
+    result = []
+    for device, mountpoint, _ in mounts:
+        try:
+            used, total, percent = _disk_usage(mountpoint)
+        except OSError:
+            continue
+        if total > 0:
+            result.append(MountUsage(mountpoint, device, used / gb, total / gb, percent))
+    return result
+
+
+_psi_rates = CounterRates()
+
+
+def _pressure_fields(pressure: dict[str, tuple]) -> dict:
+    """PSI → SystemStats 키워드 인자 (지원하지 않는 커널이면 빈 dict)
+
+    누적 지연 시간(total, µs) 의 차분으로 직전 수집 이후 구간의 지연 비율(%)을 계산하고,
+    기준점이 없는 첫 수집에서는 커널의 10초 평균(avg10)을 쓴다.
+    """
+    if not pressure:
+        return {}
+    rates = _psi_rates.rates({r: (v[1], v[3] or 0) for r, v in pressure.items()})
+    fields = {}
+    for resource, (some_avg, _, full_avg, _) in pressure.items():
+        rate = rates.get(resource)
+        # µs/s → %
+        fields[f"psi_{resource}"] = min(100.0, rate[0] / 1e4) if rate else some_avg
+        # cpu 의 full 은 시스템 전체로는 의미가 없어 (항상 0 또는 없음) 메모리 / I/O 만
+        if resource != "cpu" and full_avg is not None:
+            fields[f"psi_{resource}_full"] = min(100.0, rate[1] / 1e4) if rate else full_avg
+    return fields
 
 
 @dataclass
@@ -36,13 +262,194 @@ class SystemStats:
     # 업타임
     uptime_seconds: int
 
+    # 장치별 (블록 장치 I/O, 실제 마운트별 사용량, 인터페이스별 전송량)
+    disks: list[DiskIO] = field(default_factory=list)
+    mounts: list[MountUsage] = field(default_factory=list)
+    nics: list[NicIO] = field(default_factory=list)
 
-def get_system_stats() -> SystemStats:
+    # 경합 — CPU 시간 중 I/O 대기 / 하이퍼바이저 스틸 (%), 부하 평균 (실행 + 대기 중인 태스크 수)
+    cpu_iowait: float = 0.0
+    cpu_steal: float = 0.0
+    load_1: float = 0.0
+    load_5: float = 0.0
+    load_15: float = 0.0
+    # PSI (Pressure Stall Information) — 자원을 기다리느라 멈춘 시간 비율 (%), 커널 미지원 시 None
+    #   some: 태스크 하나 이상이 대기, full: 모든 태스크가 동시에 대기 (메모리 / I/O 만)
+    psi_cpu: Optional[float] = None
+    psi_memory: Optional[float] = None
+    psi_memory_full: Optional[float] = None
+    psi_io: Optional[float] = None
+    psi_io_full: Optional[float] = None
+
+    # 버스트 (직전 보고 이후 고빈도 샘플의 최댓값 / p95) — 샘플러가 없으면 평균과 같음
+    cpu_peak: Optional[float] = None
+    cpu_p95: Optional[float] = None
+    net_recv_peak_kb: Optional[float] = None
+    net_recv_p95_kb: Optional[float] = None
+    net_sent_peak_kb: Optional[float] = None
+    net_sent_p95_kb: Optional[float] = None
+
+    @property
+    def disk_busy_percent(self) -> float:
+        """가장 바쁜 블록 장치의 I/O 사용률 (%)"""
+        return max((d.busy_percent for d in self.disks), default=0.0)
+
+    @property
+    def load_per_core(self) -> float:
+        """1분 부하 평균 ÷ 코어 수 (1 이상이면 실행 대기열이 쌓이는 중)"""
+        return self.load_1 / max(1, len(self.cpu_per_core))
+
+    @property
+    def mount_max_percent(self) -> float:
+        """가장 많이 찬 마운트의 사용률 (%, 마운트 목록이 없으면 루트)"""
+        return max((m.percent for m in self.mounts), default=self.disk_percent)
+
+    def __post_init__(self):
+        # 샘플러와 보고 틱의 구간 경계가 조금 어긋나므로 최댓값은 보고 구간 평균을 하한으로 둠
+        for avg, peak, p95 in (("cpu_percent", "cpu_peak", "cpu_p95"),
+                               ("net_recv_kb", "net_recv_peak_kb", "net_recv_p95_kb"),
+                               ("net_sent_kb", "net_sent_peak_kb", "net_sent_p95_kb")):
+            base = getattr(self, avg)
+            if getattr(self, p95) is None:
+                setattr(self, p95, base)
+            setattr(self, peak, max(base, getattr(self, peak) or 0.0))
+
+
+def _burst_fields() -> dict:
+    """직전 보고 이후 버스트 요약 → SystemStats 키워드 인자 (샘플러가 없거나 샘플이 없으면 빈 dict)"""
+    summary = _burst.drain() if _burst is not None else None
+    if summary is None:
+        return {}
+    return {
+        "cpu_peak": summary.cpu_peak, "cpu_p95": summary.cpu_p95,
+        "net_recv_peak_kb": summary.net_recv_peak_kb, "net_recv_p95_kb": summary.net_recv_p95_kb,
+        "net_sent_peak_kb": summary.net_sent_peak_kb, "net_sent_p95_kb": summary.net_sent_p95_kb,
+    }
+
+
+def _load_fields(load: Optional[tuple[float, float, float]]) -> dict:
+    if load is None:
+        return {}
+    return {"load_1": load[0], "load_5": load[1], "load_15": load[2]}
+
+
+def _getloadavg() -> Optional[tuple[float, float, float]]:
+    try:
+        return psutil.getloadavg()
+    except (OSError, AttributeError):
+        return None
+
+
+def _net_rate(net_io: tuple[int, int]) -> tuple[float, float]:
+    """직전 호출 대비 초당 수신/송신 KB"""
     global _prev_net_io, _prev_net_time
+    now = time.monotonic()
+    if _prev_net_io is not None and (now - _prev_net_time) > 0:
+        elapsed = now - _prev_net_time
+        # 인터페이스가 사라져 합계가 줄어든 경우 음수 대신 0
+        net_recv_kb = max(0, net_io[0] - _prev_net_io[0]) / elapsed / 1024
+        net_sent_kb = max(0, net_io[1] - _prev_net_io[1]) / elapsed / 1024
+    else:
+        net_recv_kb = 0.0
+        net_sent_kb = 0.0
+    _prev_net_io = net_io
+    _prev_net_time = now
+    return net_recv_kb, net_sent_kb
+
+
+def _boot_id() -> str:
+    """현재 부팅 식별자 (재부팅하면 네트워크 카운터와 monotonic 시계가 초기화되므로)"""
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return str(int(psutil.boot_time()))
+
+
+def net_counters() -> Optional[dict]:
+    """재시작 상태 파일에 저장할 마지막 네트워크 카운터"""
+    if _prev_net_io is None:
+        return None
+    return {"recv": _prev_net_io[0], "sent": _prev_net_io[1],
+            "mono": _prev_net_time, "boot": _boot_id()}
+
+
+def restore_net_counters(saved: Optional[dict]) -> bool:
+    """저장된 카운터를 기준점으로 복원 → 재시작 후 첫 샘플부터 전송량 계산
+
+    같은 부팅에서 NET_RESTORE_MAX_AGE 안에 저장된 값만 사용한다.
+    (CLOCK_MONOTONIC 은 프로세스와 무관하게 부팅 기준이므로 그대로 비교 가능)
+    """
+    global _prev_net_io, _prev_net_time
+    if not saved or _prev_net_io is not None or saved.get("boot") != _boot_id():
+        return False
+    if not 0 < time.monotonic() - saved["mono"] <= NET_RESTORE_MAX_AGE:
+        return False
+    _prev_net_io = (saved["recv"], saved["sent"])
+    _prev_net_time = saved["mono"]
+    return True
+
+
+def _disk_usage(path: str = "/") -> tuple[int, int, float]:
+    """(used, total, percent) — psutil.disk_usage 와 같은 계산을 statvfs 로 직접"""
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    avail = st.f_bavail * st.f_frsize
+    return used, total, usage_percent(used, used + avail)
+
+
+def get_system_stats() -> SystemStats:
+    if _collector is None:
+        return _get_system_stats_psutil()
 
-    # CPU - interval=1 로 1초 블로킹해서 정확한 수치 측정
-    cpu_percent = psutil.cpu_percent(interval=1)
-    cpu_per_core = psutil.cpu_percent(percpu=True)
+    # CPU - 직전 호출 이후 /proc/stat 틱 차분 (블로킹 없음, 전체/코어별 동일 스냅샷)
+    cpu_percent, cpu_per_core = _cpu_sampler.sample()
+
+    # 메모리 / 스왑 - /proc/meminfo 한 번 읽기
+    mem = _collector.memory()
+
+    # 디스크 (루트 파티션)
+    disk_used, disk_total, disk_percent = _disk_usage("/")
+
+    # 네트워크 (초당 전송량) - 한 번 읽어 합계와 인터페이스별 모두 계산 (합계는 lo 포함)
+    ifaces = _collector.net_ifaces()
+    net_recv_kb, net_sent_kb = _net_rate(
+        (sum(v[0] for v in ifaces.values()), sum(v[1] for v in ifaces.values()))
+    )
+
+    gb = 1024 ** 3
+    return SystemStats(
+        cpu_percent=cpu_percent,
+        cpu_per_core=cpu_per_core,
+        mem_used_gb=mem["mem_used"] / gb,
+        mem_total_gb=mem["mem_total"] / gb,
+        mem_percent=usage_percent(mem["mem_used"], mem["mem_total"]),
+        swap_used_gb=mem["swap_used"] / gb,
+        swap_total_gb=mem["swap_total"] / gb,
+        swap_percent=usage_percent(mem["swap_used"], mem["swap_total"]),
+        disk_used_gb=disk_used / gb,
+        disk_total_gb=disk_total / gb,
+        disk_percent=disk_percent,
+        net_recv_kb=net_recv_kb,
+        net_sent_kb=net_sent_kb,
+        # 부팅 시각은 고정값이므로 수집기 생성 시 한 번만 읽음
+        uptime_seconds=int(time.time() - _collector.boot_time),
+        disks=_disk_io(_collector.disk_io()),
+        mounts=_mount_usage(_collector.mounts()),
+        nics=_nic_io(ifaces),
+        cpu_iowait=_cpu_sampler.iowait_percent,
+        cpu_steal=_cpu_sampler.steal_percent,
+        **_load_fields(_collector.load()),
+        **_pressure_fields(_collector.pressure_stats()),
+        **_burst_fields(),
+    )
+
+
+def _get_system_stats_psutil() -> SystemStats:
+    """psutil 기반 수집 (리눅스 /proc 을 쓸 수 없는 환경용)"""
+    # CPU
+    cpu_percent, cpu_per_core = _cpu_sampler.sample()
 
     # 메모리
     mem = psutil.virtual_memory()
@@ -60,17 +467,20 @@ def get_system_stats() -> SystemStats:
     disk_total_gb = disk.total / (1024 ** 3)
 
     # 네트워크 (초당 전송량)
-    now = time.monotonic()
     net_io = psutil.net_io_counters()
-    if _prev_net_io is not None and (now - _prev_net_time) > 0:
-        elapsed = now - _prev_net_time
-        net_recv_kb = (net_io.bytes_recv - _prev_net_io.bytes_recv) / elapsed / 1024
-        net_sent_kb = (net_io.bytes_sent - _prev_net_io.bytes_sent) / elapsed / 1024
-    else:
-        net_recv_kb = 0.0
-        net_sent_kb = 0.0
-    _prev_net_io = net_io
-    _prev_net_time = now
+    net_recv_kb, net_sent_kb = _net_rate((net_io.bytes_recv, net_io.bytes_sent))
+
+    # 장치별 (busy_time 은 리눅스에서만 제공)
+    disk_io = psutil.disk_io_counters(perdisk=True, nowrap=True) or {}
+    names = {name.encode() for name in disk_io}
+    disks = _disk_io({
+        name: (d.read_count, d.read_bytes // _SECTOR, d.write_count, d.write_bytes // _SECTOR,
+               getattr(d, "busy_time", 0))
+        for name, d in disk_io.items() if is_physical_disk(name.encode(), names)
+    })
+    mounts = [(p.device, p.mountpoint, p.fstype) for p in psutil.disk_partitions(all=False)]
+    nic_io = psutil.net_io_counters(pernic=True) or {}
+    nics = _nic_io({name: (n.bytes_recv, n.bytes_sent) for name, n in nic_io.items()})
 
     # 업타임
     boot_time = psutil.boot_time()
@@ -91,6 +501,12 @@ def get_system_stats() -> SystemStats:
         net_recv_kb=net_recv_kb,
         net_sent_kb=net_sent_kb,
         uptime_seconds=uptime_seconds,
+        disks=disks,
+        mounts=_mount_usage(mounts),
+        nics=nics,
+        cpu_iowait=_cpu_sampler.iowait_percent,
+        cpu_steal=_cpu_sampler.steal_percent,
+        **_load_fields(_getloadavg()),
     )
 
 
@@ -104,10 +520,3 @@ def format_uptime(seconds: int) -> str:
         return f"{hours}시간 {minutes}분"
     else:
         return f"{minutes}분"
-
-
-def make_bar(percent: float, width: int = 10) -> str:
-    """퍼센트를 시각적 막대로 변환 (유니코드 블록 문자 사용)"""
-    filled = round(percent / 100 * width)
-    filled = max(0, min(width, filled))
-    return "█" * filled + "░" * (width - filled)
@@ -0,0 +1,327 @@
+"""
+tsdb.py — 로컬 시계열 저장소 (고정 길이 바이너리 레코드, append-only)
+SystemStats 샘플을 struct 로 압축해 일 단위 세그먼트 파일에 덧붙이고,
+1분 / 1시간 / 1일 롤업을 만들어 보존 기간이 지난 세그먼트를 삭제합니다.
+
+디렉터리 구조:
+    <root>/raw/<세그먼트 번호>.bin   원본 샘플   (ts, 지표 × 1, 가중치)
+    <root>/1m/<세그먼트 번호>.bin    1분 롤업    (ts, 가중치, 지표 × (평균, 최소, 최대))
+    <root>/1h/...                    1시간 롤업
+    <root>/1d/...                    1일 롤업
+
+가중치는 샘플이 대표하는 시간(초)입니다. 적응형 수집 주기(5 / 10 / 60초)에서는 바쁠 때
+샘플이 촘촘해지므로, 샘플마다 같은 가중치로 평균을 내면 롤업 평균이 바쁜 구간 쪽으로 치우칩니다.
+그래서 raw 샘플은 수집 간격을 함께 저장하고 롤업 평균은 그 시간으로 가중합니다 (롤업의 가중치는 합계, 정수 초).
+
+읽기는 mmap + 이분 탐색으로 시작 위치를 찾은 뒤 순차로 풀어냅니다.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+
+log = logging.getLogger("tsdb")
+
+# 저장 지표 (레코드 필드 순서)
+FIELDS = ("cpu", "mem", "swap", "disk", "net_recv", "net_sent")
+
+# series() 가 1분 롤업 뒤에 이어 붙일 raw 꼬리의 최대 길이 (초) — 보통은 롤업 주기(1분) 남짓
+RAW_TAIL_SECONDS = 30 * 60
+
+RAW_RECORD = struct.Struct("<d" + "f" * len(FIELDS) + "f")
+ROLLUP_RECORD = struct.Struct("<dI" + "fff" * len(FIELDS))
+
+
+def stats_to_row(stats) -> tuple[float, ...]:
+    return (
+        stats.cpu_percent,
+        stats.mem_percent,
+        stats.swap_percent,
+        stats.disk_percent,
+        stats.net_recv_kb,
+        stats.net_sent_kb,
+    )
+
+
+@dataclass(frozen=True)
+class Level:
+    name: str
+    record: struct.Struct
+    bucket: int        # 레코드 하나가 대표하는 구간 (초, raw 는 0)
+    segment: int       # 세그먼트 파일 하나가 담는 구간 (초)
+    retention: int     # 보존 기간 (초)
+
+
+class TimeSeriesStore:
+    """append-only 시계열 저장소 + 백그라운드 롤업"""
+
+    def __init__(self, root: str, retention: dict[str, int]):
+        self.root = root
+        self.levels = {
+            "raw": Level("raw", RAW_RECORD, 0, 86400, retention["raw"]),
+            "1m":  Level("1m", ROLLUP_RECORD, 60, 7 * 86400, retention["1m"]),
+            "1h":  Level("1h", ROLLUP_RECORD, 3600, 30 * 86400, retention["1h"]),
+            "1d":  Level("1d", ROLLUP_RECORD, 86400, 366 * 86400, retention["1d"]),
+        }
+        # 롤업 원본 관계 (raw → 1m → 1h → 1d)
+        self._sources = (("1m", "raw"), ("1h", "1m"), ("1d", "1h"))
+        for level in self.levels.values():
+            os.makedirs(os.path.join(root, level.name), exist_ok=True)
+        self._append_seg: int | None = None
+        self._append_file = None
+
+    # ── 쓰기 ─────────────────────────────────────────────
+
+    def _segment_path(self, level: Level, seg: int) -> str:
+        return os.path.join(self.root, level.name, f"{seg}.bin")
+
+    def _segments(self, level: Level) -> list[int]:
+        segs = []
+        for name in os.listdir(os.path.join(self.root, level.name)):
+            stem, ext = os.path.splitext(name)
+            if ext == ".bin" and stem.isdigit():
+                segs.append(int(stem))
+        return sorted(segs)
+
+    def append(self, stats, ts: float | None = None, weight: float = 1.0):
+        """SystemStats 샘플 하나를 raw 세그먼트에 기록 (weight: 샘플이 대표하는 시간, 초)"""
+        ts = time.time() if ts is None else ts
+        level = self.levels["raw"]
+        seg = int(ts // level.segment)
+        if seg != self._append_seg:
+            if self._append_file is not None:
+                self._append_file.close()
+            self._append_file = open(self._segment_path(level, seg), "ab")
+            self._append_seg = seg
+        self._append_file.write(RAW_RECORD.pack(ts, *stats_to_row(stats), weight))
+        self._append_file.flush()
+
+    def _append_records(self, level: Level, records: list[tuple]):
+        """롤업 레코드 묶음 기록 (세그먼트별로 모아 한 번씩 write)"""
+        by_seg: dict[int, list[bytes]] = {}
+        for rec in records:
+            by_seg.setdefault(int(rec[0] // level.segment), []).append(level.record.pack(*rec))
+        for seg, chunks in by_seg.items():
+            with open(self._segment_path(level, seg), "ab") as f:
+                f.write(b"".join(chunks))
+
+    def close(self):
+        if self._append_file is not None:
+            self._append_file.close()
+            self._append_file = None
+            self._append_seg = None
+
+    # ── 읽기 ─────────────────────────────────────────────
+
+    def read(self, level_name: str, start: float, end: float | None = None) -> list[tuple]:
+        """[start, end) 구간 레코드 (시각 오름차순)"""
+        level = self.levels[level_name]
+        end = float("inf") if end is None else end
+        size = level.record.size
+        out: list[tuple] = []
+        first_seg = int(start // level.segment)
+        for seg in self._segments(level):
+            if seg < first_seg or seg * level.segment >= end:
+                continue
+            path = self._segment_path(level, seg)
+            try:
+                with open(path, "rb") as f:
+                    length = os.fstat(f.fileno()).st_size // size * size
+                    if length == 0:
+                        continue
+                    with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) as mm:
+                        view = memoryview(mm)
+                        try:
+                            lo = self._bisect(view, size, length // size, start)
+                            hi = self._bisect(view, size, length // size, end)
+                            out.extend(level.record.iter_unpack(view[lo * size:hi * size]))
+                        finally:
+                            view.release()
+            except FileNotFoundError:
+                continue
+        return out
+
+    @staticmethod
+    def _bisect(view: memoryview, size: int, count: int, ts: float) -> int:
+        """ts 이상인 첫 레코드 인덱스 (레코드 첫 필드가 시각)"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from("<d", view, mid * size)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def last_ts(self, level_name: str) -> float | None:
+        level = self.levels[level_name]
+        size = level.record.size
+        for seg in reversed(self._segments(level)):
+            path = self._segment_path(level, seg)
+            length = os.path.getsize(path) // size * size
+            if length:
+                with open(path, "rb") as f:
+                    f.seek(length - size)
+                    return struct.unpack("<d", f.read(8))[0]
+        return None
+
+    def series(self, start: float, end: float | None = None, max_records: int = 1500) -> tuple[int, list[tuple]]:
+        """[start, end) 구간을 롤업 레코드 형태 (ts, 가중치, 지표별 평균/최소/최대) 로
+
+        레코드 수가 max_records 이하가 되는 가장 촘촘한 롤업(1m / 1h / 1d)을 읽고,
+        아직 롤업되지 않은 최근 꼬리는 더 촘촘한 단계(… → raw)로 이어 붙인다.
+        더 촘촘한 단계는 최근 max_records × 버킷 초(raw 는 RAW_TAIL_SECONDS)까지만 읽으므로
+        단계마다 읽는 레코드 수는 max_records 근처로 제한된다 — 기준 롤업이 아직 만들어지지 않은
+        구간(첫 롤업 전 등)은 그 범위만큼만 채워지고 앞부분은 비어 있음.
+        반환: (기준 단계 버킷 초, 레코드 목록)
+        """
+        end = time.time() if end is None else end
+        chain = ("1m", "1h", "1d")
+        base = next((n for n in chain if (end - start) / self.levels[n].bucket <= max_records), chain[-1])
+        out: list[tuple] = []
+        cursor = start
+        for name in ("1d", "1h", "1m", "raw"):
+            level = self.levels[name]
+            if level.bucket > self.levels[base].bucket:
+                continue
+            if name != base:
+                horizon = RAW_TAIL_SECONDS if name == "raw" else max_records * level.bucket
+                cursor = max(cursor, end - horizon)
+            rows = self.read(name, cursor, end)
+            if not rows:
+                continue
+            if name == "raw":
+                out.extend(_raw_as_rollup(row) for row in rows)
+                break
+            out.extend(rows)
+            cursor = rows[-1][0] + level.bucket
+        return self.levels[base].bucket, out
+
+    def locate_peak(self, field: str, start: float, end: float | None = None) -> tuple[float, float] | None:
+        """구간 최댓값과 그 시각 (값, 시각) — 가장 굵은 롤업에서 찾은 버킷을 raw 까지 좁혀 감"""
+        i = FIELDS.index(field)
+        bucket, rows = self.series(start, end)
+        if not rows:
+            return None
+        best = max(rows, key=lambda r: r[4 + 3 * i])
+        value, ts = best[4 + 3 * i], best[0]
+        # 최댓값이 든 버킷 안을 한 단계씩 촘촘하게 (보존 기간이 지난 단계는 건너뜀)
+        for name in ("1h", "1m"):
+            level = self.levels[name]
+            if level.bucket >= bucket:
+                continue
+            finer = self.read(name, ts, ts + bucket)
+            if not finer:
+                continue
+            best = max(finer, key=lambda r: r[4 + 3 * i])
+            value, ts, bucket = best[4 + 3 * i], best[0], level.bucket
+        raw = self.read("raw", ts, ts + bucket)
+        if raw:
+            best = max(raw, key=lambda r: r[1 + i])
+            value, ts = best[1 + i], best[0]
+        return value, ts
+
+    # ── 롤업 / 보존 ──────────────────────────────────────
+
+    def rollup(self, now: float | None = None):
+        """완료된 구간을 상위 해상도로 집계 (raw → 1m → 1h → 1d 순)"""
+        now = time.time() if now is None else now
+        for target_name, source_name in self._sources:
+            target = self.levels[target_name]
+            last = self.last_ts(target_name)
+            # 다음에 만들 버킷의 시작 시각
+            start = 0.0 if last is None else last + target.bucket
+            if last is None:
+                first = self._first_ts(source_name)
+                if first is None:
+                    continue
+                start = first // target.bucket * target.bucket
+            done_until = now // target.bucket * target.bucket
+            if done_until <= start:
+                continue
+            rows = self.read(source_name, start, done_until)
+            records = self._aggregate(rows, target.bucket, source_name == "raw")
+            if records:
+                self._append_records(target, records)
+
+    def _first_ts(self, level_name: str) -> float | None:
+        level = self.levels[level_name]
+        for seg in self._segments(level):
+            path = self._segment_path(level, seg)
+            if os.path.getsize(path) >= level.record.size:
+                with open(path, "rb") as f:
+                    return struct.unpack("<d", f.read(8))[0]
+        return None
+
+    @staticmethod
+    def _aggregate(rows: list[tuple], bucket: int, from_raw: bool) -> list[tuple]:
+        """rows 를 bucket 초 단위로 묶어 (ts, 가중치, 지표별 평균/최소/최대) 레코드 생성 — 평균은 시간 가중"""
+        n = len(FIELDS)
+        records = []
+        cur = None
+        weight = 0.0
+        sums = mins = maxs = None
+        for row in rows:
+            b = row[0] // bucket * bucket
+            if b != cur:
+                if cur is not None:
+                    records.append(_rollup_record(cur, weight, sums, mins, maxs))
+                cur, weight = b, 0.0
+                sums, mins, maxs = [0.0] * n, [float("inf")] * n, [float("-inf")] * n
+            if from_raw:
+                c = row[1 + n]
+                for i in range(n):
+                    v = row[1 + i]
+                    sums[i] += v * c
+                    if v < mins[i]:
+                        mins[i] = v
+                    if v > maxs[i]:
+                        maxs[i] = v
+            else:
+                c = row[1]
+                for i in range(n):
+                    mean, lo, hi = row[2 + 3 * i:5 + 3 * i]
+                    sums[i] += mean * c
+                    if lo < mins[i]:
+                        mins[i] = lo
+                    if hi > maxs[i]:
+                        maxs[i] = hi
+            weight += c
+        if cur is not None:
+            records.append(_rollup_record(cur, weight, sums, mins, maxs))
+        return records
+
+    def enforce_retention(self, now: float | None = None):
+        """보존 기간이 완전히 지난 세그먼트 파일 삭제"""
+        now = time.time() if now is None else now
+        for level in self.levels.values():
+            for seg in self._segments(level):
+                if (seg + 1) * level.segment < now - level.retention:
+                    if level.name == "raw" and seg == self._append_seg:
+                        continue
+                    os.remove(self._segment_path(level, seg))
+                    log.info(f"보존 기간 초과 세그먼트 삭제: {level.name}/{seg}.bin")
+
+    def maintain(self, now: float | None = None):
+        """롤업 + 보존 정리 (백그라운드 스레드에서 주기 실행)"""
+        self.rollup(now)
+        self.enforce_retention(now)
+
+
+def _raw_as_rollup(row: tuple) -> tuple:
+    """raw 레코드 → 롤업 레코드 형태 (가중치 그대로, 평균 = 최소 = 최대)"""
+    rec: list = [row[0], row[-1]]
+    for v in row[1:-1]:
+        rec.extend((v, v, v))
+    return tuple(rec)
+
+
+def _rollup_record(ts: float, weight: float, sums, mins, maxs) -> tuple:
+    # 가중치는 정수 초로 저장 (0 이면 상위 롤업에서 빠지므로 최소 1)
+    rec: list = [ts, max(1, round(weight))]
+    for s, lo, hi in zip(sums, mins, maxs):
+        rec.extend((s / weight if weight else lo, lo, hi))
+    return tuple(rec)
@@ -0,0 +1,88 @@
+"""
+webhook.py — 웹훅 전용 경량 실행 (게이트웨이 접속 없음)
+상태 메시지 edit 과 알림 전송만 필요하므로 게이트웨이 웹소켓 / 길드 캐시 / 하트비트 없이
+Discord 웹훅 REST 로만 보냅니다.
+
+- keep-alive 연결을 재사용하는 aiohttp 세션 하나를 두 봇이 공유
+- 상태 메시지 ID 는 봇 상태 파일(data/state_<봇>.json)에 저장 (채널 히스토리 조회 불필요)
+- 로그인 / READY 대기가 없으므로 시작 즉시 첫 틱 전송, 게이트웨이 재접속 폭주 없음
+- 수집은 host.py 와 같은 공유 수집기(collector.py) 사용
+
+실행: python webhook.py
+MONITOR_WEBHOOK_URL / CPU_WEBHOOK_URL 중 설정된 쪽만 실행합니다.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+
+import config
+import metrics
+import system_info
+from bot import HomeServerMonitorBot
+from collector import Collector
+from cpu_bot import CPU_WEBHOOK_URL, REPORT_INTERVAL, ProcMonitorBot, collect_top_processes
+from outbound import RateLimitTracker, WebhookTransport
+
+log = logging.getLogger("monitor-webhook")
+
+# 웹훅 세션 연결 유지 (초) — 가장 긴 수집 주기보다 길어야 틱마다 TCP/TLS 핸드셰이크를 반복하지 않음
+KEEPALIVE_SECONDS = max(60, max(config.MONITOR_INTERVALS) * 3)
+
+
+def _build_bots(collector: Collector, session: aiohttp.ClientSession,
+                limiter: RateLimitTracker) -> list:
+    """웹훅 URL 이 설정된 봇 생성 및 수집기 구독 등록"""
+    bots = []
+    if config.MONITOR_WEBHOOK_URL:
+        transport = WebhookTransport(session, config.MONITOR_WEBHOOK_URL, limiter)
+        bot = HomeServerMonitorBot(standalone=False, transport=transport)
+        collector.subscribe(bot.on_sample, cadence=bot.cadence)
+        bots.append(bot)
+    if CPU_WEBHOOK_URL:
+        transport = WebhookTransport(session, CPU_WEBHOOK_URL, limiter)
+        bot = ProcMonitorBot(standalone=False, transport=transport)
+        every = max(1, round(REPORT_INTERVAL / collector.interval))
+        collector.subscribe(bot.on_sample, needs_procs=True, every=every, needs_stats=False)
+        bots.append(bot)
+    return bots
+
+
+async def run_webhooks():
+    limiter = RateLimitTracker()
+    connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=KEEPALIVE_SECONDS)
+    session = aiohttp.ClientSession(connector=connector, trace_configs=[limiter.trace_config()])
+    collector = Collector(config.COLLECT_GRID_SECONDS, collect_top_processes)
+    bots = []
+    try:
+        bots = _build_bots(collector, session, limiter)
+        if not bots:
+            log.error("MONITOR_WEBHOOK_URL / CPU_WEBHOOK_URL 이 없어 실행할 봇이 없습니다.")
+            return
+        if config.METRICS_PORT:
+            await metrics.start(config.METRICS_PORT, config.METRICS_HOST)
+        system_info.start_burst_sampler(config.BURST_SAMPLE_MS / 1000)
+        for bot in bots:
+            bot.start_detached()
+        log.info(f"웹훅 모드 시작 | 봇 {len(bots)}개 | 수집 주기: {'/'.join(map(str, config.MONITOR_INTERVALS))}초")
+        # 첫 틱은 격자를 기다리지 않고 바로 전송
+        await collector.run_once()
+        await collector.run()
+    finally:
+        for bot in bots:
+            await bot.close()
+        await session.close()
+        system_info.stop_burst_sampler()
+        await metrics.stop()
+
+
+def main():
+    try:
+        asyncio.run(run_webhooks())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()